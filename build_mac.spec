@@ -11,7 +11,15 @@ a = Analysis(
         ('overlay.png', '.'),
         ('utils/*.py', 'utils'),
     ],
-    hiddenimports=['gphoto2', 'PIL', 'PIL._tkinter_finder'],
+    # 함수 안에서 지연 import하는 모듈 (시작 시간 단축용) - 분석에서 빠지지 않도록 명시
+    hiddenimports=[
+        'gphoto2', 'PIL', 'PIL._tkinter_finder',
+        'requests', 'google.genai',
+        'utils.image_processor', 'utils.encoder', 'utils.camera', 'utils.profiler',
+        'utils.multi_camera', 'utils.spool', 'utils.shm_pool', 'utils.overlay_cache',
+        'utils.overlay_templates', 'utils.phash',
+        'http.server', 'urllib.request',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -33,7 +41,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # UPX 압축 해제가 실행할 때마다 시작 시간에 더해짐
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -48,7 +56,7 @@ coll = COLLECT(
     a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name='Canon100D',
 )
@@ -10,21 +10,20 @@ import sys
 import json
 import time
 import argparse
-from pathlib import Path
+import threading
+from typing import TYPE_CHECKING, Callable, Optional
 
 # 현재 디렉토리를 모듈 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from utils.ai_transformer import HybridProcessor, check_internet
-from utils.image_processor import ImageProcessor
+from utils import metrics
+from utils.camera_backend import camera_available, is_fake_camera
+from utils.raw import JPEG_EXTENSIONS, output_name, select_sources
+from utils.startup_bench import startup_checkpoint
 
-# 카메라 모듈 (gphoto2 없으면 None)
-try:
-    from utils.camera import CameraConnection
-    CAMERA_AVAILABLE = True
-except ImportError:
-    CameraConnection = None
-    CAMERA_AVAILABLE = False
+# 처리 모듈(PIL, requests 등)은 명령 실행 시점에 import (시작 시간 단축)
+if TYPE_CHECKING:
+    from utils.ai_transformer import HybridProcessor
 
 
 def load_config(config_path: str = "config.json") -> dict:
@@ -35,35 +34,24 @@ def load_config(config_path: str = "config.json") -> dict:
     return {}
 
 
-def save_processed_files(processed_files: set, filepath: str):
-    """처리된 파일 목록 저장"""
-    with open(filepath, 'w') as f:
-        json.dump(list(processed_files), f)
-
-
-def load_processed_files(filepath: str) -> set:
-    """처리된 파일 목록 로드"""
-    if os.path.exists(filepath):
-        with open(filepath, 'r') as f:
-            return set(json.load(f))
-    return set()
-
-
-def process_single_file(processor: HybridProcessor, input_path: str, output_dir: str) -> bool:
+def process_single_file(processor: 'HybridProcessor', input_path: str, output_dir: str) -> bool:
     """단일 파일 처리"""
     if not os.path.exists(input_path):
         print(f"❌ 파일 없음: {input_path}")
         return False
 
     filename = os.path.basename(input_path)
-    output_path = os.path.join(output_dir, f"processed_{filename}")
+    output_path = os.path.join(output_dir, f"processed_{output_name(filename)}")
 
     print(f"🔄 처리 중: {filename}")
     success, method, message = processor.process_image(input_path, output_path)
+    if success and not processor.wait_output(output_path):
+        success, message = False, "출력 저장 실패"
 
     if success:
         print(f"✅ 완료 [{method}]: {message}")
-        print(f"   출력: {output_path}")
+        if method != 'duplicate':
+            print(f"   출력: {output_path}")
     else:
         print(f"❌ 실패 [{method}]: {message}")
 
@@ -79,9 +67,25 @@ def kill_camera_daemons():
     time.sleep(1)
 
 
-def monitor_camera(processor: HybridProcessor, config: dict, interval: float = 5.0):
-    """카메라 모니터링 모드 - 카메라에서 직접 파일 가져와서 처리"""
-    if not CAMERA_AVAILABLE:
+def monitor_camera(processor: 'HybridProcessor', config: dict, interval: float = 5.0,
+                   stop_event: Optional[threading.Event] = None,
+                   on_result: Optional[Callable[[str, bool, str, str], None]] = None):
+    """
+    카메라 모니터링 모드 - 연결된 모든 카메라에서 직접 파일 가져와서 처리
+
+    바디마다 수집 스레드 (연결/스캔/다운로드/재연결) → 공유 대기열 → 처리 스레드 (바디 수만큼)
+    spool이 설정되면 처리는 공유 폴더의 작업으로 넘기고 작업자(cli.py worker)의 결과를 가져옴
+
+    Args:
+        stop_event: 설정되면 모니터링 종료 (None이면 Ctrl+C까지 실행)
+        on_result: 파일별 처리 결과 콜백 (카메라 경로, 성공 여부, 방식, 메시지)
+    """
+    from utils.multi_camera import MultiCameraIngest, ProcessedStore
+    from utils.spool import DEFAULT_SPOOL_CONFIG, dispatcher_from_config
+
+    stop_event = stop_event or threading.Event()
+    available, _ = camera_available(config)
+    if not available:
         print("❌ gphoto2가 설치되지 않아 카메라 모니터링 불가")
         print("   폴더 모니터링 모드를 사용하세요: python3 cli.py monitor-folder")
         return
@@ -93,8 +97,6 @@ def monitor_camera(processor: HybridProcessor, config: dict, interval: float = 5
     os.makedirs(download_dir, exist_ok=True)
     os.makedirs(output_dir, exist_ok=True)
 
-    processed_files = load_processed_files(processed_db)
-
     print("=" * 50)
     print("📸 카메라 모니터링 모드")
     print("=" * 50)
@@ -103,94 +105,66 @@ def monitor_camera(processor: HybridProcessor, config: dict, interval: float = 5
     print(f"⏱️  확인 간격: {interval}초")
     print("   Ctrl+C로 중지\n")
 
-    # 카메라 데몬 종료
-    print("🔧 카메라 데몬 종료 중...")
-    kill_camera_daemons()
-
-    camera = None
-    retry_count = 0
-    max_retries = 3
-
+    # 카메라 데몬 종료 (가상 카메라는 불필요)
+    if is_fake_camera(config):
+        print("🧪 가상 카메라 사용 (camera.backend = fake)")
+    else:
+        print("🔧 카메라 데몬 종료 중...")
+        kill_camera_daemons()
+
+    dispatcher = dispatcher_from_config(config, processor, stop_event)
+    process_workers = None
+    if dispatcher:
+        process_workers = config.get('spool', {}).get('max_in_flight', DEFAULT_SPOOL_CONFIG['max_in_flight'])
+
+    def handle(item: dict) -> bool:
+        tag, filename = item['body_tag'], item['file_info']['name']
+        processor.set_backlog(ingest.pending())
+
+        output_path = os.path.join(output_dir, item['output_name'])
+        if dispatcher:
+            success, method, message = dispatcher.process_image(
+                item['local_path'], output_path, key=f"{item['body_id']}:{item['file_info']['full_path']}")
+        else:
+            success, method, message = processor.process_image(item['local_path'], output_path)
+            # 비동기 저장이 끝나야 처리 완료로 기록 (저장 실패면 다음 스캔에서 재시도)
+            if success and not processor.wait_output(output_path):
+                success, message = False, "출력 저장 실패"
+
+        if success:
+            print(f"   ✅ [{tag}] {filename} 처리 완료 [{method}]: {message}")
+        else:
+            print(f"   ❌ [{tag}] {filename} 처리 실패 [{method}]: {message}")
+
+        if on_result:
+            on_result(item['file_info']['full_path'], success, method, message)
+        return success
+
+    ingest = MultiCameraIngest(config, ProcessedStore(processed_db), download_dir, handle,
+                               interval=interval, stop_event=stop_event, process_workers=process_workers)
     try:
-        while True:
-            # 카메라 연결
-            if camera is None:
-                print("📷 카메라 연결 시도...")
-                camera = CameraConnection()
-                if camera.connect():
-                    print(f"✅ 카메라 연결: {camera.camera_name}")
-                    retry_count = 0
-                else:
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        print(f"❌ 카메라 연결 실패 ({max_retries}회 시도)")
-                        print("   USB 케이블을 확인하고 다시 시도하세요")
-                        kill_camera_daemons()
-                        retry_count = 0
-                    camera = None
-                    time.sleep(interval)
-                    continue
-
-            # 카메라에서 파일 목록 가져오기
-            try:
-                camera_files = camera.get_all_files()
-            except Exception as e:
-                print(f"⚠️ 파일 목록 가져오기 실패: {e}")
-                camera.disconnect()
-                camera = None
-                continue
-
-            # 새 파일 확인 및 처리
-            for file_info in camera_files:
-                # file_info는 dict: {'path': ..., 'name': ..., 'full_path': ...}
-                filename = file_info['name']
-
-                # 이미 처리된 파일 스킵
-                if filename in processed_files:
-                    continue
-
-                # JPG만 처리
-                if not filename.lower().endswith(('.jpg', '.jpeg')):
-                    continue
-
-                print(f"\n🆕 새 파일 발견: {filename}")
-
-                # 다운로드
-                local_path = os.path.join(download_dir, filename)
-                try:
-                    if camera.download_file(file_info, download_dir):
-                        print(f"   📥 다운로드 완료: {local_path}")
-                    else:
-                        print(f"   ❌ 다운로드 실패")
-                        continue
-                except Exception as e:
-                    print(f"   ❌ 다운로드 오류: {e}")
-                    continue
-
-                # 처리
-                output_path = os.path.join(output_dir, filename)
-                success, method, message = processor.process_image(local_path, output_path)
-
-                if success:
-                    print(f"   ✅ 처리 완료 [{method}]: {message}")
-                    processed_files.add(filename)
-                    save_processed_files(processed_files, processed_db)
-                else:
-                    print(f"   ❌ 처리 실패 [{method}]: {message}")
-
-            time.sleep(interval)
-
+        ingest.run()
     except KeyboardInterrupt:
         print("\n\n🛑 모니터링 중지")
     finally:
-        if camera:
-            camera.disconnect()
-            print("📷 카메라 연결 해제")
-
-
-def monitor_folder(processor: HybridProcessor, input_dir: str, output_dir: str,
-                   processed_file: str = "processed_files.json", interval: float = 2.0):
-    """폴더 모니터링 모드"""
+        stop_event.set()
+        print("📷 카메라 연결 해제")
+
+
+def monitor_folder(processor: 'HybridProcessor', input_dir: str, output_dir: str,
+                   processed_file: str = "processed_files.json", interval: float = 2.0,
+                   stop_event: Optional[threading.Event] = None,
+                   on_result: Optional[Callable[[str, bool, str, str], None]] = None,
+                   raw_config: Optional[dict] = None):
+    """
+    폴더 모니터링 모드 (CR2는 내장 JPEG로 처리, RAW+JPEG 쌍은 한 번만)
+
+    Args:
+        raw_config: processing.raw 설정
+        stop_event: 설정되면 모니터링 종료 (None이면 Ctrl+C까지 실행)
+        on_result: 파일별 처리 결과 콜백 (입력 경로, 성공 여부, 방식, 메시지)
+    """
+    stop_event = stop_event or threading.Event()
     print("=" * 50)
     print("📁 폴더 모니터링 모드")
     print("=" * 50)
@@ -199,38 +173,115 @@ def monitor_folder(processor: HybridProcessor, input_dir: str, output_dir: str,
     print(f"⏱️  확인 간격: {interval}초")
     print("   Ctrl+C로 중지\n")
 
-    processed_files = load_processed_files(processed_file)
+    from utils.multi_camera import ProcessedStore
+
+    processed = ProcessedStore(processed_file)
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(input_dir, exist_ok=True)
 
     try:
-        while True:
-            for filename in os.listdir(input_dir):
-                if not filename.lower().endswith(('.jpg', '.jpeg', '.png')):
-                    continue
-
-                if filename in processed_files:
-                    continue
-
-                input_path = os.path.join(input_dir, filename)
-                output_path = os.path.join(output_dir, f"processed_{filename}")
+        while not stop_event.is_set():
+            listing = [{'path': input_dir, 'name': f, 'full_path': os.path.join(input_dir, f)}
+                       for f in sorted(os.listdir(input_dir))]
+            pending = [f for f in select_sources(listing, raw_config, JPEG_EXTENSIONS + ('.png',))
+                       if not processed.contains('folder', f['pair_names'])]
+            metrics.QUEUE_DEPTH.set(len(pending), queue='folder')
+
+            for index, file_info in enumerate(pending):
+                if stop_event.is_set():
+                    break
+
+                metrics.QUEUE_DEPTH.dec(queue='folder')
+                processor.set_backlog(len(pending) - index - 1)
+                filename = file_info['name']
+                input_path = file_info['full_path']
+                output_path = os.path.join(output_dir, f"processed_{file_info['local_name']}")
 
                 print(f"\n🆕 새 파일 발견: {filename}")
                 success, method, message = processor.process_image(input_path, output_path)
+                if success and not processor.wait_output(output_path):
+                    success, message = False, "출력 저장 실패"
 
                 if success:
                     print(f"✅ 완료 [{method}]: {message}")
-                    processed_files.add(filename)
-                    save_processed_files(processed_files, processed_file)
+                    processed.mark('folder', file_info['pair_names'])
                 else:
                     print(f"❌ 실패 [{method}]: {message}")
 
-            time.sleep(interval)
+                if on_result:
+                    on_result(input_path, success, method, message)
+
+            stop_event.wait(interval)
 
     except KeyboardInterrupt:
         print("\n\n🛑 모니터링 중지")
 
 
+def run_spool_worker(processor: 'HybridProcessor', config: dict, spool_path: Optional[str],
+                     threads: int, worker_id: Optional[str] = None):
+    """스풀 작업자 모드 - 공유 폴더의 작업을 가져와서 처리 (Ctrl+C까지)"""
+    from utils.spool import SpoolWorker, spool_from_config
+
+    spool = spool_from_config(config, spool_path)
+    if spool is None:
+        print("❌ 스풀 폴더가 지정되지 않았습니다 (--spool 또는 config의 spool.path)")
+        return
+
+    worker = SpoolWorker(spool, processor, worker_id)
+    print("=" * 50)
+    print("📮 스풀 작업자 모드")
+    print("=" * 50)
+    print(f"📁 스풀: {spool.path}")
+    print(f"👷 작업자: {worker.worker_id} (스레드 {threads}개)")
+    print("   Ctrl+C로 중지\n")
+
+    try:
+        worker.run(threads)
+    except KeyboardInterrupt:
+        print(f"\n\n🛑 작업자 중지 (처리 {worker.processed}건)")
+    finally:
+        worker.stop_event.set()
+        processor.close()
+
+
+def bench_encoder(config: dict, input_path: str, repeat: int):
+    """인코더 프로파일별 인코딩 시간/크기 출력"""
+    from utils.encoder import benchmark_profiles
+
+    if not os.path.exists(input_path):
+        print(f"❌ 파일 없음: {input_path}")
+        return
+
+    encoder_config = config.get('processing', {}).get('encoder', {})
+    current = encoder_config.get('profile', 'default')
+    print(f"📏 인코더 벤치마크: {os.path.basename(input_path)} (반복 {repeat}회, 최솟값)")
+    print(f"   {'프로파일':<16}{'시간(ms)':>10}{'크기(KB)':>10}{'크기비':>8}")
+    for result in benchmark_profiles(input_path, encoder_config, repeat):
+        marker = ' ◀ 현재' if result['profile'] == current else ''
+        print(f"   {result['profile']:<16}{result['ms']:>10}{result['kb']:>10}{result['ratio']:>8}{marker}")
+
+
+def bench_startup(config_path: str, repeat: int, show_imports: bool):
+    """명령별 시작 시간 출력 (새 프로세스로 실행, 준비 완료 시점에 종료)"""
+    from utils.startup_bench import default_commands, import_profile, measure_commands
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    commands = default_commands(base_dir, os.path.abspath(config_path))
+    print(f"⏱️ 시작 시간 벤치마크 (반복 {repeat}회, python: {sys.executable})")
+    print(f"   {'명령':<22}{'첫 실행':>10}{'중앙값':>10}{'최소':>10}  (ms)")
+    for result in measure_commands(commands, base_dir, repeat):
+        if result.get('median_ms') is None:
+            print(f"   {result['command']:<22}❌ {result['error']}")
+            continue
+        print(f"   {result['command']:<22}{result['first_ms']:>10}{result['median_ms']:>10}{result['min_ms']:>10}")
+
+    if show_imports:
+        for name, args in commands:
+            print(f"\n📦 import 시간 상위 ({name}):")
+            for module, ms in import_profile(args, base_dir, top=8):
+                print(f"   {module:<40}{ms:>8.1f} ms")
+
+
 def show_status(config: dict):
     """현재 상태 표시"""
     print("=" * 50)
@@ -238,7 +289,10 @@ def show_status(config: dict):
     print("=" * 50)
 
     # 카메라
-    print(f"📷 카메라 모듈: {'✅ gphoto2 사용 가능' if CAMERA_AVAILABLE else '❌ gphoto2 없음'}")
+    available, camera_message = camera_available(config)
+    print(f"📷 카메라 모듈: {'✅' if available else '❌'} {camera_message}")
+
+    from utils.ai_transformer import HybridProcessor, check_internet
 
     # 인터넷 연결
     internet = check_internet()
@@ -258,13 +312,21 @@ def show_status(config: dict):
     overlay_exists = os.path.exists(overlay_path) if overlay_path else False
     print(f"🎨 오버레이: {'✅ ' + overlay_path if overlay_exists else '❌ 미설정'}")
 
+    # 오버레이 템플릿
+    templates_folder = config.get('processing', {}).get('templates', {}).get('folder', '')
+    if templates_folder:
+        print(f"🖼️  템플릿 폴더: {templates_folder}")
+
     # HybridProcessor 상태
-    if ai_config.get('api_key') or overlay_exists:
+    if ai_config.get('api_key') or overlay_exists or templates_folder:
         processor = HybridProcessor(config)
         status = processor.get_status()
         print(f"\n📋 HybridProcessor 상태:")
         print(f"   AI 사용 가능: {'✅' if status['ai_available'] else '❌'} ({status['ai_reason']})")
         print(f"   오버레이 사용 가능: {'✅' if status['overlay_available'] else '❌'}")
+        if 'templates' in status:
+            templates = status['templates']
+            print(f"   템플릿: {len(templates['templates'])}개 ({templates['selection']})")
 
     print("=" * 50)
 
@@ -272,8 +334,11 @@ def show_status(config: dict):
 def main():
     parser = argparse.ArgumentParser(description='이미지 처리 CLI')
     parser.add_argument('--config', '-c', default='config.json', help='설정 파일 경로')
-    parser.add_argument('--mode', '-m', choices=['ai', 'overlay', 'hybrid'], help='처리 모드')
+    parser.add_argument('--mode', '-m', choices=['ai', 'overlay', 'hybrid', 'adaptive'], help='처리 모드')
     parser.add_argument('--status', '-s', action='store_true', help='상태 확인')
+    parser.add_argument('--metrics-port', type=int, help='메트릭 엔드포인트 포트 (지정 시 활성화)')
+    parser.add_argument('--profile', action='store_true', help='cProfile + tracemalloc 프로파일링')
+    parser.add_argument('--profile-interval', type=float, help='프로파일 리포트 저장 간격(초)')
 
     subparsers = parser.add_subparsers(dest='command')
 
@@ -285,6 +350,13 @@ def main():
     # 카메라 모니터링 (기본)
     camera_parser = subparsers.add_parser('monitor', help='카메라 모니터링 (자동 다운로드 + 처리)')
     camera_parser.add_argument('--interval', '-t', type=float, default=5.0, help='확인 간격(초)')
+    camera_parser.add_argument('--spool', help='처리를 넘길 공유 스풀 폴더 (cli.py worker가 처리)')
+
+    # 스풀 작업자
+    worker_parser = subparsers.add_parser('worker', help='공유 스풀 폴더의 작업 처리 (다른 PC에서 처리 능력 추가)')
+    worker_parser.add_argument('--spool', help='공유 스풀 폴더 (기본: config의 spool.path)')
+    worker_parser.add_argument('--threads', type=int, default=1, help='동시에 처리할 작업 수')
+    worker_parser.add_argument('--id', dest='worker_id', help='작업자 이름 (기본: 호스트명-PID)')
 
     # 폴더 모니터링
     folder_parser = subparsers.add_parser('monitor-folder', help='폴더 모니터링')
@@ -292,16 +364,42 @@ def main():
     folder_parser.add_argument('--output-dir', '-o', default='processed_photos', help='출력 폴더')
     folder_parser.add_argument('--interval', '-t', type=float, default=2.0, help='확인 간격(초)')
 
+    # 부하 테스트 (가상 카메라 + mock AI)
+    loadtest_parser = subparsers.add_parser('loadtest', help='촬영~출력 지연 부하 테스트 (가상 카메라 + mock AI)')
+    loadtest_parser.add_argument('--source', choices=['camera', 'folder'], default='camera',
+                                 help='구동할 모니터 루프 (monitor / monitor-folder)')
+    loadtest_parser.add_argument('--rates', default='10', help='도착률 목록 (장/분, 쉼표 구분, 예: 4,6,10)')
+    loadtest_parser.add_argument('--duration', type=float, default=10.0, help='도착률별 실행 시간 (분)')
+    loadtest_parser.add_argument('--ai-latency', default='fixed:40', help='mock AI 지연 분포 (초)')
+    loadtest_parser.add_argument('--ai-error-rate', type=float, default=0.0, help='mock AI 500 오류 비율')
+    loadtest_parser.add_argument('--rate-429', type=float, default=0.0, help='mock AI 429 비율')
+    loadtest_parser.add_argument('--time-scale', type=float, default=0.1, help='지연 배율 (0.1 = 10배 빠르게)')
+    loadtest_parser.add_argument('--interval', '-t', type=float, default=5.0, help='모니터 확인 간격(초)')
+    loadtest_parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    loadtest_parser.add_argument('--output-dir', '-o', default='loadtest_results', help='결과 저장 폴더')
+
+    # 인코더 프로파일 벤치마크
+    bench_encoder_parser = subparsers.add_parser('bench-encoder', help='출력 인코더 프로파일별 인코딩 시간/크기 비교')
+    bench_encoder_parser.add_argument('input', help='측정할 이미지 (실제 출력과 같은 해상도 권장)')
+    bench_encoder_parser.add_argument('--repeat', '-r', type=int, default=3, help='프로파일별 반복 횟수 (최솟값 사용)')
+
+    # 시작 시간 벤치마크
+    bench_startup_parser = subparsers.add_parser('bench-startup', help='명령별 시작 시간 측정 (실행 → 준비 완료)')
+    bench_startup_parser.add_argument('--repeat', '-r', type=int, default=5, help='명령별 반복 횟수')
+    bench_startup_parser.add_argument('--imports', action='store_true', help='명령별 import 시간 상위 모듈도 표시')
+
     args = parser.parse_args()
 
     # 설정 로드
     config = load_config(args.config)
 
     # 모드 오버라이드
-    if args.mode:
-        if 'processing' not in config:
-            config['processing'] = {}
-        config['processing']['mode'] = args.mode
+    def apply_overrides(cfg: dict) -> dict:
+        if args.mode:
+            cfg.setdefault('processing', {})['mode'] = args.mode
+        return cfg
+
+    apply_overrides(config)
 
     # 상태 확인
     if args.status:
@@ -314,10 +412,60 @@ def main():
         print("\n사용법:")
         print("  python3 cli.py monitor          # 카메라 모니터링 (자동)")
         print("  python3 cli.py monitor-folder   # 폴더 모니터링")
+        print("  python3 cli.py worker --spool <폴더>  # 스풀 작업자 (다른 PC에서 처리)")
         print("  python3 cli.py process <파일>   # 단일 파일 처리")
+        print("  python3 cli.py loadtest         # 부하 테스트 (가상 카메라 + mock AI)")
+        print("  python3 cli.py bench-encoder <파일>  # 인코더 프로파일 비교")
+        print("  python3 cli.py bench-startup    # 명령별 시작 시간 측정")
         print("  python3 cli.py --status         # 상태 확인")
         return
 
+    if args.command == 'bench-encoder':
+        if startup_checkpoint(args.command):
+            return
+        bench_encoder(config, args.input, args.repeat)
+        return
+
+    if args.command == 'bench-startup':
+        bench_startup(args.config, args.repeat, args.imports)
+        return
+
+    # 메트릭 엔드포인트 (config의 metrics.enabled 또는 --metrics-port)
+    # 부하 테스트 중에도 활성화 가능 (단계별 히스토그램 확인용)
+    metrics.start_from_config(config, port=args.metrics_port)
+
+    # 프로파일링 (--profile 또는 config의 profiling.enabled)
+    if args.profile or config.get('profiling', {}).get('enabled', False):
+        from utils.profiler import Profiler, instrument_hot_paths
+        profiler = Profiler.from_config(config)
+        if args.profile_interval is not None:
+            profiler.interval = args.profile_interval
+        instrument_hot_paths(profiler)
+        profiler.start()
+
+    from utils.ai_transformer import HybridProcessor
+
+    if args.command == 'loadtest':
+        from utils.loadtest import run_loadtest
+        if startup_checkpoint(args.command):
+            return
+        run_loadtest(
+            config,
+            monitor_camera if args.source == 'camera' else monitor_folder,
+            HybridProcessor,
+            source=args.source,
+            rates=[float(r) for r in args.rates.split(',') if r.strip()],
+            duration_minutes=args.duration,
+            ai_latency=args.ai_latency,
+            ai_error_rate=args.ai_error_rate,
+            rate_429=args.rate_429,
+            time_scale=args.time_scale,
+            interval=args.interval,
+            seed=args.seed,
+            output_dir=args.output_dir
+        )
+        return
+
     # 프로세서 초기화
     processor = HybridProcessor(config)
     status = processor.get_status()
@@ -325,19 +473,43 @@ def main():
     print(f"⚙️  모드: {status['mode']}")
     print(f"🤖 AI: {'✅' if status['ai_available'] else '❌'} ({status['ai_reason']})")
     print(f"🎨 오버레이: {'✅' if status['overlay_available'] else '❌'}")
+    if 'templates' in status:
+        print(f"🖼️  템플릿: {len(status['templates']['templates'])}개 ({status['templates']['selection']})")
+    if 'adaptive' in status:
+        print(f"⚡ 적응형: SLO {status['adaptive']['slo_seconds']}초")
     print()
 
+    # 장시간 실행 명령은 config.json 변경을 재시작 없이 반영
+    if args.command in ('monitor', 'monitor-folder', 'worker'):
+        from utils.config_watcher import ConfigWatcher
+        ConfigWatcher(args.config, lambda cfg: processor.apply_config(apply_overrides(cfg))).start()
+        # AI 클라이언트는 카메라 연결과 겹쳐서 백그라운드에서 준비 (첫 사진 지연 방지)
+        threading.Thread(target=processor.warm_up, name='ai-warm-up', daemon=True).start()
+
+    if startup_checkpoint(args.command):
+        return
+
     if args.command == 'process':
         process_single_file(processor, args.input, args.output_dir)
 
     elif args.command == 'monitor':
+        if args.spool:
+            config.setdefault('spool', {}).update(enabled=True, path=args.spool)
         monitor_camera(processor, config, interval=args.interval)
 
+    elif args.command == 'worker':
+        run_spool_worker(processor, config, args.spool, args.threads, args.worker_id)
+
     elif args.command == 'monitor-folder':
         input_dir = args.input_dir
         output_dir = args.output_dir
-        monitor_folder(processor, input_dir, output_dir, interval=args.interval)
+        monitor_folder(processor, input_dir, output_dir, interval=args.interval,
+                       raw_config=config.get('processing', {}).get('raw', {}))
 
 
 if __name__ == '__main__':
+    if getattr(sys, 'frozen', False):
+        # 패키징된 앱에서 합성 프로세스(spawn) 시작 처리
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
@@ -17,39 +17,364 @@ import sys
 import os
 import json
 import subprocess
+import time
+import logging
+import logging.handlers
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-# PIL 제외 (macOS 버전 호환성 문제)
-
-# 카메라 모듈 (gphoto2 없으면 None)
-try:
-    from utils.camera import CameraConnection
-    CAMERA_AVAILABLE = True
-except ImportError:
-    CameraConnection = None
-    CAMERA_AVAILABLE = False
-    print("⚠️ gphoto2 미설치 - 카메라 기능 비활성화 (수동 모드 사용)")
+# PIL은 GUI 스레드에서 사용하지 않음 (macOS 버전 호환성 문제)
+# - 썸네일은 utils.thumbnails가 백그라운드에서 PPM으로 만들어 Tk PhotoImage로 전달
 
 from utils.ai_transformer import HybridProcessor, check_internet
+from utils import metrics
+from utils.thumbnails import ThumbnailLoader
+from utils.config_watcher import ConfigWatcher
+from utils.raw import output_name
+from utils.startup_bench import startup_checkpoint
+# 카메라 백엔드 (camera.backend: gphoto2 또는 fake)
+from utils.camera_backend import camera_available, create_camera, detect_cameras
+
+# 종료 시 진행 중인 처리/저장을 기다리는 최대 시간 (초)
+SHUTDOWN_WAIT_SECONDS = 30
 
 
 def kill_camera_processes():
     """카메라를 점유하고 있는 프로세스 강제 종료 (start.command와 동일)"""
     try:
-        # start.command와 동일한 강력한 프로세스 정리
-        subprocess.run(['pkill', '-9', '-f', 'ptpcamerad'], stderr=subprocess.DEVNULL)
-        subprocess.run(['pkill', '-9', '-f', 'mscamerad'], stderr=subprocess.DEVNULL)
-        subprocess.run(['pkill', '-9', '-f', 'icdd'], stderr=subprocess.DEVNULL)
-        subprocess.run(['pkill', '-9', '-f', 'cameracaptured'], stderr=subprocess.DEVNULL)
-        subprocess.run(['killall', '-9', 'Image Capture'], stderr=subprocess.DEVNULL)
+        # start.command와 동일한 강력한 프로세스 정리 (동시에 실행 - 시작 시간 단축)
+        commands = [
+            ['pkill', '-9', '-f', 'ptpcamerad'],
+            ['pkill', '-9', '-f', 'mscamerad'],
+            ['pkill', '-9', '-f', 'icdd'],
+            ['pkill', '-9', '-f', 'cameracaptured'],
+            ['killall', '-9', 'Image Capture'],
+        ]
+        processes = [subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                     for command in commands]
+        for process in processes:
+            process.wait()
         return True
     except Exception:
         return False
 
 
+def setup_file_logger(log_path: str, max_bytes: int, backup_count: int):
+    """
+    비동기 회전 로그 파일 설정 (QueueHandler → 백그라운드 QueueListener)
+
+    Returns:
+        (logger, listener) - 실패 시 (None, None)
+    """
+    try:
+        log_dir = os.path.dirname(log_path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    except OSError as e:
+        print(f"⚠️ 로그 파일 열기 실패 ({log_path}): {e}")
+        return None, None
+
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    record_queue = queue.Queue()
+
+    logger = logging.getLogger('photo_gui')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [logging.handlers.QueueHandler(record_queue)]
+
+    listener = logging.handlers.QueueListener(record_queue, file_handler)
+    listener.start()
+    return logger, listener
+
+
+class StatusProber:
+    """
+    백그라운드 상태 점검 (인터넷 / API 키 유효성 / 오버레이 / 카메라)
+
+    - 요청(request)은 즉시 반환, 점검은 전용 스레드에서 수행
+    - 점검 중 들어온 요청은 하나로 합쳐짐
+    - 결과는 on_result 콜백으로 전달 (GUI는 root.after로 메인 스레드에 넘김)
+    """
+
+    API_KEY_CHECK_URL = "https://generativelanguage.googleapis.com/v1beta/models?pageSize=1&key="
+    API_KEY_RECHECK_SECONDS = 600
+
+    def __init__(self, snapshot_fn, on_result):
+        """
+        Args:
+            snapshot_fn: 점검할 설정 스냅샷을 반환하는 함수
+                         ({'api_key', 'overlay_path', 'is_monitoring', 'cameras_connected', 'config'})
+            on_result: 점검 결과 딕셔너리를 받는 콜백 (점검 스레드에서 호출)
+        """
+        self.snapshot_fn = snapshot_fn
+        self.on_result = on_result
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._api_key_cache = {}  # api_key -> (유효 여부, 확인 시각)
+        self._thread = threading.Thread(target=self._loop, name='status-prober', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def request(self):
+        """상태 점검 요청 (non-blocking)"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            self._wake.wait()
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            try:
+                self.on_result(self.probe(self.snapshot_fn()))
+            except Exception as e:
+                print(f"⚠️ 상태 점검 실패: {e}")
+
+    def probe(self, snapshot: dict) -> dict:
+        """상태 점검 (블로킹 - 점검 스레드 전용)"""
+        internet_ok = check_internet()
+        api_key = snapshot.get('api_key', '')
+        overlay_path = snapshot.get('overlay_path', '')
+
+        status = {
+            'internet': internet_ok,
+            'api_key_set': bool(api_key),
+            'api_key_valid': self._check_api_key(api_key) if (api_key and internet_ok) else None,
+            'overlay': bool(overlay_path) and os.path.exists(overlay_path),
+            'camera': None,
+        }
+
+        camera_config = snapshot.get('config', {})
+        if not camera_available(camera_config)[0]:
+            status['camera'] = "gphoto2 미설치"
+        elif snapshot.get('is_monitoring'):
+            status['camera'] = f"모니터링 중 ({snapshot.get('cameras_connected', 0)}대 연결)"
+        else:
+            cameras = detect_cameras(camera_config)
+            status['camera'] = ", ".join(name for name, _ in cameras) if cameras else "감지 안됨"
+
+        return status
+
+    def _check_api_key(self, api_key: str):
+        """API 키 유효성 (결과 캐시, 네트워크 오류 시 None)"""
+        # urllib.request는 import가 무거워 상태 확인 스레드에서 처음 쓸 때 로드
+        import urllib.error
+        import urllib.request
+
+        cached = self._api_key_cache.get(api_key)
+        if cached and time.monotonic() - cached[1] < self.API_KEY_RECHECK_SECONDS:
+            return cached[0]
+
+        try:
+            with urllib.request.urlopen(self.API_KEY_CHECK_URL + api_key, timeout=5):
+                valid = True
+        except urllib.error.HTTPError as e:
+            if e.code not in (400, 401, 403):
+                return None
+            valid = False
+        except (urllib.error.URLError, OSError):
+            return None
+
+        self._api_key_cache[api_key] = (valid, time.monotonic())
+        return valid
+
+
+class GalleryView:
+    """
+    처리된 사진 갤러리 (가상화 그리드)
+
+    - 화면에 보이는 셀만 Canvas 항목/PhotoImage 생성, 벗어나면 즉시 해제
+    - 썸네일은 백그라운드에서 생성 + 디스크 캐시 (경로/mtime 키)
+    """
+
+    CELL_PADDING = 8
+    LABEL_HEIGHT = 18
+    OVERSCAN_ROWS = 1
+
+    def __init__(self, parent, root, loader: ThumbnailLoader, folder_getter):
+        """
+        Args:
+            parent: 갤러리를 배치할 프레임
+            root: Tk 루트 (root.after 용)
+            loader: 썸네일 로더 (디스크 캐시 사용)
+            folder_getter: 현재 출력 폴더를 반환하는 함수
+        """
+        self.root = root
+        self.loader = loader
+        self.folder_getter = folder_getter
+        self.thumb_w, self.thumb_h = loader.max_size
+        self.cell_w = self.thumb_w + self.CELL_PADDING * 2
+        self.cell_h = self.thumb_h + self.LABEL_HEIGHT + self.CELL_PADDING * 2
+
+        self.files = []
+        self.columns = 1
+        self.cells = {}  # index -> {'items': [...], 'photo': PhotoImage, 'future': Future, 'path': str}
+        self.scan_generation = 0
+
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(toolbar, text="🔄 새로고침", command=self.refresh).pack(side=tk.LEFT)
+        self.count_label = ttk.Label(toolbar, text="")
+        self.count_label.pack(side=tk.LEFT, padx=10)
+
+        body = ttk.Frame(parent)
+        body.pack(fill=tk.BOTH, expand=True)
+
+        self.canvas = tk.Canvas(body, background="#222222", highlightthickness=0,
+                                yscrollincrement=max(1, self.cell_h // 4))
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_units(1))
+        self.canvas.bind("<Double-Button-1>", self._on_double_click)
+
+    def refresh(self):
+        """출력 폴더 다시 스캔 (백그라운드)"""
+        self.scan_generation += 1
+        generation = self.scan_generation
+        folder = self.folder_getter()
+        threading.Thread(target=self._scan, args=(folder, generation), daemon=True).start()
+
+    def _scan(self, folder, generation):
+        """폴더 스캔 (최신순 정렬)"""
+        entries = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.lower().endswith(('.jpg', '.jpeg', '.png', '.webp')):
+                        entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            pass
+        entries.sort(reverse=True)
+        files = [path for _, path in entries]
+        self.root.after(0, self._set_files, files, generation)
+
+    def _set_files(self, files, generation):
+        if generation != self.scan_generation:
+            return
+        self._clear_cells()
+        self.files = files
+        self.count_label.config(text=f"{len(files)}장")
+        self._layout()
+
+    def _clear_cells(self):
+        for index in list(self.cells):
+            self._release_cell(index)
+
+    def _layout(self):
+        """열 수 / 스크롤 영역 재계산 후 보이는 셀 렌더링"""
+        width = max(self.canvas.winfo_width(), self.cell_w)
+        columns = max(1, width // self.cell_w)
+        if columns != self.columns:
+            self.columns = columns
+            self._clear_cells()
+
+        rows = (len(self.files) + self.columns - 1) // self.columns
+        self.canvas.configure(scrollregion=(0, 0, width, max(rows * self.cell_h, 1)))
+        self._render_visible()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._render_visible()
+
+    def _scroll_units(self, units):
+        self.canvas.yview_scroll(units, "units")
+        self._render_visible()
+
+    def _on_mousewheel(self, event):
+        # macOS는 delta가 작고, Windows는 120 단위
+        delta = event.delta if abs(event.delta) < 120 else event.delta // 120
+        self._scroll_units(-delta)
+
+    def _visible_range(self):
+        """현재 보이는 셀 인덱스 범위 (오버스캔 포함)"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self.cell_h) - self.OVERSCAN_ROWS)
+        last_row = int(bottom // self.cell_h) + self.OVERSCAN_ROWS
+        start = first_row * self.columns
+        end = min(len(self.files), (last_row + 1) * self.columns)
+        return range(start, end)
+
+    def _render_visible(self):
+        """보이는 셀만 생성, 벗어난 셀은 해제"""
+        visible = self._visible_range()
+        for index in [i for i in self.cells if i not in visible]:
+            self._release_cell(index)
+        for index in visible:
+            if index not in self.cells:
+                self._create_cell(index)
+
+    def _create_cell(self, index):
+        path = self.files[index]
+        row, col = divmod(index, self.columns)
+        x = col * self.cell_w + self.CELL_PADDING
+        y = row * self.cell_h + self.CELL_PADDING
+
+        items = [
+            self.canvas.create_rectangle(x, y, x + self.thumb_w, y + self.thumb_h,
+                                         outline="#444444", fill="#333333"),
+            self.canvas.create_image(x + self.thumb_w // 2, y + self.thumb_h // 2, anchor=tk.CENTER),
+            self.canvas.create_text(x + self.thumb_w // 2, y + self.thumb_h + 4, anchor=tk.N,
+                                    text=os.path.basename(path)[:24], fill="#dddddd",
+                                    font=("Helvetica", 9)),
+        ]
+        cell = {'items': items, 'photo': None, 'path': path, 'future': None}
+        self.cells[index] = cell
+        cell['future'] = self.loader.request(
+            path,
+            lambda p, data, error, i=index: self.root.after(0, self._on_thumbnail, i, p, data)
+        )
+
+    def _release_cell(self, index):
+        cell = self.cells.pop(index, None)
+        if not cell:
+            return
+        if cell['future'] is not None:
+            cell['future'].cancel()
+        for item in cell['items']:
+            self.canvas.delete(item)
+
+    def _on_thumbnail(self, index, path, data):
+        """썸네일 도착 (메인 스레드) - 아직 보이는 셀일 때만 표시"""
+        cell = self.cells.get(index)
+        if not cell or cell['path'] != path or data is None:
+            return
+        try:
+            cell['photo'] = tk.PhotoImage(data=data, format='PPM')
+            self.canvas.itemconfig(cell['items'][1], image=cell['photo'])
+        except tk.TclError:
+            pass
+
+    def _on_double_click(self, event):
+        """더블클릭한 사진을 기본 뷰어로 열기"""
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        col, row = int(x // self.cell_w), int(y // self.cell_h)
+        index = row * self.columns + col
+        if col < self.columns and 0 <= index < len(self.files):
+            opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+            try:
+                subprocess.Popen([opener, self.files[index]])
+            except OSError:
+                pass
+
+
 class PhotoProcessorGUI:
     """GUI 메인 클래스"""
 
-    def __init__(self, root):
+    def __init__(self, root, profile: bool = False):
         self.root = root
         self.root.title("Canon 100D 사진 자동 처리")
         self.root.geometry("900x800")
@@ -57,6 +382,8 @@ class PhotoProcessorGUI:
         # 상태 변수
         self.is_monitoring = False
         self.monitor_thread = None
+        self.monitor_stop = threading.Event()
+        self.camera_ingest = None
         self.log_queue = queue.Queue()
 
         # 통계
@@ -70,8 +397,63 @@ class PhotoProcessorGUI:
         # 상태 업데이트 타이머
         self.status_update_job = None
 
+        # 수동 처리 (백그라운드 작업)
+        self.manual_thread = None
+        self.manual_cancel = threading.Event()
+        self.manual_done = 0
+
+        # 종료 중 (작업 스레드는 더 이상 root.after로 화면 갱신을 요청하지 않음)
+        self.closing = False
+
         # 설정 로드
         self.load_config()
+        if not camera_available(self.config)[0]:
+            print("⚠️ gphoto2 미설치 - 카메라 기능 비활성화 (수동 모드 사용)")
+
+        # 로그 (화면은 링 버퍼로 제한, 전체 로그는 회전 파일로 비동기 저장)
+        gui_config = self.config.get('gui', {})
+        self.log_max_lines = max(100, gui_config.get('log_max_lines', 2000))
+        self.log_lines = deque(maxlen=self.log_max_lines)
+        self.file_logger, self.log_listener = None, None
+        if gui_config.get('log_file'):
+            self.file_logger, self.log_listener = setup_file_logger(
+                gui_config['log_file'],
+                gui_config.get('log_file_max_bytes', 5 * 1024 * 1024),
+                gui_config.get('log_file_backups', 5)
+            )
+
+        # 미리보기 썸네일 (백그라운드 디코딩 + LRU 캐시)
+        self.thumbnail_loader = ThumbnailLoader(
+            max_size=tuple(gui_config.get('preview_size', [320, 240])),
+            cache_size=gui_config.get('preview_cache_size', 16)
+        )
+        self.preview_path = None
+        self.preview_photo = None
+
+        # 메트릭 엔드포인트 (config의 metrics.enabled)
+        self.metrics_server = metrics.start_from_config(self.config)
+
+        # 프로파일링 (--profile 또는 config의 profiling.enabled)
+        self.profiler = None
+        if profile or self.config.get('profiling', {}).get('enabled', False):
+            from utils.profiler import Profiler, instrument_hot_paths
+            self.profiler = Profiler.from_config(self.config)
+            instrument_hot_paths(self.profiler)
+            self.profiler.instrument(self, ['check_log_queue'])
+            self.profiler.start()
+
+        # 공유 프로세서 + 설정 파일 감시 (모드/프롬프트/API 키 변경 즉시 반영)
+        self.processor = None
+        self.processor_lock = threading.Lock()
+        self.config_watcher = ConfigWatcher('config.json', self.on_config_file_changed)
+        self.config_watcher.start()
+
+        # 상태 점검 (백그라운드 - Tk 스레드를 막지 않음)
+        self.status_prober = StatusProber(
+            self._status_snapshot,
+            lambda status: self.root.after(0, self.apply_status, status)
+        )
+        self.status_prober.start()
 
         # UI 생성
         self.create_widgets()
@@ -140,6 +522,25 @@ class PhotoProcessorGUI:
         self.notebook.add(folder_tab, text="폴더 설정")
         self.create_folder_tab(folder_tab)
 
+        # 탭 4: 갤러리 (처리된 사진)
+        self.gallery_tab = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(self.gallery_tab, text="갤러리")
+        gui_config = self.config.get('gui', {})
+        self.gallery = GalleryView(
+            self.gallery_tab,
+            self.root,
+            ThumbnailLoader(
+                max_size=tuple(gui_config.get('gallery_thumb_size', [160, 120])),
+                cache_size=gui_config.get('gallery_cache_size', 200),
+                workers=2,
+                disk_cache_dir=gui_config.get('thumbnail_cache_dir', '.thumbnail_cache'),
+                disk_cache_max_mb=gui_config.get('thumbnail_cache_max_mb', 64),
+                disk_cache_max_days=gui_config.get('thumbnail_cache_max_days', 30)
+            ),
+            lambda: self.output_folder
+        )
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
     def create_main_tab(self, parent):
         """메인 탭 생성"""
         # 처리 모드 선택
@@ -151,7 +552,8 @@ class PhotoProcessorGUI:
         modes = [
             ("하이브리드 (AI 우선, 오프라인 시 오버레이)", "hybrid"),
             ("AI 전용 (인터넷 필수)", "ai"),
-            ("오버레이 전용 (오프라인 가능)", "overlay")
+            ("오버레이 전용 (오프라인 가능)", "overlay"),
+            ("적응형 (대기열이 밀리면 일부 오버레이)", "adaptive")
         ]
 
         for text, mode in modes:
@@ -169,6 +571,12 @@ class PhotoProcessorGUI:
         self.internet_status_label = ttk.Label(self.ai_status_frame, text="")
         self.internet_status_label.pack(anchor=tk.W)
 
+        self.overlay_status_label = ttk.Label(self.ai_status_frame, text="")
+        self.overlay_status_label.pack(anchor=tk.W)
+
+        self.camera_status_label = ttk.Label(self.ai_status_frame, text="")
+        self.camera_status_label.pack(anchor=tk.W)
+
         ttk.Button(self.ai_status_frame, text="상태 새로고침",
                   command=self.update_ai_status).pack(anchor=tk.W, pady=5)
 
@@ -211,7 +619,7 @@ class PhotoProcessorGUI:
             control_frame,
             text="▶ 모니터링 시작",
             command=self.start_monitoring,
-            state=tk.NORMAL if CAMERA_AVAILABLE else tk.DISABLED
+            state=tk.NORMAL if camera_available(self.config)[0] else tk.DISABLED
         )
         self.start_button.pack(side=tk.LEFT, padx=5)
 
@@ -227,7 +635,7 @@ class PhotoProcessorGUI:
             control_frame,
             text="🔄 카메라 재연결",
             command=self.reconnect_camera,
-            state=tk.NORMAL if CAMERA_AVAILABLE else tk.DISABLED
+            state=tk.NORMAL if camera_available(self.config)[0] else tk.DISABLED
         )
         self.reconnect_button.pack(side=tk.LEFT, padx=5)
 
@@ -239,6 +647,35 @@ class PhotoProcessorGUI:
         )
         self.status_label.pack(side=tk.RIGHT, padx=10)
 
+        # 수동 처리 진행 상황
+        manual_frame = ttk.LabelFrame(parent, text="수동 처리 진행", padding="5")
+        manual_frame.pack(fill=tk.X, pady=5)
+
+        progress_row = ttk.Frame(manual_frame)
+        progress_row.pack(fill=tk.X)
+
+        self.manual_progress = ttk.Progressbar(progress_row, mode='determinate')
+        self.manual_progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+
+        self.manual_progress_label = ttk.Label(progress_row, text="0 / 0", width=10)
+        self.manual_progress_label.pack(side=tk.LEFT, padx=5)
+
+        self.manual_cancel_button = ttk.Button(
+            progress_row,
+            text="⏹ 취소",
+            command=self.cancel_manual_process,
+            state=tk.DISABLED
+        )
+        self.manual_cancel_button.pack(side=tk.LEFT)
+
+        self.manual_tree = ttk.Treeview(manual_frame, columns=('file', 'status'),
+                                        show='headings', height=4)
+        self.manual_tree.heading('file', text="파일")
+        self.manual_tree.heading('status', text="상태")
+        self.manual_tree.column('file', width=300)
+        self.manual_tree.column('status', width=300)
+        self.manual_tree.pack(fill=tk.X, pady=(5, 0))
+
         # 미리보기 + 로그 컨테이너
         preview_log_frame = ttk.Frame(parent)
         preview_log_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -376,6 +813,11 @@ class PhotoProcessorGUI:
 
         ttk.Label(desc_frame, text=desc_text, justify=tk.LEFT).pack(anchor=tk.W)
 
+    def on_tab_changed(self, event=None):
+        """갤러리 탭 선택 시 목록 새로고침"""
+        if self.notebook.select() == str(self.gallery_tab):
+            self.gallery.refresh()
+
     def on_mode_change(self):
         """처리 모드 변경"""
         self.processing_mode = self.mode_var.get()
@@ -384,40 +826,93 @@ class PhotoProcessorGUI:
         self.update_ai_status()
 
     def update_ai_status(self):
-        """AI 상태 업데이트"""
-        # 인터넷 연결 확인
-        internet_ok = check_internet()
+        """AI 상태 업데이트 요청 (점검은 백그라운드, 결과는 apply_status에서 반영)"""
+        self.status_prober.request()
+
+    def _status_snapshot(self) -> dict:
+        """상태 점검용 설정 스냅샷 (점검 스레드에서 호출)"""
+        return {
+            'api_key': self.ai_config.get('api_key', ''),
+            'overlay_path': self.overlay_image,
+            'is_monitoring': self.is_monitoring,
+            'cameras_connected': len(self.camera_ingest.connected_bodies()) if self.camera_ingest else 0,
+            'config': self.config,
+        }
+
+    def apply_status(self, status: dict):
+        """상태 점검 결과 반영 (메인 스레드)"""
+        internet_ok = status['internet']
         internet_text = "🌐 인터넷: 연결됨" if internet_ok else "🌐 인터넷: 연결 안됨"
         self.internet_status_label.config(text=internet_text,
                                           foreground="green" if internet_ok else "red")
 
         # API 키 확인
-        api_key = self.ai_config.get('api_key', '')
-        if not api_key:
+        if not status['api_key_set']:
             self.ai_status_label.config(text="⚠️ API 키 미설정 (AI 탭에서 설정)", foreground="orange")
         elif not internet_ok:
             self.ai_status_label.config(text="⚠️ 오프라인 - 오버레이 폴백 사용", foreground="orange")
+        elif status['api_key_valid'] is False:
+            self.ai_status_label.config(text="❌ API 키 무효 - 오버레이 폴백 사용", foreground="red")
         else:
             self.ai_status_label.config(text="✅ AI 변환 준비됨", foreground="green")
 
+        overlay_ok = status['overlay']
+        self.overlay_status_label.config(
+            text="🎨 오버레이: 준비됨" if overlay_ok else "🎨 오버레이: 파일 없음",
+            foreground="green" if overlay_ok else "orange")
+
+        self.camera_status_label.config(text=f"📷 카메라: {status['camera']}")
+
     def update_preview(self, image_path: str, method: str):
-        """처리된 이미지 미리보기 업데이트 (텍스트 기반)"""
+        """처리된 이미지 미리보기 업데이트 (썸네일은 백그라운드에서 디코딩)"""
+        # 저장 스레드가 아직 쓰는 중이면 저장 완료 후 다시 호출
+        writer = self.processor.output_writer if self.processor else None
+        if writer is not None and writer.is_pending(image_path):
+            writer.when_written(
+                image_path,
+                lambda ok: ok and self.post(self.update_preview, image_path, method)
+            )
+            return
+
         try:
             # 파일명과 방식 표시
             filename = os.path.basename(image_path)
             method_text = "🤖 AI 변환" if method == 'ai' else "🖼️ 오버레이"
-            
+
             # 파일 크기
             file_size = os.path.getsize(image_path)
             size_text = f"{file_size // 1024} KB"
-            
-            # 라벨 업데이트
-            self.preview_label.config(text=f"✅ {filename}\n({size_text})")
-            self.preview_info_label.config(text=method_text)
+
+            # 라벨 업데이트 (썸네일 도착 전까지 텍스트 표시)
+            self.preview_info_label.config(text=f"{method_text} - {filename} ({size_text})")
+            if self.preview_photo is None:
+                self.preview_label.config(text=f"✅ {filename}\n({size_text})")
+
+            self.preview_path = image_path
+            self.thumbnail_loader.request(
+                image_path,
+                lambda path, data, error: self.root.after(0, self._show_thumbnail, path, data, error)
+            )
 
         except Exception as e:
             self.log(f"⚠️ 미리보기 로드 실패: {e}")
 
+    def _show_thumbnail(self, image_path: str, data, error: str):
+        """디코딩된 썸네일 표시 (메인 스레드 - PhotoImage 생성만 수행)"""
+        # 더 최근 요청이 있으면 무시
+        if image_path != self.preview_path:
+            return
+
+        if data is None:
+            self.log(f"⚠️ 미리보기 로드 실패: {error}")
+            return
+
+        try:
+            self.preview_photo = tk.PhotoImage(data=data, format='PPM')
+            self.preview_label.config(image=self.preview_photo, text="")
+        except tk.TclError as e:
+            self.log(f"⚠️ 미리보기 표시 실패: {e}")
+
     def schedule_status_update(self):
         """10초마다 AI 상태 자동 업데이트"""
         if self.is_monitoring:
@@ -458,16 +953,36 @@ class PhotoProcessorGUI:
         timestamp = datetime.now().strftime("%H:%M:%S")
         self.log_queue.put(f"[{timestamp}] {message}\n")
 
+        if self.file_logger:
+            self.file_logger.info(message)
+
     def check_log_queue(self):
-        """로그 큐에서 메시지 가져와 표시"""
+        """로그 큐에서 메시지를 모두 꺼내 한 번에 표시 (최대 log_max_lines줄 유지)"""
+        batch = []
         try:
             while True:
-                message = self.log_queue.get_nowait()
-                self.log_text.insert(tk.END, message)
-                self.log_text.see(tk.END)
+                batch.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
 
+        if batch:
+            self.log_lines.extend(batch)
+
+            if len(batch) >= self.log_max_lines:
+                # 한 틱에 버퍼 이상 쌓인 경우 링 버퍼 내용으로 다시 그림
+                self.log_text.delete("1.0", tk.END)
+                self.log_text.insert(tk.END, "".join(self.log_lines))
+            else:
+                self.log_text.insert(tk.END, "".join(batch))
+
+            # 오래된 줄 제거 (Text는 마지막에 빈 줄 1개를 유지)
+            line_count = int(self.log_text.index("end-1c").split(".")[0]) - 1
+            excess = line_count - self.log_max_lines
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+
+            self.log_text.see(tk.END)
+
         # 100ms마다 체크
         self.root.after(100, self.check_log_queue)
 
@@ -479,7 +994,8 @@ class PhotoProcessorGUI:
         self.errors_label.config(text=str(self.stats['errors']))
 
     def clear_log(self):
-        """로그 지우기"""
+        """로그 지우기 (화면만, 로그 파일은 유지)"""
+        self.log_lines.clear()
         self.log_text.delete(1.0, tk.END)
 
     def start_monitoring(self):
@@ -488,6 +1004,7 @@ class PhotoProcessorGUI:
             return
 
         self.is_monitoring = True
+        self.monitor_stop = threading.Event()
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         self.status_label.config(text="🟢 모니터링 중")
@@ -509,6 +1026,7 @@ class PhotoProcessorGUI:
             return
 
         self.is_monitoring = False
+        self.monitor_stop.set()
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.status_label.config(text="⚪ 대기 중")
@@ -521,124 +1039,89 @@ class PhotoProcessorGUI:
         self.log("=" * 50)
 
     def monitoring_loop(self):
-        """모니터링 루프 (백그라운드)"""
-        import time
-
-        # 처리된 파일 목록 로드
-        processed_files = self.load_processed_files()
+        """모니터링 루프 (백그라운드) - 연결된 모든 카메라에서 수집, 바디별 처리 기록"""
+        from utils.multi_camera import MultiCameraIngest, ProcessedStore
+        from utils.spool import DEFAULT_SPOOL_CONFIG, dispatcher_from_config
 
         # 최신 설정 로드
         self.load_config()
 
-        # 하이브리드 프로세서 초기화
-        processor = HybridProcessor(self.config)
-        processor.set_mode(self.processing_mode)
+        # 공유 하이브리드 프로세서 (설정 변경은 ConfigWatcher가 즉시 반영)
+        processor = self.get_processor()
 
         status = processor.get_status()
         self.log(f"  AI 상태: {status['ai_reason']}")
         self.log(f"  오버레이 상태: {'준비됨' if status['overlay_available'] else '미설정'}")
+        if 'templates' in status:
+            self.log(f"  템플릿: {len(status['templates']['templates'])}개 ({status['templates']['selection']})")
 
-        # 카메라 연결 (한 번만)
-        camera = CameraConnection()
-        if not camera.connect():
-            self.log("❌ 카메라 연결 실패")
-            self.root.after(0, self.stop_monitoring)
-            return
-
-        self.log(f"✅ 카메라 연결 유지: {camera.camera_name}")
+        # 스풀 모드: 처리는 공유 폴더의 작업으로 (다른 PC의 cli.py worker가 처리)
+        dispatcher = dispatcher_from_config(self.config, processor, self.monitor_stop)
+        process_workers = None
+        if dispatcher:
+            self.log(f"  📮 스풀 모드: {dispatcher.spool.path}")
+            process_workers = self.config['spool'].get('max_in_flight', DEFAULT_SPOOL_CONFIG['max_in_flight'])
 
-        while self.is_monitoring:
-            new_files = []
-
-            try:
-                self.log(f"🔍 카메라 스캔 중... ({self.check_interval}초 간격)")
-                
-                # 연결 상태 확인
-                if not camera.is_connected:
-                    self.log("⚠️ 카메라 연결 끊김, 재연결 시도...")
-                    if not camera.connect():
-                        self.log("❌ 재연결 실패")
-                        time.sleep(self.check_interval)
-                        continue
-
-                # 새 파일 확인 및 다운로드
-                all_files = camera.get_all_files()
-                self.log(f"  📁 카메라 파일 수: {len(all_files)}개")
-                
-                # 파일이 0개면 연결 문제일 수 있음 - 재연결 시도
-                if len(all_files) == 0 and camera.is_connected:
-                    self.log("⚠️ 파일 0개 - 연결 확인 중...")
-                    camera.is_connected = False
-                    if camera.connect():
-                        self.log("✅ 재연결 성공")
-                        all_files = camera.get_all_files()
-                        self.log(f"  📁 재스캔 파일 수: {len(all_files)}개")
-                    else:
-                        self.log("❌ 재연결 실패")
-                        time.sleep(self.check_interval)
-                        continue
-
-                for file_info in all_files:
-                    if file_info['full_path'] in processed_files:
-                        continue
-
-                    if camera.download_file(file_info, self.original_folder):
-                        new_files.append(file_info['name'])
-                        processed_files.add(file_info['full_path'])
-                        self.stats['downloaded'] += 1
-                        self.log(f"  ✅ {file_info['name']} 다운로드 완료")
-
-                # 이미지 처리 (하이브리드)
-                if new_files:
-                    self.log(f"✅ 새 파일 {len(new_files)}개 발견!")
-
-                    for filename in new_files:
-                        input_path = os.path.join(self.original_folder, filename)
-                        output_path = os.path.join(self.output_folder, filename)
-
-                        success, method, msg = processor.process_image(input_path, output_path)
-
-                        if success:
-                            if method == 'ai':
-                                self.stats['ai_processed'] += 1
-                                self.log(f"  🤖 {filename} AI 변환 완료")
-                            else:
-                                self.stats['overlay_processed'] += 1
-                                self.log(f"  🖼️ {filename} 오버레이 합성 ({msg})")
-                            # 미리보기 업데이트 (메인 스레드에서)
-                            self.root.after(0, lambda p=output_path, m=method: self.update_preview(p, m))
-                        else:
-                            self.stats['errors'] += 1
-                            self.log(f"  ❌ {filename} 처리 실패: {msg}")
-
-                    self.root.after(0, self.update_stats)
-                    self.save_processed_files(processed_files)
+        def handle(item: dict) -> bool:
+            filename = item['output_name']
+            self.stats['downloaded'] += 1
+            processor.set_backlog(self.camera_ingest.pending())
 
-            except Exception as e:
-                self.log(f"❌ 오류: {e}")
+            output_path = os.path.join(self.output_folder, filename)
+            if dispatcher:
+                success, method, msg = dispatcher.process_image(
+                    item['local_path'], output_path, key=f"{item['body_id']}:{item['file_info']['full_path']}")
+            else:
+                success, method, msg = processor.process_image(item['local_path'], output_path)
+                # 저장 실패는 기록하지 않고 다음 스캔에서 재시도 (디스크 부족 등)
+                if success and not processor.wait_output(output_path):
+                    self.stats['errors'] += 1
+                    self.log(f"  ❌ {filename} 출력 저장 실패")
+                    self.post(self.update_stats)
+                    return False
+
+            if success and method == 'duplicate':
+                # 연속 촬영 중복 - 결과 파일 없음
+                self.log(f"  ⏭️ {filename} {msg}")
+            elif success:
+                if method == 'ai':
+                    self.stats['ai_processed'] += 1
+                    self.log(f"  🤖 {filename} AI 변환 완료")
+                else:
+                    self.stats['overlay_processed'] += 1
+                    self.log(f"  🖼️ {filename} 오버레이 합성 ({msg})")
+                # 미리보기 업데이트 (메인 스레드에서)
+                self.post(self.update_preview, output_path, method)
+            else:
                 self.stats['errors'] += 1
-                self.root.after(0, self.update_stats)
-                # 오류 시 연결 상태 리셋
-                camera.is_connected = False
+                self.log(f"  ❌ {filename} 처리 실패: {msg}")
 
-            # 대기
-            time.sleep(self.check_interval)
+            self.post(self.update_stats)
+            # 실패해도 처리 기록 (같은 사진을 반복 재시도하지 않음)
+            return True
 
-        # 모니터링 종료 시 연결 해제
-        camera.disconnect()
+        self.camera_ingest = MultiCameraIngest(
+            self.config, ProcessedStore(self.processed_files_db), self.original_folder, handle,
+            interval=self.check_interval, stop_event=self.monitor_stop, log=self.log,
+            process_workers=process_workers)
+        self.camera_ingest.run()
         self.log("📴 카메라 연결 해제")
 
-    def load_processed_files(self):
-        """처리된 파일 목록 로드"""
-        if os.path.exists(self.processed_files_db):
-            with open(self.processed_files_db, 'r') as f:
-                return set(json.load(f))
-        return set()
-
-    def save_processed_files(self, processed_files):
-        """처리된 파일 목록 저장"""
-        with open(self.processed_files_db, 'w') as f:
-            json.dump(list(processed_files), f, indent=2)
+    def get_processor(self) -> HybridProcessor:
+        """공유 하이브리드 프로세서 (첫 호출 시 생성, 백그라운드 스레드에서 호출)"""
+        with self.processor_lock:
+            if self.processor is None:
+                self.processor = HybridProcessor(self.config)
+                self.processor.set_mode(self.processing_mode)
+            return self.processor
+
+    def on_config_file_changed(self, config: dict):
+        """config.json 변경 감지 (감시 스레드) - 실행 중인 프로세서에 즉시 반영"""
+        with self.processor_lock:
+            processor = self.processor
+        if processor is not None:
+            processor.apply_config(config)
+            self.log(f"🔄 설정 변경 적용 (모드: {processor.mode})")
 
     def browse_folder(self, var, config_key):
         """폴더 선택 다이얼로그"""
@@ -675,10 +1158,14 @@ class PhotoProcessorGUI:
             self.log(f"✅ 오버레이 이미지 변경: {file_path}")
 
     def manual_process(self):
-        """수동으로 이미지 선택하여 처리"""
+        """수동으로 이미지 선택하여 처리 (백그라운드 워커 풀)"""
+        if self.manual_thread and self.manual_thread.is_alive():
+            self.log("⚠️ 수동 처리가 이미 진행 중입니다")
+            return
+
         file_paths = filedialog.askopenfilenames(
             title="처리할 이미지 선택",
-            filetypes=[("이미지 파일", "*.jpg *.jpeg *.png"), ("모든 파일", "*.*")]
+            filetypes=[("이미지 파일", "*.jpg *.jpeg *.png *.cr2 *.CR2"), ("모든 파일", "*.*")]
         )
 
         if not file_paths:
@@ -689,38 +1176,120 @@ class PhotoProcessorGUI:
         # 최신 설정 로드
         self.load_config()
 
-        # 하이브리드 프로세서 초기화
-        processor = HybridProcessor(self.config)
-        processor.set_mode(self.processing_mode)
+        # 진행 상황 초기화
+        self.manual_cancel.clear()
+        self.manual_done = 0
+        self.manual_tree.delete(*self.manual_tree.get_children())
+        for index, file_path in enumerate(file_paths):
+            self.manual_tree.insert('', tk.END, iid=str(index),
+                                    values=(os.path.basename(file_path), "⏳ 대기"))
+        self.manual_progress.config(maximum=len(file_paths), value=0)
+        self.manual_progress_label.config(text=f"0 / {len(file_paths)}")
+        self.manual_button.config(state=tk.DISABLED)
+        self.manual_cancel_button.config(state=tk.NORMAL)
+
+        self.manual_thread = threading.Thread(
+            target=self._run_manual_batch,
+            args=(list(file_paths), self.config, self.output_folder),
+            daemon=True
+        )
+        self.manual_thread.start()
 
-        for file_path in file_paths:
-            filename = os.path.basename(file_path)
-            output_path = os.path.join(self.output_folder, filename)
+    def _run_manual_batch(self, file_paths, config, output_folder):
+        """수동 처리 배치 실행 (백그라운드 스레드)"""
+        # 공유 프로세서 (첫 사용 시 생성 - 오버레이 디코딩 등 느린 작업도 메인 스레드 밖에서)
+        processor = self.get_processor()
 
-            self.log(f"  처리 중: {filename}")
+        workers = max(1, config.get('processing', {}).get('manual_workers', 2))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='manual') as pool:
+            for index, file_path in enumerate(file_paths):
+                pool.submit(self._manual_task, processor, index, file_path, output_folder)
 
-            success, method, msg = processor.process_image(file_path, output_path)
+        self.post(self._finish_manual_batch, len(file_paths))
 
-            if success:
-                if method == 'ai':
-                    self.stats['ai_processed'] += 1
-                    self.log(f"  🤖 {filename} AI 변환 완료")
-                else:
-                    self.stats['overlay_processed'] += 1
-                    self.log(f"  🖼️ {filename} 오버레이 합성")
-                # 미리보기 업데이트
-                self.update_preview(output_path, method)
+    def _manual_task(self, processor, index, file_path, output_folder):
+        """단일 파일 처리 (워커 스레드)"""
+        filename = os.path.basename(file_path)
+
+        if self.manual_cancel.is_set():
+            self.post(self._on_manual_result, index, filename, None, 'cancelled', "취소됨", None)
+            return
+
+        self.post(self._set_manual_status, index, "🔄 처리 중")
+        output_path = os.path.join(output_folder, output_name(filename))
+
+        try:
+            success, method, msg = processor.process_image(file_path, output_path)
+            # 비동기 저장까지 끝나야 완료 (디스크 부족 등 저장 실패는 실패로 표시)
+            if success and not processor.wait_output(output_path):
+                success, msg = False, "출력 저장 실패"
+        except Exception as e:
+            success, method, msg = False, 'none', str(e)
+
+        self.post(self._on_manual_result, index, filename, success, method, msg, output_path)
+
+    def post(self, callback, *args):
+        """작업 스레드 → 메인 스레드 호출 요청 (종료 중이면 무시)"""
+        if not self.closing:
+            self.root.after(0, callback, *args)
+
+    def _set_manual_status(self, index, status):
+        """파일별 상태 표시 (메인 스레드)"""
+        if self.manual_tree.exists(str(index)):
+            self.manual_tree.set(str(index), 'status', status)
+
+    def _on_manual_result(self, index, filename, success, method, msg, output_path):
+        """파일 처리 결과 반영 (메인 스레드)"""
+        if success is None:
+            self._set_manual_status(index, "⏹ 취소")
+        elif success and method == 'duplicate':
+            self.log(f"  ⏭️ {filename} {msg}")
+            self._set_manual_status(index, "⏭️ 중복 건너뜀")
+        elif success:
+            if method == 'ai':
+                self.stats['ai_processed'] += 1
+                self.log(f"  🤖 {filename} AI 변환 완료")
+                self._set_manual_status(index, "🤖 AI 변환 완료")
             else:
-                self.stats['errors'] += 1
-                self.log(f"  ❌ {filename} 실패: {msg}")
+                self.stats['overlay_processed'] += 1
+                self.log(f"  🖼️ {filename} 오버레이 합성")
+                self._set_manual_status(index, f"🖼️ 오버레이 ({msg})")
+            # 미리보기 업데이트
+            self.update_preview(output_path, method)
+        else:
+            self.stats['errors'] += 1
+            self.log(f"  ❌ {filename} 실패: {msg}")
+            self._set_manual_status(index, f"❌ {msg}")
 
+        self.manual_done += 1
+        self.manual_progress.config(value=self.manual_done)
+        self.manual_progress_label.config(text=f"{self.manual_done} / {int(self.manual_progress['maximum'])}")
         self.update_stats()
-        self.log(f"✅ 수동 처리 완료")
+
+    def _finish_manual_batch(self, total):
+        """배치 종료 처리 (메인 스레드)"""
+        self.manual_button.config(state=tk.NORMAL)
+        self.manual_cancel_button.config(state=tk.DISABLED)
+
+        if self.manual_cancel.is_set():
+            self.log(f"⏹ 수동 처리 취소됨 ({self.manual_done}/{total})")
+        else:
+            self.log(f"✅ 수동 처리 완료")
+
+    def cancel_manual_process(self):
+        """수동 처리 취소 (진행 중인 파일은 완료 후 중단)"""
+        if self.manual_thread and self.manual_thread.is_alive():
+            self.manual_cancel.set()
+            self.manual_cancel_button.config(state=tk.DISABLED)
+            self.log("⏹ 수동 처리 취소 요청 (진행 중인 파일 완료 후 중단)")
 
     def reconnect_camera(self):
-        """카메라 재연결 시도 (start.command와 동일한 3회 재시도)"""
-        import time
+        """카메라 재연결 시도 (백그라운드 - 대기/재시도 중에도 UI 응답 유지)"""
+        self.reconnect_button.config(state=tk.DISABLED)
+        threading.Thread(target=self._reconnect_camera_worker, daemon=True).start()
 
+    def _reconnect_camera_worker(self):
+        """카메라 재연결 (start.command와 동일한 3회 재시도)"""
         self.log("🔄 카메라 재연결 시도 중...")
         self.log("  🔧 카메라 프로세스 정리...")
 
@@ -736,7 +1305,7 @@ class PhotoProcessorGUI:
 
             # 2. 카메라 연결 시도
             try:
-                camera = CameraConnection()
+                camera = create_camera(self.config)
                 if camera.connect():
                     self.log(f"✅ 카메라 재연결 성공: {camera.camera_name}")
                     camera.disconnect()
@@ -754,23 +1323,73 @@ class PhotoProcessorGUI:
             self.log("❌ 카메라 재연결 실패 (3회 시도 모두 실패)")
             self.log("💡 해결 방법: USB 케이블을 뽑았다가 다시 연결 후 재시도")
 
+        self.root.after(0, lambda: self.reconnect_button.config(state=tk.NORMAL))
+        self.update_ai_status()
+
     def quit_app(self):
         """프로그램 종료 (start.command와 동일한 강력한 프로세스 정리)"""
+        if self.closing:
+            return
         if self.is_monitoring:
             self.stop_monitoring()
 
+        # 진행 중인 수동 처리 중단
+        self.manual_cancel.set()
+
         # 카메라 점유 프로세스 강제 종료 (start.command와 동일)
         self.log("🧹 카메라 프로세스 강제 정리 중...")
         self.log("  🔧 ptpcamerad, mscamerad, icdd, cameracaptured, Image Capture 종료...")
         kill_camera_processes()
         self.log("  ✅ 모든 카메라 프로세스 정리 완료")
+
+        if self.profiler:
+            self.profiler.stop()
+
+        # 진행 중인 처리/저장을 마치고 프로세서 정리 (이벤트 루프는 계속 돌려서 작업 스레드가 막히지 않게)
+        self.closing = True
+        self.log("⏳ 진행 중인 처리/저장 완료 대기...")
+        shutdown = threading.Thread(target=self._shutdown_workers, name='shutdown', daemon=True)
+        shutdown.start()
+        self._finish_quit(shutdown, time.monotonic() + SHUTDOWN_WAIT_SECONDS)
+
+    def _shutdown_workers(self):
+        """작업 스레드 종료 대기 후 프로세서 정리 (남은 저장 완료, 합성 프로세스/공유 메모리 해제)"""
+        for thread in (self.manual_thread, self.monitor_thread):
+            if thread is not None:
+                thread.join()
+        with self.processor_lock:
+            processor = self.processor
+        if processor is not None:
+            processor.close()
+
+    def _finish_quit(self, shutdown, deadline):
+        """정리 스레드가 끝나면 (또는 SHUTDOWN_WAIT_SECONDS가 지나면) 종료 (메인 스레드)"""
+        if shutdown.is_alive() and time.monotonic() < deadline:
+            self.root.after(100, self._finish_quit, shutdown, deadline)
+            return
+        if shutdown.is_alive():
+            self.log(f"⚠️ 진행 중인 처리를 {SHUTDOWN_WAIT_SECONDS}초 안에 마치지 못하고 종료")
+
         self.log("✅ 프로그램 종료")
 
+        self.status_prober.stop()
+        self.config_watcher.stop()
+        self.thumbnail_loader.shutdown()
+        self.gallery.loader.shutdown()
+
+        if self.log_listener:
+            self.log_listener.stop()
+
         self.root.quit()
 
 
 def main():
     """메인 실행 함수"""
+    import argparse
+    parser = argparse.ArgumentParser(description='Canon 100D 사진 자동 처리 GUI')
+    parser.add_argument('--profile', action='store_true', help='cProfile + tracemalloc 프로파일링')
+    args = parser.parse_args()
+
     # 설정 파일 확인
     if not os.path.exists("config.json"):
         print("❌ config.json 파일을 찾을 수 없습니다.")
@@ -783,10 +1402,21 @@ def main():
 
     # GUI 실행
     root = tk.Tk()
-    app = PhotoProcessorGUI(root)
+    app = PhotoProcessorGUI(root, profile=args.profile)
     root.protocol("WM_DELETE_WINDOW", app.quit_app)
+
+    # 시작 시간 벤치마크: 첫 화면을 그린 뒤 종료
+    if startup_checkpoint('gui'):
+        root.update()
+        root.destroy()
+        return
+
     root.mainloop()
 
 
 if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):
+        # 패키징된 앱에서 합성 프로세스(spawn) 시작 처리
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
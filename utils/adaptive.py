@@ -0,0 +1,143 @@
+"""
+적응형 처리 모드 (adaptive)
+
+목표 SLO(촬영~출력 시간) 안에 대기열을 비울 수 있는지 예측해서
+사진마다 AI / 오버레이 경로를 선택
+
+- 예측: 대기열이 쌓인 뒤 지난 시간 + (대기 중인 사진 수 + 1) × 최근 AI 처리 시간
+  (AI로 보냈다가 실패한 사진은 AI에서 기다린 시간 + 폴백 시간)
+- SLO를 넘길 것 같으면 일부 사진만 오버레이로 보냄 (AI 비율을 계산해서 균등 분배)
+- 대기열이 줄고 예측이 SLO × resume_ratio 이하가 되면 다시 전부 AI로 (히스테리시스)
+
+config.json:
+    "processing": {
+        "mode": "adaptive",
+        "adaptive": { "slo_seconds": 90, "window": 20, "resume_ratio": 0.7 }
+    }
+"""
+
+import threading
+import time
+from collections import deque
+
+from utils.metrics import ADAPTIVE_AI_SHARE, ADAPTIVE_DECISIONS
+
+
+class AdaptivePolicy:
+    """대기열 / AI 지연 기반 경로 선택"""
+
+    def __init__(self, adaptive_config: dict = None):
+        """
+        Args:
+            adaptive_config: processing.adaptive 설정
+                - slo_seconds: 목표 촬영~출력 시간 (기본: 90)
+                - window: 처리 시간 추정에 쓰는 최근 표본 수 (기본: 20)
+                - resume_ratio: 예측이 SLO의 이 비율 이하면 AI 복귀 (기본: 0.7)
+                - initial_ai_seconds: 표본이 없을 때 AI 처리 시간 추정치 (기본: 20)
+                - initial_overlay_seconds: 표본이 없을 때 오버레이 처리 시간 추정치 (기본: 1)
+        """
+        self._lock = threading.Lock()
+        self.backlog = 0
+        self._queue_since = None
+        self.shedding = False
+        self.ai_share = 1.0
+        self.last_reason = "대기"
+        self.decisions = {'ai': 0, 'overlay': 0}
+        self._credit = 0.0
+        self._ai_samples = deque()
+        self._overlay_samples = deque()
+        self.configure(adaptive_config or {})
+
+    def configure(self, adaptive_config: dict):
+        """설정 변경 (기존 표본은 유지)"""
+        with self._lock:
+            self.slo_seconds = adaptive_config.get('slo_seconds', 90)
+            self.resume_ratio = adaptive_config.get('resume_ratio', 0.7)
+            self.initial_ai_seconds = adaptive_config.get('initial_ai_seconds', 20)
+            self.initial_overlay_seconds = adaptive_config.get('initial_overlay_seconds', 1)
+            window = max(1, adaptive_config.get('window', 20))
+            self._ai_samples = deque(self._ai_samples, maxlen=window)
+            self._overlay_samples = deque(self._overlay_samples, maxlen=window)
+
+    def set_backlog(self, count: int):
+        """처리 대기 중인 사진 수 (현재 처리 중인 사진 제외)"""
+        with self._lock:
+            self.backlog = max(0, count)
+            if self.backlog == 0:
+                self._queue_since = None
+            elif self._queue_since is None:
+                self._queue_since = time.monotonic()
+
+    def observe(self, route: str, seconds: float):
+        """경로별 처리 시간 기록 ('ai' 또는 'overlay')"""
+        with self._lock:
+            if route == 'ai':
+                self._ai_samples.append(seconds)
+            elif route == 'overlay':
+                self._overlay_samples.append(seconds)
+
+    @staticmethod
+    def _estimate(samples, default: float) -> float:
+        return sum(samples) / len(samples) if samples else default
+
+    def choose(self) -> str:
+        """
+        다음 사진의 경로 선택
+
+        Returns:
+            'ai' 또는 'overlay'
+        """
+        with self._lock:
+            ai_seconds = self._estimate(self._ai_samples, self.initial_ai_seconds)
+            overlay_seconds = self._estimate(self._overlay_samples, self.initial_overlay_seconds)
+            photos = self.backlog + 1
+            # 대기열이 생긴 뒤 지난 시간 포함 (가장 오래 기다린 사진 기준, 보수적)
+            waited = time.monotonic() - self._queue_since if self._queue_since else 0.0
+            predicted = waited + photos * ai_seconds
+
+            if self.shedding:
+                if self.backlog == 0 or predicted <= self.slo_seconds * self.resume_ratio:
+                    self.shedding = False
+            elif predicted > self.slo_seconds:
+                self.shedding = True
+
+            if self.shedding:
+                # k장은 AI, 나머지는 오버레이로 처리할 때 SLO 안에 끝나는 최대 k
+                budget = self.slo_seconds - waited - photos * overlay_seconds
+                extra = max(ai_seconds - overlay_seconds, 1e-6)
+                self.ai_share = min(1.0, max(0.0, budget / extra / photos))
+                self.last_reason = (f"대기 {self.backlog}장, 예측 {predicted:.0f}초 "
+                                    f"> SLO {self.slo_seconds}초")
+            else:
+                self.ai_share = 1.0
+                self._credit = 0.0
+                self.last_reason = f"예측 {predicted:.0f}초 ≤ SLO {self.slo_seconds}초"
+
+            # 오차 누적 방식으로 비율만큼 AI 배정 (연속으로 몰리지 않게)
+            self._credit += self.ai_share
+            if self._credit >= 1.0 - 1e-9:
+                self._credit -= 1.0
+                route = 'ai'
+            else:
+                route = 'overlay'
+
+            self.decisions[route] += 1
+
+        ADAPTIVE_DECISIONS.inc(route=route, state='shedding' if self.shedding else 'normal')
+        ADAPTIVE_AI_SHARE.set(self.ai_share)
+        return route
+
+    def get_status(self) -> dict:
+        """현재 판단 상태"""
+        with self._lock:
+            return {
+                'slo_seconds': self.slo_seconds,
+                'backlog': self.backlog,
+                'queue_age_seconds': time.monotonic() - self._queue_since if self._queue_since else 0.0,
+                'shedding': self.shedding,
+                'ai_share': self.ai_share,
+                'ai_estimate_seconds': self._estimate(self._ai_samples, self.initial_ai_seconds),
+                'overlay_estimate_seconds': self._estimate(self._overlay_samples, self.initial_overlay_seconds),
+                'decisions': dict(self.decisions),
+                'reason': self.last_reason,
+            }
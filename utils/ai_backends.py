@@ -0,0 +1,477 @@
+"""
+AI 백엔드 모듈 (Gemini generateContent)
+
+- RestBackend: requests 직접 호출 (keep-alive 연결 풀 재사용, 응답 스트리밍 디코딩, 기본값)
+- GenaiSDKBackend: google-genai SDK 사용 (선택)
+
+base_url을 로컬 mock 서버(utils.mock_gemini)로 바꾸면
+할당량/인터넷 없이 처리량과 폴백 동작을 측정할 수 있음
+"""
+
+import base64
+import binascii
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+from utils.metrics import AI_BYTES
+
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class AIBackend:
+    """AI 백엔드 인터페이스"""
+
+    name = 'base'
+
+    # False면 인터넷 확인 생략 (로컬 mock 서버 등)
+    requires_internet = True
+
+    def is_ready(self) -> Tuple[bool, str]:
+        """
+        호출 가능 여부
+
+        Returns:
+            (가능 여부, 사유 메시지)
+        """
+        return True, "준비됨"
+
+    def generate(self, model: str, prompt: str, image_bytes: bytes, mime_type: str, output_path: str,
+                 timeout: float, cancel_event: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        이미지 변환 요청 후 결과를 output_path에 저장
+
+        Args:
+            model: 모델명
+            prompt: 변환 프롬프트
+            image_bytes: 업로드할 이미지 바이트 (원본 그대로, utils.upload.prepare_upload)
+            mime_type: 이미지 MIME 타입
+            output_path: 결과 저장 경로
+            timeout: 요청 타임아웃 (초)
+            cancel_event: 설정되면 요청을 중단하고 결과를 저장하지 않음 (헤지 요청에서 진 쪽,
+                utils.hedging.CancelEvent면 응답 대기 중에도 연결을 끊음)
+
+        Returns:
+            (성공 여부, 결과 메시지)
+        """
+        raise NotImplementedError
+
+
+CANCELLED = (False, "취소됨 (다른 요청이 먼저 완료)")
+
+
+def _temp_output(output_path: str):
+    """output_path와 같은 폴더의 임시 파일 (rename이 원자적이도록)"""
+    directory = os.path.dirname(output_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(output_path) + '.', suffix='.part', dir=directory)
+    return os.fdopen(fd, 'wb'), temp_path
+
+
+def _save_output(output_path: str, image_data: bytes):
+    """결과 이미지 저장 (임시 파일에 쓰고 rename)"""
+    f, temp_path = _temp_output(output_path)
+    with f:
+        f.write(image_data)
+    os.replace(temp_path, output_path)
+
+
+class InlineImageExtractor:
+    """
+    generateContent 응답(JSON)에서 첫 inlineData.data를 점진적으로 찾아 base64 디코딩
+
+    응답 전체를 메모리에 올리지 않고 청크마다 디코딩해서 파일에 씀
+    (요청당 메모리 = 청크 크기 수준으로 일정)
+    """
+
+    _START = re.compile(rb'"inline_?[dD]ata"\s*:\s*\{[^{}]*?"data"\s*:\s*"')
+    _TAIL = 512  # 청크 경계에 걸친 시작 패턴을 찾기 위해 남겨두는 길이
+
+    def __init__(self, output):
+        """
+        Args:
+            output: 디코딩된 바이트를 쓸 파일 객체
+        """
+        self.output = output
+        self.state = 'search'  # search → data → done
+        self.written = 0
+        self._search_buffer = b''
+        self._pending = b''  # 4의 배수로 맞추고 남은 base64 문자
+
+    def feed(self, chunk: bytes):
+        if self.state == 'search':
+            self._search_buffer += chunk
+            match = self._START.search(self._search_buffer)
+            if not match:
+                self._search_buffer = self._search_buffer[-self._TAIL:]
+                return
+            chunk = self._search_buffer[match.end():]
+            self._search_buffer = b''
+            self.state = 'data'
+
+        if self.state == 'data':
+            end = chunk.find(b'"')
+            if end >= 0:
+                chunk = chunk[:end]
+            self._decode(chunk)
+            if end >= 0:
+                self._decode(b'', final=True)
+                self.state = 'done'
+
+    def _decode(self, chunk: bytes, final: bool = False):
+        # JSON에서 '/'는 '\/'로 이스케이프될 수 있음 (경계에 걸친 역슬래시는 다음 청크로)
+        data = (self._pending + chunk).replace(b'\\/', b'/')
+        if data.endswith(b'\\') and not final:
+            data, carry = data[:-1], b'\\'
+        else:
+            carry = b''
+        usable = len(data) if final else len(data) - len(data) % 4
+        if usable:
+            decoded = binascii.a2b_base64(data[:usable])
+            self.output.write(decoded)
+            self.written += len(decoded)
+        self._pending = data[usable:] + carry
+
+    @property
+    def done(self) -> bool:
+        return self.state == 'done'
+
+
+# 현재 스레드의 요청에 연결된 취소 이벤트 (연결 클래스가 요청을 보낼 때 중단 함수를 등록)
+_request_scope = threading.local()
+
+
+def _cancellable_pool(pool_cls):
+    """요청을 보낼 때 소켓을 끊는 중단 함수를 현재 취소 이벤트에 등록하는 연결 풀 클래스"""
+
+    class CancellableConnection(pool_cls.ConnectionCls):
+        def request(self, *args, **kwargs):
+            cancel_event = getattr(_request_scope, 'cancel_event', None)
+            if cancel_event is not None and hasattr(cancel_event, 'on_cancel'):
+                cancel_event.on_cancel(self._abort)
+            return super().request(*args, **kwargs)
+
+        def _abort(self):
+            # 다른 스레드에서 recv 중인 소켓도 바로 깨어남 (연결은 urllib3가 폐기)
+            sock = self.sock
+            if sock is not None:
+                sock.shutdown(socket.SHUT_RDWR)
+
+    class CancellablePool(pool_cls):
+        ConnectionCls = CancellableConnection
+
+    return CancellablePool
+
+
+def _cancellable_adapter(**kwargs):
+    """취소 시 진행 중인 연결을 끊을 수 있는 HTTPAdapter"""
+    from requests.adapters import HTTPAdapter
+
+    class CancellableAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **pool_kwargs):
+            super().init_poolmanager(*args, **pool_kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                scheme: _cancellable_pool(pool_cls)
+                for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+            }
+
+    return CancellableAdapter(**kwargs)
+
+
+class RestBackend(AIBackend):
+    """REST 백엔드 (requests.Session 연결 풀, keep-alive)"""
+
+    name = 'rest'
+
+    # 응답 수신 청크 크기 (요청당 메모리 사용량 상한에 해당)
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, api_key: str, base_url: str = DEFAULT_BASE_URL, pool_size: int = 4):
+        """
+        Args:
+            api_key: Gemini API 키
+            base_url: API 기본 URL (mock 서버 사용 시 http://127.0.0.1:8765/v1beta)
+            pool_size: 호스트당 유지할 연결 수 (동시 요청 수 이상 권장)
+        """
+        import requests
+
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.requires_internet = urlparse(self.base_url).hostname not in ('127.0.0.1', 'localhost', '::1')
+
+        self.session = requests.Session()
+        adapter = _cancellable_adapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'x-goog-api-key': api_key,
+            'Content-Type': 'application/json',
+        })
+
+    def generate(self, model, prompt, image_bytes, mime_type, output_path, timeout, cancel_event=None):
+        import requests
+
+        body = {
+            'contents': [{
+                'parts': [
+                    {'text': prompt},
+                    {'inline_data': {'mime_type': mime_type,
+                                     'data': base64.b64encode(image_bytes).decode('ascii')}},
+                ]
+            }],
+            'generationConfig': {'responseModalities': ['TEXT', 'IMAGE']},
+        }
+
+        url = f"{self.base_url}/models/{model}:generateContent"
+        deadline = time.monotonic() + timeout
+        _request_scope.cancel_event = cancel_event
+        try:
+            try:
+                response = self.session.post(url, json=body, timeout=timeout, stream=True)
+            except requests.Timeout:
+                return False, f"타임아웃 ({timeout}초)"
+            except (requests.RequestException, OSError) as e:
+                if cancel_event is not None and cancel_event.is_set():
+                    return CANCELLED
+                return False, f"요청 실패: {e}"
+            finally:
+                _request_scope.cancel_event = None
+
+            AI_BYTES.inc(len(response.request.body or b''), direction='out')
+
+            with response:
+                if response.status_code == 429:
+                    return False, "할당량 초과 (429)"
+                if response.status_code != 200:
+                    return False, f"API 오류 ({response.status_code}): {response.text[:200]}"
+
+                try:
+                    return self._stream_to_file(response, output_path, deadline, timeout, cancel_event)
+                except (requests.RequestException, OSError, ValueError) as e:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return CANCELLED
+                    return False, f"응답 수신 실패: {e}"
+                finally:
+                    # 연결이 풀로 돌아가기 전에 등록 해제
+                    if hasattr(cancel_event, 'clear_aborts'):
+                        cancel_event.clear_aborts()
+        finally:
+            if hasattr(cancel_event, 'clear_aborts'):
+                cancel_event.clear_aborts()
+
+    def _stream_to_file(self, response, output_path, deadline, timeout, cancel_event):
+        """응답을 청크 단위로 파싱해서 임시 파일에 디코딩 후 rename"""
+        f, temp_path = _temp_output(output_path)
+        try:
+            with f:
+                extractor = InlineImageExtractor(f)
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    AI_BYTES.inc(len(chunk), direction='in')
+                    # 취소/타임아웃이면 연결을 끊어서 나머지 수신도 중단
+                    if cancel_event is not None and cancel_event.is_set():
+                        return CANCELLED
+                    if time.monotonic() > deadline:
+                        return False, f"타임아웃 ({timeout}초)"
+                    extractor.feed(chunk)
+
+            if not extractor.done or extractor.written == 0:
+                return False, "API 응답에 이미지 없음"
+            os.replace(temp_path, output_path)
+            temp_path = None
+            return True, "AI 변환 완료"
+        except binascii.Error:
+            return False, "API 응답 파싱 실패"
+        finally:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+
+class GenaiSDKBackend(AIBackend):
+    """google-genai SDK 백엔드"""
+
+    name = 'sdk'
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.client = None
+
+        try:
+            from google import genai
+            self.client = genai.Client(api_key=api_key)
+        except ImportError:
+            print("⚠️ google-genai 패키지가 설치되지 않았습니다.")
+        except Exception as e:
+            print(f"⚠️ AI 클라이언트 초기화 실패: {e}")
+
+    def is_ready(self):
+        if not self.client:
+            return False, "SDK 클라이언트 미초기화"
+        return True, "준비됨"
+
+    def generate(self, model, prompt, image_bytes, mime_type, output_path, timeout, cancel_event=None):
+        try:
+            from google.genai import types
+        except ImportError:
+            return False, "google-genai 패키지 미설치"
+
+        AI_BYTES.inc(len(image_bytes), direction='out')
+
+        def call():
+            return self.client.models.generate_content(
+                model=model,
+                contents=[prompt, types.Part.from_bytes(data=image_bytes, mime_type=mime_type)],
+                config=types.GenerateContentConfig(
+                    response_modalities=["TEXT", "IMAGE"]
+                )
+            )
+
+        if cancel_event is None:
+            response = call()
+        else:
+            # SDK 호출은 밖에서 끊을 수 없음 - 별도 스레드에서 돌리고 취소되면 결과를 버리고 바로 반환
+            done = threading.Event()
+            outcome = {}
+
+            def run():
+                try:
+                    outcome['response'] = call()
+                except Exception as e:
+                    outcome['error'] = e
+                finally:
+                    done.set()
+
+            threading.Thread(target=run, name='ai-sdk-call', daemon=True).start()
+            if hasattr(cancel_event, 'on_cancel'):
+                cancel_event.on_cancel(done.set)
+                done.wait()
+                cancel_event.clear_aborts()
+            else:
+                while not done.wait(0.2) and not cancel_event.is_set():
+                    pass
+            if cancel_event.is_set():
+                return CANCELLED
+            if 'error' in outcome:
+                raise outcome['error']
+            response = outcome['response']
+
+        if cancel_event is not None and cancel_event.is_set():
+            return CANCELLED
+
+        for part in response.parts:
+            if part.inline_data is not None:
+                image_data = part.inline_data.data
+                AI_BYTES.inc(len(image_data), direction='in')
+                _save_output(output_path, image_data)
+                return True, "AI 변환 완료"
+
+        return False, "API 응답에 이미지 없음"
+
+
+def backend_requires_internet(ai_config: dict) -> bool:
+    """백엔드를 만들지 않고 인터넷 필요 여부 판단 (로컬 mock 서버면 False)"""
+    if ai_config.get('backend', 'rest') != 'rest':
+        return True
+    hostname = urlparse(ai_config.get('base_url', DEFAULT_BASE_URL)).hostname
+    return hostname not in ('127.0.0.1', 'localhost', '::1')
+
+
+class LazyBackend(AIBackend):
+    """
+    첫 AI 호출 시 실제 백엔드 생성 (requests / google-genai import와 연결 준비를 시작 시점에서 제외)
+
+    AITransformer 사본끼리 공유되므로 백엔드는 한 번만 생성됨
+    """
+
+    # 백엔드별 필요 패키지 (생성 전 설치 여부만 확인)
+    REQUIRED_MODULES = {'rest': 'requests', 'sdk': 'google.genai'}
+
+    def __init__(self, ai_config: dict):
+        self.config = dict(ai_config)
+        self.name = ai_config.get('backend', 'rest')
+        self.requires_internet = backend_requires_internet(ai_config)
+        self._backend: Optional[AIBackend] = None
+        self._error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._backend is not None
+
+    def get(self) -> Optional[AIBackend]:
+        """실제 백엔드 (없으면 생성, 실패 시 None)"""
+        if self._backend is not None or self._error is not None:
+            return self._backend
+        with self._lock:
+            if self._backend is None and self._error is None:
+                try:
+                    self._backend = create_backend(self.config)
+                    print(f"✅ AI 백엔드 초기화 완료 ({self._backend.name})")
+                except ImportError as e:
+                    self._error = f"패키지 미설치: {e}"
+                except Exception as e:
+                    self._error = f"AI 백엔드 초기화 실패: {e}"
+                if self._error:
+                    print(f"⚠️ {self._error}")
+        return self._backend
+
+    def is_ready(self) -> Tuple[bool, str]:
+        if self._backend is not None:
+            return self._backend.is_ready()
+        if self._error is not None:
+            return False, self._error
+
+        # 생성 전에는 패키지 설치 여부만 확인 (import하지 않음)
+        import importlib.util
+        module = self.REQUIRED_MODULES.get(self.name)
+        if module is None:
+            return False, f"알 수 없는 AI 백엔드: {self.name}"
+        try:
+            installed = importlib.util.find_spec(module) is not None
+        except ImportError:
+            installed = False
+        if not installed:
+            return False, f"패키지 미설치: {module}"
+        return True, "준비됨"
+
+    def generate(self, model, prompt, image_bytes, mime_type, output_path, timeout, cancel_event=None):
+        backend = self.get()
+        if backend is None:
+            return False, self._error
+        ready, reason = backend.is_ready()
+        if not ready:
+            return False, reason
+        return backend.generate(model, prompt, image_bytes, mime_type, output_path, timeout, cancel_event)
+
+
+def create_backend(ai_config: dict) -> AIBackend:
+    """
+    설정에 맞는 백엔드 생성
+
+    Args:
+        ai_config: AI 설정 딕셔너리
+            - backend: 'rest' (기본) 또는 'sdk'
+            - base_url: REST 기본 URL (기본: Gemini API)
+            - pool_size: REST 연결 풀 크기 (기본: 4)
+    """
+    backend = ai_config.get('backend', 'rest')
+    api_key = ai_config.get('api_key', '')
+
+    if backend == 'sdk':
+        return GenaiSDKBackend(api_key)
+    if backend == 'rest':
+        return RestBackend(
+            api_key,
+            base_url=ai_config.get('base_url', DEFAULT_BASE_URL),
+            pool_size=ai_config.get('pool_size', 4)
+        )
+
+    raise ValueError(f"알 수 없는 AI 백엔드: {backend}")
@@ -5,33 +5,50 @@ AI 이미지 변환 모듈 (Gemini 2.5 Flash Image)
 - 온라인: AI 변환
 - 오프라인: 오버레이 합성 폴백
 
-requests 기반 직접 API 호출 (google-genai SDK 미사용)
+requests 기반 직접 API 호출 (기본, utils.ai_backends.RestBackend)
 - pydantic 의존성 제거
 - macOS 버전 호환성 문제 해결
+- google-genai SDK는 ai.backend = "sdk"로 선택 가능
 """
 
 import os
-import socket
-import base64
 import json
+import socket
+import copy
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional, Tuple
 
-import requests
-from PIL import Image
+from utils.adaptive import AdaptivePolicy
+from utils.ai_backends import LazyBackend
+from utils.encoder import OutputEncoder
+from utils.hedging import HedgePolicy, run_hedged
+from utils.output_writer import OutputWriter, temp_path_for
+from utils.raw import extract_preview_to_temp, is_raw
+from utils.upload import prepare_upload
+from utils.metrics import AI_AVAILABLE, DUPLICATES, PROCESSED, STAGE_SECONDS
+
+# wait_output용 표시: 중복으로 건너뛴 출력 (저장할 파일 없음)
+_SKIPPED = object()
+
+
+# 처리 모드 (adaptive: 대기열/AI 지연에 따라 사진마다 AI 또는 오버레이)
+PROCESSING_MODES = ('ai', 'overlay', 'hybrid', 'adaptive')
 
 
 def check_internet(host: str = "8.8.8.8", port: int = 53, timeout: float = 3.0) -> bool:
     """인터넷 연결 확인 (DNS 서버 접근)"""
     try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True
-    except (socket.error, OSError):
+        # 전역 기본 타임아웃을 바꾸지 않고, 소켓은 즉시 닫음
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
         return False
 
 
 class AITransformer:
-    """AI 이미지 변환 클래스 (Gemini SDK 방식)"""
+    """AI 이미지 변환 클래스 (백엔드: REST 기본, SDK 선택)"""
 
     def __init__(self, config: dict):
         """
@@ -41,22 +58,23 @@ class AITransformer:
                 - model: 모델명 (기본: gemini-2.5-flash-image)
                 - prompt: 변환 프롬프트
                 - timeout_seconds: 타임아웃 (기본: 120)
+                - backend: 'rest' (기본) 또는 'sdk'
+                - base_url: REST 기본 URL (로컬 mock 서버 지정 가능)
+                - hedge: 헤지 요청 설정 (utils.hedging.HedgePolicy 참조)
+                - upload: 업로드 정책 (utils.upload.prepare_upload 참조)
         """
         self.api_key = config.get('api_key', '')
         self.model = config.get('model', 'gemini-2.5-flash-image')
         self.prompt = config.get('prompt', '')
         self.timeout = config.get('timeout_seconds', 120)
-        self.client = None
+        self.backend_config = dict(config)
+        self.upload_config = config.get('upload', {})
+        self.backend = None
+        self.hedge = HedgePolicy(config.get('hedge', {}))
 
         if self.api_key:
-            try:
-                from google import genai
-                self.client = genai.Client(api_key=self.api_key)
-                print(f"✅ AI 클라이언트 초기화 완료 (모델: {self.model})")
-            except ImportError:
-                print("⚠️ google-genai 패키지가 설치되지 않았습니다.")
-            except Exception as e:
-                print(f"⚠️ AI 클라이언트 초기화 실패: {e}")
+            # 클라이언트는 첫 AI 호출 시 생성 (시작 시간 단축)
+            self.backend = LazyBackend(config)
         else:
             print("⚠️ AI API 키가 설정되지 않았습니다.")
 
@@ -70,24 +88,33 @@ class AITransformer:
         if not self.api_key:
             return False, "API 키 미설정"
 
-        if not self.client:
-            return False, "SDK 클라이언트 미초기화"
+        if not self.backend:
+            return False, "AI 백엔드 미초기화"
+
+        ready, reason = self.backend.is_ready()
+        if not ready:
+            return False, reason
 
         if not self.prompt:
             return False, "프롬프트 미설정"
 
-        if not check_internet():
+        if self.backend.requires_internet and not check_internet():
+            AI_AVAILABLE.set(0)
             return False, "인터넷 연결 없음"
 
+        AI_AVAILABLE.set(1)
         return True, "준비됨"
 
-    def transform_image(self, input_path: str, output_path: str) -> Tuple[bool, str]:
+    def transform_image(self, input_path: str, output_path: str, writer=None,
+                        encoder: Optional[OutputEncoder] = None) -> Tuple[bool, str]:
         """
-        이미지를 AI로 변환 (SDK 방식)
+        이미지를 AI로 변환
 
         Args:
             input_path: 입력 이미지 경로
             output_path: 출력 이미지 경로
+            writer: OutputWriter (지정 시 임시 파일에 받은 뒤 저장 스레드가 fsync/rename)
+            encoder: 출력 인코더 (apply_to_ai면 응답을 프로파일로 재인코딩)
 
         Returns:
             (성공 여부, 결과 메시지)
@@ -97,64 +124,83 @@ class AITransformer:
         if not available:
             return False, f"AI 변환 불가: {reason}"
 
+        reencode = encoder is not None and encoder.apply_to_ai
+        target_path = output_path
         try:
-            from google import genai
-            from google.genai import types
-            from PIL import Image
-
-            # 이미지 로드
-            image = Image.open(input_path)
-            print(f"🔄 AI 변환 중... (모델: {self.model})")
-
-            # API 호출 (SDK 방식)
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[self.prompt, image],
-                config=types.GenerateContentConfig(
-                    response_modalities=["TEXT", "IMAGE"]
-                )
-            )
-
-            # 결과 처리
-            for part in response.parts:
-                if part.inline_data is not None:
-                    # 이미지 데이터 추출
-                    image_data = part.inline_data.data
-
-                    # 출력 폴더 생성
-                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                    # 이미지 저장
-                    with open(output_path, "wb") as f:
-                        f.write(image_data)
-
-                    return True, "AI 변환 완료"
-
-            return False, "API 응답에 이미지 없음"
-
-        except ImportError:
-            return False, "google-genai 패키지 미설치"
+            if writer is not None or reencode:
+                target_path = temp_path_for(output_path)
+
+            # 원본 바이트 그대로 업로드 (업로드 정책을 넘을 때만 축소/재인코딩)
+            image_bytes, mime_type, upload_path = prepare_upload(input_path, self.upload_config)
+            print(f"🔄 AI 변환 중... (모델: {self.model}, 업로드: {upload_path} {len(image_bytes) // 1024}KB)")
+            start = time.monotonic()
+
+            hedge_delay = self.hedge.delay()
+            if hedge_delay is None:
+                success, msg = self.backend.generate(
+                    self.model, self.prompt, image_bytes, mime_type, target_path, self.timeout)
+                if success:
+                    self.hedge.observe(time.monotonic() - start)
+            else:
+                model, prompt, timeout = self.model, self.prompt, self.timeout
+                success, msg = run_hedged(
+                    self.hedge,
+                    lambda temp_path, cancel_event: self.backend.generate(
+                        model, prompt, image_bytes, mime_type, temp_path, timeout, cancel_event),
+                    target_path, hedge_delay)
+            STAGE_SECONDS.observe(time.monotonic() - start, stage='ai')
+
+        except ImportError as e:
+            success, msg = False, f"패키지 미설치: {e}"
         except Exception as e:
-            return False, f"AI 변환 실패: {str(e)}"
+            success, msg = False, f"AI 변환 실패: {str(e)}"
+
+        if success and not reencode and encoder is not None and encoder.share['enabled']:
+            try:
+                # 본 결과는 받은 그대로 두고 공유 사본만 (디코딩 1회)
+                encoder.save_share(target_path, output_path, writer)
+            except Exception as e:
+                success, msg = False, f"AI 결과 공유 사본 저장 실패: {e}"
+
+        if target_path != output_path:
+            if success and reencode:
+                try:
+                    encoder.save_file(target_path, output_path, writer)
+                except Exception as e:
+                    success, msg = False, f"AI 결과 인코딩 실패: {e}"
+                os.remove(target_path)
+            elif success:
+                writer.submit_file(target_path, output_path)
+            elif os.path.exists(target_path):
+                os.remove(target_path)
+
+        return success, msg
 
     def update_prompt(self, new_prompt: str):
         """프롬프트 업데이트"""
         self.prompt = new_prompt
 
     def update_api_key(self, new_key: str):
-        """API 키 업데이트"""
+        """API 키 업데이트 (백엔드 재생성)"""
         self.api_key = new_key
         if new_key:
-            try:
-                from google import genai
-                self.client = genai.Client(api_key=new_key)
-                print(f"✅ API 키 업데이트 완료")
-            except Exception as e:
-                print(f"⚠️ API 키 업데이트 실패: {e}")
+            self.backend_config['api_key'] = new_key
+            self.backend = LazyBackend(self.backend_config)
+            print(f"✅ API 키 업데이트 완료")
+
+    def warm_up(self):
+        """백엔드 미리 생성 (모니터링 시작 후 백그라운드에서 호출 - 첫 사진 지연 방지)"""
+        if self.backend is not None:
+            self.backend.get()
 
 
 class HybridProcessor:
-    """하이브리드 이미지 처리기 (AI + 오버레이 폴백)"""
+    """
+    하이브리드 이미지 처리기 (AI + 오버레이 폴백)
+
+    한 번 생성해서 계속 사용하고, 설정 변경은 apply_config()로 즉시 반영
+    (AI 클라이언트는 API 키가 바뀔 때만, 오버레이는 경로/수정시각이 바뀔 때만 다시 생성)
+    """
 
     def __init__(self, config: dict):
         """
@@ -164,67 +210,328 @@ class HybridProcessor:
         self.config = config
         self.ai_transformer = None
         self.image_processor = None
-        self.mode = config.get('processing', {}).get('mode', 'hybrid')  # ai, overlay, hybrid
+        self.mode = config.get('processing', {}).get('mode', 'hybrid')  # ai, overlay, hybrid, adaptive
+        self.adaptive = AdaptivePolicy(config.get('processing', {}).get('adaptive', {}))
+        self.dedup = None
+        # 출력 경로 → 그 작업이 사용한 writer (None: 동기 저장, _SKIPPED: 중복으로 건너뜀, 최근 것만)
+        self._output_writers = OrderedDict()
+        # 처리 중인 작업이 시작할 때 잡은 writer/compositor → 작업 수
+        self._users = {}
+        # 설정 교체로 빠졌지만 아직 잡고 있는 작업이 남은 writer/compositor (마지막 작업이 끝나면 close)
+        self._retired = []
+        self._overlay_key = None
+        self.compositor = None
+        self._compositor_key = None
+        self.templates = None
+        self.output_writer = None
+        self._writer_config = None
+        self.encoder = None
+        self._lock = threading.Lock()
 
         self._init_processors()
 
     def _init_processors(self):
         """프로세서 초기화"""
-        # AI 변환기 초기화
-        ai_config = self.config.get('ai', {})
-        if ai_config.get('api_key'):
-            self.ai_transformer = AITransformer(ai_config)
+        self.apply_config(self.config)
+
+    def apply_config(self, config: dict):
+        """
+        설정 변경 적용 (재시작 없이, 처리 중인 작업은 이전 설정으로 완료)
 
-        # 오버레이 프로세서 초기화 (폴백용)
+        Args:
+            config: 전체 설정 딕셔너리
+        """
+        # 느린 작업(클라이언트 생성, 오버레이 디코딩)은 락 밖에서 준비
+        ai_transformer = self._build_ai_transformer(config.get('ai', {}))
+        cache_config = config.get('processing', {}).get('overlay_cache', {})
+        image_processor, overlay_key = self._build_image_processor(
+            config.get('paths', {}).get('overlay_image', ''), cache_config)
+        templates = self._build_templates(config.get('processing', {}).get('templates', {}), cache_config)
+
+        mode = config.get('processing', {}).get('mode', 'hybrid')
+        self.adaptive.configure(config.get('processing', {}).get('adaptive', {}))
+        self._configure_dedup(config.get('processing', {}).get('dedup', {}))
+
+        encoder = OutputEncoder(config.get('processing', {}).get('encoder', {}))
+
+        # 출력 저장 스레드 (설정이 바뀔 때만 새로 만들고, 이전 것은 남은 저장을 마친 뒤 종료)
+        writer_config = config.get('processing', {}).get('async_writer', {})
+        old_writer = None
+        output_writer = self.output_writer
+        if writer_config != self._writer_config:
+            old_writer = self.output_writer
+            output_writer = OutputWriter.from_config(writer_config)
+
+        # 합성 프로세스 (오버레이나 설정이 바뀔 때만 새로 만들고, 이전 것은 진행 중인 합성 후 종료)
+        compositor_config = config.get('processing', {}).get('compositor', {})
+        compositor_key = (overlay_key, templates.key if templates else None,
+                          json.dumps(compositor_config, sort_keys=True))
+        old_compositor = None
+        compositor = self.compositor
+        if compositor_key != self._compositor_key:
+            old_compositor = self.compositor
+            compositor = None
+            fallback = image_processor or (next(iter(templates.processors.values())) if templates else None)
+            if fallback is not None and compositor_config.get('processes', 0) > 0:
+                from utils.image_processor import ProcessCompositor
+                compositor = ProcessCompositor(fallback.overlay_path, fallback, compositor_config,
+                                               templates.paths if templates else ())
+
+        # 참조 교체만 락 안에서 (process_image는 시작 시점의 조합을 사용)
+        with self._lock:
+            self.config = config
+            self.ai_transformer = ai_transformer
+            self.image_processor = image_processor
+            self._overlay_key = overlay_key
+            self.templates = templates
+            self.compositor = compositor
+            self._compositor_key = compositor_key
+            self.output_writer = output_writer
+            self._writer_config = writer_config
+            self.encoder = encoder
+            if mode in PROCESSING_MODES:
+                self.mode = mode
+
+        self._retire(old_writer, old_compositor)
+
+    def _retire(self, *resources):
+        """교체된 writer/compositor 정리 - 그것을 잡고 시작한 작업이 모두 끝난 뒤 close"""
+        idle = []
+        with self._lock:
+            for resource in resources:
+                if resource is None:
+                    continue
+                if self._users.get(resource):
+                    self._retired.append(resource)
+                else:
+                    idle.append(resource)
+        for resource in idle:
+            resource.close()
+
+    def _release(self, resources: tuple):
+        """작업 종료 - 교체된 것의 마지막 작업이면 close"""
+        idle = []
+        with self._lock:
+            for resource in resources:
+                self._users[resource] -= 1
+                if self._users[resource] == 0:
+                    del self._users[resource]
+                    if resource in self._retired:
+                        self._retired.remove(resource)
+                        idle.append(resource)
+        for resource in idle:
+            resource.close()
+
+    def _build_ai_transformer(self, ai_config: dict) -> Optional['AITransformer']:
+        """AI 변환기 준비 (API 키/백엔드 설정이 같으면 연결 재사용)"""
+        if not ai_config.get('api_key'):
+            return None
+
+        current = self.ai_transformer
+        backend_keys = ('api_key', 'backend', 'base_url', 'pool_size')
+        if current is None or any(current.backend_config.get(k) != ai_config.get(k) for k in backend_keys):
+            return AITransformer(ai_config)
+
+        # 헤지 설정은 사본끼리 공유하는 정책 객체에 바로 반영 (지연 표본/예산 유지)
+        if current.hedge.config != ai_config.get('hedge', {}):
+            current.hedge.configure(ai_config.get('hedge', {}))
+
+        settings = (ai_config.get('model', 'gemini-2.5-flash-image'),
+                    ai_config.get('prompt', ''),
+                    ai_config.get('timeout_seconds', 120))
+        if settings == (current.model, current.prompt, current.timeout) and \
+                current.upload_config == ai_config.get('upload', {}):
+            return current
+
+        # 프롬프트/모델/업로드 정책만 바뀐 경우: 백엔드(연결)를 공유하는 사본으로 교체
+        updated = copy.copy(current)
+        updated.model, updated.prompt, updated.timeout = settings
+        updated.backend_config = dict(ai_config)
+        updated.upload_config = ai_config.get('upload', {})
+        return updated
+
+    def _build_image_processor(self, overlay_path: str, cache_config: dict):
+        """오버레이 프로세서 준비 (경로/수정시각/캐시 설정이 같으면 재사용)"""
         from utils.image_processor import ImageProcessor
-        overlay_path = self.config.get('paths', {}).get('overlay_image', '')
-        if overlay_path and os.path.exists(overlay_path):
-            self.image_processor = ImageProcessor(overlay_path)
+
+        if not overlay_path or not os.path.exists(overlay_path):
+            return None, None
+
+        overlay_key = (os.path.abspath(overlay_path), os.path.getmtime(overlay_path),
+                       json.dumps(cache_config, sort_keys=True))
+        if overlay_key == self._overlay_key and self.image_processor is not None:
+            return self.image_processor, overlay_key
+
+        image_processor = ImageProcessor(overlay_path, cache_config)
+        if image_processor.overlay_image is not None and image_processor.overlay_cache is None:
+            # 캐시를 쓰지 않으면 첫 사진 전에 미리 디코딩
+            image_processor.load_overlay()
+        return image_processor, overlay_key
+
+    def _build_templates(self, templates_config: dict, cache_config: dict):
+        """템플릿 풀 준비 (폴더 내용/캐시 설정이 같으면 재사용하고 선택 규칙만 반영)"""
+        from utils.overlay_templates import TemplatePool
+
+        folder = templates_config.get('folder', '')
+        if not folder:
+            return None
+        if not os.path.isdir(folder):
+            print(f"⚠️ 템플릿 폴더를 찾을 수 없습니다: {folder}")
+            return None
+
+        current = self.templates
+        if current is not None and current.key == TemplatePool.key_for(folder, cache_config):
+            current.configure(templates_config)
+            return current
+
+        templates = TemplatePool(folder, templates_config, cache_config, previous=current)
+        if not templates:
+            print(f"⚠️ 템플릿 폴더에 PNG가 없습니다: {folder}")
+            return None
+        return templates
+
+    def _configure_dedup(self, dedup_config: dict):
+        """중복 감지 설정 (처음 켤 때만 생성 - 이후에는 색인을 유지한 채 설정만 반영)"""
+        if self.dedup is not None:
+            self.dedup.configure(dedup_config)
+        elif dedup_config.get('enabled', False):
+            from utils.phash import DuplicateIndex
+            self.dedup = DuplicateIndex(dedup_config)
 
     def process_image(self, input_path: str, output_path: str) -> Tuple[bool, str, str]:
         """
         이미지 처리 (하이브리드)
 
         Args:
-            input_path: 입력 이미지 경로
+            input_path: 입력 이미지 경로 (CR2는 내장 JPEG를 꺼내서 처리)
             output_path: 출력 이미지 경로
 
         Returns:
             (성공 여부, 사용된 방식, 결과 메시지)
         """
+        if is_raw(input_path):
+            try:
+                with STAGE_SECONDS.time(stage='raw_extract'):
+                    preview_path = extract_preview_to_temp(input_path)
+            except (OSError, ValueError) as e:
+                PROCESSED.inc(method='none', result='failure')
+                return False, 'none', f"RAW 내장 JPEG 추출 실패: {e}"
+            try:
+                return self.process_image(preview_path, output_path)
+            finally:
+                os.remove(preview_path)
+
+        # 설정 교체와 겹치지 않도록 시작 시점의 조합을 사용
+        with self._lock:
+            mode, ai_transformer = self.mode, self.ai_transformer
+            image_processor = self.compositor or self.image_processor
+            if self.templates is not None:
+                # 템플릿은 오버레이로 처리하는 사진에서만 선택
+                image_processor = self.templates.route(self.compositor)
+            writer, encoder = self.output_writer, self.encoder
+            # 이 작업이 끝날 때까지 설정이 바뀌어도 writer/compositor를 닫지 않음
+            resources = tuple(r for r in (writer, self.compositor) if r is not None)
+            for resource in resources:
+                self._users[resource] = self._users.get(resource, 0) + 1
+            self._remember_output(output_path, writer)
+            if encoder.share['enabled']:
+                self._remember_output(encoder.share_path(output_path), writer)
+
+        try:
+            return self._process_with(input_path, output_path, mode, ai_transformer, image_processor,
+                                      writer, encoder)
+        finally:
+            self._release(resources)
+
+    def _process_with(self, input_path: str, output_path: str, mode: str,
+                      ai_transformer, image_processor, writer, encoder) -> Tuple[bool, str, str]:
+        """시작 시점의 조합으로 처리 (중복 검사 → 모드별 처리 → 메트릭)"""
+        # 연속 촬영 중복: 건너뛰거나 오버레이로만 처리 (오버레이 모드에서 overlay 처리는 의미 없음)
+        dedup, shot = self.dedup, None
+        if dedup is not None and dedup.enabled and not (mode == 'overlay' and dedup.action == 'overlay'):
+            # 출력 경로로 구분 - 실패 후 다시 처리하는 사진(RAW는 매번 다른 임시 JPEG)이 자기 자신과 겹치지 않게
+            duplicate, shot = dedup.check(input_path, key=output_path)
+            if duplicate is not None:
+                DUPLICATES.inc(action=duplicate['action'])
+                detail = f"{duplicate['name']}와 거리 {duplicate['distance']}, {duplicate['seconds']:.1f}초"
+                if duplicate['action'] == 'skip':
+                    with self._lock:
+                        self._remember_output(output_path, _SKIPPED)
+                        if encoder.share['enabled']:
+                            self._remember_output(encoder.share_path(output_path), _SKIPPED)
+                    PROCESSED.inc(method='duplicate', result='success')
+                    dedup.add(shot)
+                    return True, 'duplicate', f"연속 촬영 중복 - 건너뜀 ({detail})"
+                if image_processor:
+                    print(f"⚡ 연속 촬영 중복 - 오버레이 처리 ({detail})")
+                    mode = 'overlay'
+
+        with STAGE_SECONDS.time(stage='total'):
+            success, method, msg = self._process_image(
+                input_path, output_path, mode, ai_transformer, image_processor, writer, encoder)
+        PROCESSED.inc(method=method, result='success' if success else 'failure')
+        if success and dedup is not None:
+            # 처리에 성공한 사진만 색인에 추가 (실패한 사진은 다시 처리할 때 중복으로 보지 않음)
+            dedup.add(shot)
+        return success, method, msg
+
+    def _process_image(self, input_path: str, output_path: str, mode: str,
+                       ai_transformer, image_processor, writer, encoder) -> Tuple[bool, str, str]:
+        """모드별 처리 (메트릭 기록 전)"""
         # AI 전용 모드
-        if self.mode == 'ai':
-            if self.ai_transformer:
-                success, msg = self.ai_transformer.transform_image(input_path, output_path)
+        if mode == 'ai':
+            if ai_transformer:
+                success, msg = ai_transformer.transform_image(input_path, output_path, writer, encoder)
                 return success, 'ai', msg
             else:
                 return False, 'ai', "AI 변환기 미설정"
 
         # 오버레이 전용 모드
-        if self.mode == 'overlay':
-            if self.image_processor:
-                success = self.image_processor.composite_image(input_path, output_path)
+        if mode == 'overlay':
+            if image_processor:
+                success = image_processor.composite_image(input_path, output_path, writer=writer, encoder=encoder)
                 return success, 'overlay', "오버레이 합성 완료" if success else "오버레이 합성 실패"
             else:
                 return False, 'overlay', "오버레이 프로세서 미설정"
 
+        # 적응형 모드: SLO를 넘길 것 같으면 이 사진은 바로 오버레이
+        route = 'ai'
+        if mode == 'adaptive' and ai_transformer:
+            route = self.adaptive.choose()
+            if route == 'overlay':
+                print(f"⚡ 적응형: 오버레이 처리 ({self.adaptive.last_reason})")
+
         # 하이브리드 모드: AI 우선, 실패 시 오버레이 폴백
-        if self.ai_transformer:
-            success, msg = self.ai_transformer.transform_image(input_path, output_path)
+        ai_seconds = None
+        if ai_transformer and route == 'ai':
+            start = time.monotonic()
+            success, msg = ai_transformer.transform_image(input_path, output_path, writer, encoder)
+            ai_seconds = time.monotonic() - start
             if success:
+                self.adaptive.observe('ai', ai_seconds)
                 return True, 'ai', msg
 
             # AI 실패 시 폴백
+            PROCESSED.inc(method='ai', result='failure')
             print(f"⚠️ AI 변환 실패 ({msg}), 오버레이 폴백 시도...")
 
         # 오버레이 폴백
-        if self.image_processor:
-            success = self.image_processor.composite_image(input_path, output_path)
+        if image_processor:
+            start = time.monotonic()
+            success = image_processor.composite_image(input_path, output_path, writer=writer, encoder=encoder)
+            overlay_seconds = time.monotonic() - start
+            self.adaptive.observe('overlay', overlay_seconds)
+            if ai_seconds is not None:
+                # AI로 보낸 사진의 실제 비용 (실패/시간 초과까지 기다린 시간 + 폴백)
+                # - AI가 느려지거나 실패하기 시작하면 예측에 바로 반영되어 부하를 덜어냄
+                self.adaptive.observe('ai', ai_seconds + overlay_seconds)
             if success:
                 return True, 'overlay', "오버레이 폴백 사용"
             else:
                 return False, 'overlay', "오버레이 폴백도 실패"
 
+        if ai_seconds is not None:
+            self.adaptive.observe('ai', ai_seconds)
         return False, 'none', "처리 가능한 방식 없음"
 
     def get_status(self) -> dict:
@@ -236,17 +543,75 @@ class HybridProcessor:
             'overlay_available': False
         }
 
+        if self.mode == 'adaptive':
+            status['adaptive'] = self.adaptive.get_status()
+
         if self.ai_transformer:
             status['ai_available'], status['ai_reason'] = self.ai_transformer.is_available()
+            if self.ai_transformer.hedge.enabled:
+                status['hedge'] = self.ai_transformer.hedge.get_status()
         else:
             status['ai_reason'] = "AI 변환기 미설정"
 
         status['overlay_available'] = self.image_processor is not None and \
                                        self.image_processor.overlay_image is not None
+        if self.templates is not None:
+            status['overlay_available'] = True
+            status['templates'] = self.templates.get_status()
 
         return status
 
+    def wait_output(self, output_path: str, timeout: Optional[float] = None) -> bool:
+        """
+        출력 파일 저장 완료 대기 (process_image는 저장 요청만 하고 반환할 수 있음)
+
+        Returns:
+            저장 성공 여부
+        """
+        # 설정 교체 뒤에도 그 작업이 실제로 사용한 writer에서 확인
+        writer = self._output_writers.get(output_path, self.output_writer)
+        if writer is _SKIPPED:
+            return True
+        if writer is None:
+            return os.path.exists(output_path)
+        return writer.wait(output_path, timeout)
+
+    def _remember_output(self, output_path: str, writer):
+        """출력 경로별 사용한 writer 기록 (self._lock 안에서 호출, 최근 1000개)"""
+        self._output_writers[output_path] = writer
+        self._output_writers.move_to_end(output_path)
+        while len(self._output_writers) > 1000:
+            self._output_writers.popitem(last=False)
+
+    def warm_up(self):
+        """AI 클라이언트 / 오버레이 캐시 / 합성 프로세스 미리 준비 (시작 직후 백그라운드 스레드에서 호출)"""
+        ai_transformer = self.ai_transformer
+        if ai_transformer is not None:
+            ai_transformer.warm_up()
+        image_processor = self.image_processor
+        if image_processor is not None and image_processor.overlay_cache is not None:
+            image_processor.overlay_cache.precompile()
+        templates = self.templates
+        if templates is not None:
+            templates.precompile()
+        compositor = self.compositor
+        if compositor is not None:
+            compositor.warm_up()
+
+    def close(self):
+        """남은 출력 저장 완료 후 정리 (교체됐지만 아직 닫지 않은 것 포함)"""
+        with self._lock:
+            resources = [self.output_writer, self.compositor, *self._retired]
+            self._retired = []
+        for resource in resources:
+            if resource is not None:
+                resource.close()
+
+    def set_backlog(self, count: int):
+        """처리 대기 중인 사진 수 전달 (모니터 루프에서 호출, adaptive 모드 판단용)"""
+        self.adaptive.set_backlog(count)
+
     def set_mode(self, mode: str):
-        """처리 모드 설정 (ai, overlay, hybrid)"""
-        if mode in ('ai', 'overlay', 'hybrid'):
+        """처리 모드 설정 (ai, overlay, hybrid, adaptive)"""
+        if mode in PROCESSING_MODES:
             self.mode = mode
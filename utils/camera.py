@@ -8,6 +8,9 @@ import time
 import gphoto2 as gp
 from typing import List, Dict, Optional
 
+from utils.metrics import DOWNLOADS, DOWNLOAD_BYTES, STAGE_SECONDS
+from utils.raw import JPEG_EXTENSIONS, RAW_EXTENSIONS, is_raw, output_name, save_camera_preview
+
 
 def kill_camera_processes():
     """macOS 카메라 프로세스 강제 종료"""
@@ -17,27 +20,54 @@ def kill_camera_processes():
     subprocess.run(['pkill', '-9', '-f', 'cameracaptured'], stderr=subprocess.DEVNULL)
 
 
+def detect_cameras() -> List[tuple]:
+    """연결된 카메라 목록 [(모델명, 포트), ...] (연결/점유 없이 USB 열거만)"""
+    try:
+        return [(name, port) for name, port in gp.Camera.autodetect()]
+    except gp.GPhoto2Error:
+        return []
+
+
 class CameraConnection:
     """Canon 카메라 연결 및 파일 관리 클래스"""
 
     TARGET_CAMERA = "Canon EOS 100D"  # 연결할 카메라 모델명
 
-    def __init__(self):
+    def __init__(self, port: Optional[str] = None):
+        """
+        Args:
+            port: 연결할 포트 (예: usb:020,005 - None이면 처음 찾은 Canon)
+        """
+        self.port = port
         self.camera = None
         self.is_connected = False
         self.camera_name = "Unknown"
+        self.body_id = None  # 카메라 바디 식별자 (시리얼 번호, 없으면 포트)
 
     def _find_canon_camera(self):
-        """Canon EOS 100D 카메라를 찾아서 포트 반환"""
+        """Canon EOS 100D 카메라를 찾아서 포트 반환 (포트 지정 시 그 포트만)"""
         try:
             cameras = gp.Camera.autodetect()
             for name, port in cameras:
+                if self.port and port != self.port:
+                    continue
                 if self.TARGET_CAMERA in name or "Canon" in name:
                     return name, port
         except:
             pass
         return None, None
 
+    def _read_serial_number(self) -> Optional[str]:
+        """바디 시리얼 번호 (지원하지 않는 카메라/libgphoto2면 None)"""
+        for key in ('serialnumber', 'eosserialnumber'):
+            try:
+                value = self.camera.get_single_config(key).get_value()
+            except (gp.GPhoto2Error, AttributeError):
+                continue
+            if value and value.strip('0 '):
+                return value.strip()
+        return None
+
     def connect(self) -> bool:
         """카메라 연결 (Canon EOS 100D 명시적 지정, 3회 재시도)"""
         MAX_ATTEMPTS = 3
@@ -51,6 +81,11 @@ class CameraConnection:
                 # Canon 카메라 찾기
                 camera_name, port = self._find_canon_camera()
 
+                if self.port and not port:
+                    # 지정한 포트의 카메라가 사라짐 (USB 분리 / 포트 변경)
+                    print(f"❌ 카메라 연결 실패: {self.port}에서 카메라를 찾을 수 없음")
+                    return False
+
                 if port:
                     # 특정 포트로 연결
                     self.camera = gp.Camera()
@@ -70,6 +105,7 @@ class CameraConnection:
 
                 # Canon 카메라인지 확인
                 if "Canon" in self.camera_name:
+                    self.body_id = self._read_serial_number() or port or self.camera_name
                     print(f"✅ 카메라 연결됨: {self.camera_name}")
                     return True
                 else:
@@ -113,7 +149,7 @@ class CameraConnection:
             return False
 
     def get_all_files(self) -> List[Dict[str, any]]:
-        """카메라 내 모든 JPG 파일 목록 조회 (매번 새로고침)"""
+        """카메라 내 모든 JPG/CR2 파일 목록 조회 (매번 새로고침)"""
         if not self.is_connected:
             print("⚠️ 카메라가 연결되지 않았습니다.")
             return []
@@ -139,9 +175,9 @@ class CameraConnection:
                 file_list = self.camera.folder_list_files(path)
                 files = [file_list.get_name(i) for i in range(file_list.count())]
 
-                # JPG 파일 수집
+                # JPG / RAW 파일 수집
                 for filename in files:
-                    if filename.lower().endswith(('.jpg', '.jpeg')):
+                    if filename.lower().endswith(JPEG_EXTENSIONS + RAW_EXTENSIONS):
                         file_info = self.camera.file_get_info(path, filename)
                         size_mb = file_info.file.size / (1024 * 1024)
                         files_list.append({
@@ -160,15 +196,32 @@ class CameraConnection:
                 pass
 
         # 루트부터 전체 탐색
-        scan_folder("/")
+        with STAGE_SECONDS.time(stage='scan'):
+            scan_folder("/")
         return files_list
 
+    def read_file_range(self, path: str, name: str, offset: int, size: int) -> bytes:
+        """파일 일부만 읽기 (PTP GetPartialObject, 미지원 시 GPhoto2Error)"""
+        CHUNK_SIZE = 1024 * 1024
+        data = bytearray()
+        while len(data) < size:
+            chunk = bytearray(min(CHUNK_SIZE, size - len(data)))
+            read = self.camera.file_read(path, name, gp.GP_FILE_TYPE_NORMAL, offset + len(data), chunk)
+            if read <= 0:
+                break
+            data += chunk[:read]
+        return bytes(data)
+
     def download_file(self, file_info: Dict[str, any], output_folder: str) -> bool:
-        """특정 파일 다운로드"""
+        """특정 파일 다운로드 (CR2는 내장 JPEG만 - 저장 파일명은 output_name)"""
         if not self.is_connected:
             print("⚠️ 카메라가 연결되지 않았습니다.")
             return False
 
+        if is_raw(file_info['name']):
+            return self._download_raw_preview(file_info, output_folder)
+
+        start = time.monotonic()
         try:
             # 출력 폴더 생성
             os.makedirs(output_folder, exist_ok=True)
@@ -185,12 +238,43 @@ class CameraConnection:
 
             # 파일 저장
             camera_file.save(target_path)
+
+            STAGE_SECONDS.observe(time.monotonic() - start, stage='download')
+            DOWNLOADS.inc(result='success')
+            DOWNLOAD_BYTES.inc(os.path.getsize(target_path))
             return True
 
         except gp.GPhoto2Error as e:
+            DOWNLOADS.inc(result='failure')
             print(f"❌ 다운로드 실패 ({file_info['name']}): {e}")
             return False
 
+    def _download_raw_preview(self, file_info: Dict[str, any], output_folder: str) -> bool:
+        """CR2 내장 JPEG만 부분 읽기로 가져오기 (실패 시 전체 다운로드 후 로컬 추출)"""
+        start = time.monotonic()
+        os.makedirs(output_folder, exist_ok=True)
+        path, name = file_info['path'], file_info['name']
+
+        def download_full(raw_path: str):
+            self.camera.file_get(path, name, gp.GP_FILE_TYPE_NORMAL).save(raw_path)
+
+        try:
+            transferred = save_camera_preview(
+                lambda offset, size: self.read_file_range(path, name, offset, size),
+                download_full,
+                os.path.join(output_folder, output_name(name)),
+                errors=(gp.GPhoto2Error,)
+            )
+        except (gp.GPhoto2Error, ValueError, OSError) as e:
+            DOWNLOADS.inc(result='failure')
+            print(f"❌ 다운로드 실패 ({name}): {e}")
+            return False
+
+        STAGE_SECONDS.observe(time.monotonic() - start, stage='download')
+        DOWNLOADS.inc(result='success')
+        DOWNLOAD_BYTES.inc(transferred)
+        return True
+
     def download_new_files(self, output_folder: str, processed_files: set) -> List[str]:
         """새로운 파일만 다운로드"""
         all_files = self.get_all_files()
@@ -203,7 +287,7 @@ class CameraConnection:
 
             # 파일 다운로드
             if self.download_file(file_info, output_folder):
-                new_files.append(file_info['name'])
+                new_files.append(output_name(file_info['name']))
                 print(f"  ✅ {file_info['name']} 다운로드 완료")
 
         return new_files
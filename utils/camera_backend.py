@@ -0,0 +1,89 @@
+"""
+카메라 백엔드 선택 모듈
+
+config.json의 camera.backend로 선택:
+- "gphoto2" (기본): 실제 카메라 (utils.camera, gphoto2 필요)
+- "fake": 가상 카메라 (utils.fake_camera, gphoto2 불필요)
+"""
+
+import json
+from typing import List, Optional, Tuple
+
+from utils.fake_camera import (FAKE_PORT, FakeCameraConnection, FakeCard, fake_body_index, fake_ports,
+                               merge_fake_config)
+
+
+# 설정과 포트가 같은 가상 카메라는 카드를 공유 (재연결해도 파일/촬영 기록 유지)
+_fake_cards = {}
+
+
+def camera_backend_name(config: dict) -> str:
+    """설정된 카메라 백엔드 이름"""
+    return config.get('camera', {}).get('backend', 'gphoto2')
+
+
+def is_fake_camera(config: dict) -> bool:
+    return camera_backend_name(config) == 'fake'
+
+
+def camera_available(config: dict) -> Tuple[bool, str]:
+    """
+    카메라 백엔드 사용 가능 여부
+
+    Returns:
+        (가능 여부, 설명 메시지)
+    """
+    if is_fake_camera(config):
+        return True, "가상 카메라"
+
+    try:
+        import utils.camera  # noqa: F401
+    except ImportError:
+        return False, "gphoto2 없음"
+    return True, "gphoto2 사용 가능"
+
+
+def get_fake_card(config: dict, port: str = FAKE_PORT) -> FakeCard:
+    """설정/포트에 해당하는 가상 카드 (없으면 생성 - 두 번째 바디부터는 시드를 바꿔 촬영 시점이 다름)"""
+    fake_config = merge_fake_config(config.get('camera', {}).get('fake'))
+    index = fake_body_index(port)
+    if index > 1 and fake_config['seed'] is not None:
+        fake_config['seed'] += index * 1000
+    key = (port, json.dumps(fake_config, sort_keys=True))
+    if key not in _fake_cards:
+        _fake_cards[key] = FakeCard(fake_config)
+    return _fake_cards[key]
+
+
+def reset_fake_cards():
+    """가상 카드 초기화 (부하 테스트 실행마다 빈 카드로 시작)"""
+    _fake_cards.clear()
+
+
+def create_camera(config: dict, port: Optional[str] = None):
+    """
+    설정에 맞는 카메라 연결 객체 생성 (connect()는 호출하지 않음)
+
+    Args:
+        port: 연결할 포트 (detect_cameras() 결과 - None이면 처음 찾은 카메라)
+
+    Raises:
+        ImportError: gphoto2 백엔드인데 gphoto2가 설치되지 않은 경우
+    """
+    if is_fake_camera(config):
+        port = port or FAKE_PORT
+        card = get_fake_card(config, port)
+        return FakeCameraConnection(card.config, card=card, port=port)
+
+    from utils.camera import CameraConnection
+    return CameraConnection(port)
+
+
+def detect_cameras(config: dict) -> List[tuple]:
+    """연결된 카메라 목록 [(모델명, 포트), ...]"""
+    if is_fake_camera(config):
+        fake_config = merge_fake_config(config.get('camera', {}).get('fake'))
+        return [(fake_config['model'], port) for port in fake_ports(fake_config)]
+
+    from utils.camera import detect_cameras as detect_gphoto2_cameras
+    return detect_gphoto2_cameras()
@@ -0,0 +1,77 @@
+"""
+설정 파일 변경 감시 모듈
+
+config.json의 수정 시각/크기를 주기적으로 확인하고,
+변경되면 다시 읽어서 콜백(HybridProcessor.apply_config 등)으로 전달
+"""
+
+import json
+import os
+import threading
+from typing import Callable, Optional
+
+
+class ConfigWatcher:
+    """설정 파일 감시 (폴링 방식, 추가 의존성 없음)"""
+
+    def __init__(self, config_path: str, callback: Callable[[dict], None], interval: float = 1.0):
+        """
+        Args:
+            config_path: 감시할 설정 파일 경로
+            callback: 변경된 설정 딕셔너리를 받는 함수 (감시 스레드에서 호출)
+            interval: 확인 간격 (초)
+        """
+        self.config_path = config_path
+        self.callback = callback
+        self.interval = interval
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def start(self):
+        """감시 시작 (데몬 스레드)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='config-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self) -> bool:
+        """
+        변경 확인 후 콜백 호출
+
+        Returns:
+            설정이 적용되었는지 여부
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError):
+            # 저장 도중(반쪽 파일)일 수 있음 - 다음 확인 때 다시 시도
+            return False
+
+        self._signature = signature
+        try:
+            self.callback(config)
+        except Exception as e:
+            print(f"⚠️ 설정 변경 적용 실패: {e}")
+            return False
+
+        print(f"🔄 설정 변경 적용: {self.config_path}")
+        return True
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,221 @@
+"""
+출력 인코더 프로파일 모듈
+
+오버레이/AI 결과를 프로파일(품질, progressive, optimize, 크로마 서브샘플링)에 맞춰 JPEG로 인코딩
+공유용 사본(WebP 등 작은 파일)을 함께 만들 수 있음
+
+config.json:
+    "processing": {
+        "encoder": {
+            "profile": "default",
+            "profiles": { "my_profile": { "quality": 88, "progressive": true, "optimize": true, "subsampling": "4:2:0" } },
+            "apply_to_ai": "auto",
+            "share": { "enabled": false, "format": "WEBP", "quality": 80, "method": 4, "max_dimension": 1600, "folder": "share" }
+        }
+    }
+"""
+
+import io
+import os
+import time
+from typing import List, Optional
+
+from utils.metrics import OUTPUT_BYTES, STAGE_SECONDS
+from utils.output_writer import atomic_write_bytes
+
+
+# 기본 제공 프로파일 (config의 profiles로 덮어쓰기/추가 가능)
+BUILTIN_PROFILES = {
+    # 기존 동작 (baseline, 품질 95)
+    'default': {'quality': 95, 'progressive': False, 'optimize': False, 'subsampling': '4:2:0'},
+    # 인화용 - 색 번짐 없이 (허프만 최적화로 크기만 줄임)
+    'print': {'quality': 92, 'progressive': False, 'optimize': True, 'subsampling': '4:4:4'},
+    # 인코딩 속도 우선
+    'fast': {'quality': 85, 'progressive': False, 'optimize': False, 'subsampling': '4:2:0'},
+    # 전송/저장 크기 우선
+    'compact': {'quality': 82, 'progressive': True, 'optimize': True, 'subsampling': '4:2:0'},
+}
+
+DEFAULT_SHARE = {
+    'enabled': False,
+    'format': 'WEBP',
+    'quality': 80,
+    'method': 4,
+    'max_dimension': 1600,
+    'folder': 'share'
+}
+
+# 공유 사본 포맷별 확장자
+_EXTENSIONS = {'WEBP': '.webp', 'JPEG': '.jpg'}
+
+
+def _webp_supported() -> bool:
+    from PIL import features
+    return features.check('webp')
+
+
+def encode_jpeg(image, profile: dict) -> bytes:
+    """프로파일대로 JPEG 인코딩"""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(
+        buffer, 'JPEG',
+        quality=profile.get('quality', 95),
+        progressive=profile.get('progressive', False),
+        optimize=profile.get('optimize', False),
+        subsampling=profile.get('subsampling', '4:2:0')
+    )
+    return buffer.getvalue()
+
+
+def encode_share(image, share: dict) -> bytes:
+    """공유용 사본 인코딩 (긴 변 max_dimension 이하로 축소)"""
+    max_dimension = share.get('max_dimension', 0)
+    if max_dimension and max(image.size) > max_dimension:
+        image = image.copy()
+        image.thumbnail((max_dimension, max_dimension))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    if share.get('format', 'WEBP').upper() == 'WEBP':
+        image.save(buffer, 'WEBP', quality=share.get('quality', 80), method=share.get('method', 4))
+    else:
+        image.save(buffer, 'JPEG', quality=share.get('quality', 80), optimize=True)
+    return buffer.getvalue()
+
+
+class OutputEncoder:
+    """출력 인코딩 + 저장 (저장은 OutputWriter가 있으면 저장 스레드로)"""
+
+    def __init__(self, encoder_config: Optional[dict] = None):
+        """
+        Args:
+            encoder_config: processing.encoder 설정
+                - profile: 사용할 프로파일 이름 (기본: default)
+                - profiles: 프로파일 추가/덮어쓰기
+                - apply_to_ai: AI 결과도 프로파일로 재인코딩
+                    "auto" (기본): default가 아닌 프로파일을 고른 경우만, true: 항상, false: 안 함
+                    (AI 응답은 이미 JPEG - 재인코딩하면 디코딩/인코딩 비용 + 세대 손실,
+                     재인코딩하지 않아도 share가 켜져 있으면 공유 사본은 만듦)
+                - share: 공유용 사본 설정
+        """
+        encoder_config = encoder_config or {}
+        self.profiles = {name: dict(profile) for name, profile in BUILTIN_PROFILES.items()}
+        for name, profile in encoder_config.get('profiles', {}).items():
+            self.profiles[name] = {**self.profiles.get(name, BUILTIN_PROFILES['default']), **profile}
+
+        self.profile_name = encoder_config.get('profile', 'default')
+        if self.profile_name not in self.profiles:
+            print(f"⚠️ 알 수 없는 인코더 프로파일: {self.profile_name} (default 사용)")
+            self.profile_name = 'default'
+        self.profile = self.profiles[self.profile_name]
+        apply_to_ai = encoder_config.get('apply_to_ai', 'auto')
+        if apply_to_ai == 'auto':
+            apply_to_ai = self.profile_name != 'default'
+        self.apply_to_ai = bool(apply_to_ai)
+
+        self.share = {**DEFAULT_SHARE, **encoder_config.get('share', {})}
+        self.share['format'] = self.share['format'].upper()
+        if self.share['enabled'] and self.share['format'] == 'WEBP' and not _webp_supported():
+            print("⚠️ Pillow에 WebP 지원이 없어 공유 사본을 JPEG로 저장합니다.")
+            self.share['format'] = 'JPEG'
+
+    def to_config(self) -> dict:
+        """같은 인코더를 다시 만들 수 있는 설정 (합성 프로세스에 전달)"""
+        return {
+            'profile': self.profile_name,
+            'profiles': {self.profile_name: dict(self.profile)},
+            'apply_to_ai': self.apply_to_ai,
+            'share': dict(self.share),
+        }
+
+    def share_path(self, output_path: str) -> str:
+        """공유 사본 경로 (출력 폴더/share/파일명.webp)"""
+        directory = os.path.join(os.path.dirname(output_path), self.share.get('folder', ''))
+        stem = os.path.splitext(os.path.basename(output_path))[0]
+        return os.path.join(directory, stem + _EXTENSIONS.get(self.share['format'], '.jpg'))
+
+    def save(self, image, output_path: str, writer=None):
+        """프로파일로 인코딩 후 저장 (공유 사본 포함)"""
+        start = time.monotonic()
+        renditions = [(output_path, encode_jpeg(image, self.profile), 'main')]
+        if self.share['enabled']:
+            renditions.append((self.share_path(output_path), encode_share(image, self.share), 'share'))
+        STAGE_SECONDS.observe(time.monotonic() - start, stage='encode')
+
+        for path, data, rendition in renditions:
+            self._write(path, data, rendition, writer)
+
+    def save_share(self, source_path: str, output_path: str, writer=None):
+        """받은 그대로 저장하는 결과(AI 응답)의 공유 사본만 저장 (본 JPEG는 재인코딩하지 않음)"""
+        from PIL import Image
+
+        start = time.monotonic()
+        with Image.open(source_path) as image:
+            # JPEG는 공유 크기 근처로 축소 디코딩 (전체 해상도 디코딩 없음)
+            max_dimension = self.share.get('max_dimension', 0)
+            if max_dimension:
+                image.draft('RGB', (max_dimension, max_dimension))
+            data = encode_share(image, self.share)
+        STAGE_SECONDS.observe(time.monotonic() - start, stage='encode')
+        self._write(self.share_path(output_path), data, 'share', writer)
+
+    @staticmethod
+    def _write(path: str, data: bytes, rendition: str, writer=None):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if writer is not None:
+            writer.submit_bytes(path, data)
+        else:
+            atomic_write_bytes(path, data, fsync=False)
+        OUTPUT_BYTES.inc(len(data), rendition=rendition)
+
+    def save_file(self, source_path: str, output_path: str, writer=None):
+        """이미 저장된 결과 파일(AI 응답)을 프로파일로 재인코딩해서 저장"""
+        from PIL import Image
+
+        with Image.open(source_path) as image:
+            image.load()
+            self.save(image, output_path, writer)
+
+
+def benchmark_profiles(image_path: str, encoder_config: Optional[dict] = None,
+                       repeat: int = 3) -> List[dict]:
+    """
+    프로파일별 인코딩 시간/크기 측정
+
+    Returns:
+        [{'profile', 'ms', 'kb', 'ratio'}, ...] (ratio: default 대비 크기)
+    """
+    from PIL import Image
+
+    encoder = OutputEncoder(encoder_config)
+    with Image.open(image_path) as image:
+        image = image.convert('RGB')
+
+    def measure(encode):
+        best, data = None, b''
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            data = encode()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000, len(data)
+
+    results = []
+    for name, profile in encoder.profiles.items():
+        ms, size = measure(lambda: encode_jpeg(image, profile))
+        results.append({'profile': name, 'ms': round(ms, 1), 'kb': size // 1024})
+
+    # 공유 사본 (활성화 여부와 관계없이 설정값으로 측정)
+    share = dict(encoder.share)
+    if share['format'] == 'WEBP' and not _webp_supported():
+        share['format'] = 'JPEG'
+    ms, size = measure(lambda: encode_share(image, share))
+    results.append({'profile': f"share ({share['format']})", 'ms': round(ms, 1), 'kb': size // 1024})
+
+    baseline = next(r['kb'] for r in results if r['profile'] == 'default') or 1
+    for result in results:
+        result['ratio'] = round(result['kb'] / baseline, 2)
+    return results
@@ -0,0 +1,389 @@
+"""
+가상 카메라 모듈 (gphoto2 / 실제 Canon 100D 없이 테스트)
+
+CameraConnection과 같은 인터페이스:
+- connect / disconnect / refresh_connection / get_all_files / download_file / download_new_files
+- 폴더 구조, 파일 크기, 동작별 지연, 촬영 간격, 연결 끊김을 설정으로 재현
+- 시드 고정 시 결정적 동작 (스캔/다운로드 확장성 벤치마크, 재연결 폭주 재현)
+
+config.json:
+    "camera": {
+        "backend": "fake",
+        "fake": { "initial_files": 10000, "shot_interval_seconds": 6, ... }
+    }
+"""
+
+import io
+import os
+import random
+import struct
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils.metrics import DOWNLOADS, DOWNLOAD_BYTES, STAGE_SECONDS
+from utils.raw import is_raw, output_name, save_camera_preview
+
+
+DEFAULT_FAKE_CONFIG = {
+    'model': 'Canon EOS 100D (fake)',
+    # 연결된 바디 수 (다중 카메라 부스 재현 - 바디마다 카드/시리얼 번호 별도)
+    'bodies': 1,
+    'storage_root': '/store_00020001/DCIM',
+    'first_folder_number': 100,
+    'files_per_folder': 9999,
+    'initial_files': 0,
+    'file_size_kb': 6000,
+    # 촬영 형식: jpeg, raw (CR2만), raw+jpeg
+    'capture_format': 'jpeg',
+    'raw_size_kb': 24000,
+    'partial_read': True,
+    'image_size': [1920, 1280],
+    'source_image': '',
+    'shot_interval_seconds': 0,
+    'arrival': 'poisson',
+    'latency_ms': {
+        'connect': 300,
+        'refresh': 50,
+        'list_folder': 5,
+        'file_info': 2,
+        'download_per_mb': 40,
+        'partial_read': 3,
+    },
+    'disconnect_rate': 0.0,
+    'connect_failure_rate': 0.0,
+    'seed': None,
+}
+
+
+class FakeCard:
+    """가상 메모리 카드 (파일 목록, 촬영 도착 과정) - 재연결해도 내용 유지"""
+
+    def __init__(self, config: dict):
+        """
+        Args:
+            config: DEFAULT_FAKE_CONFIG와 같은 구조의 설정
+        """
+        self.config = config
+        self.rng = random.Random(config['seed'])
+        self.lock = threading.Lock()
+        self.files: List[Dict[str, any]] = []
+        self._next_number = 0
+        self._next_shot_at = None
+        self._image_bytes = None
+        self._raw_bytes = None
+
+        # 촬영 시각 기록 (full_path -> time.time()) - 촬영~출력 지연 측정용
+        self.shot_times: Dict[str, float] = {}
+
+        for _ in range(config['initial_files']):
+            self._add_file(shot_time=0.0)
+
+    def _add_file(self, shot_time: float) -> Dict[str, any]:
+        """
+        촬영 1회 추가 (Canon 규칙: IMG_0001.JPG / IMG_0001.CR2, 폴더당 files_per_folder개)
+
+        Returns:
+            마지막으로 추가된 파일 (raw+jpeg면 JPG)
+        """
+        index = self._next_number
+        self._next_number += 1
+
+        folder_number = self.config['first_folder_number'] + index // self.config['files_per_folder']
+        path = f"{self.config['storage_root']}/{folder_number}CANON"
+        stem = f"IMG_{index % 9999 + 1:04d}"
+        capture_format = self.config['capture_format']
+
+        # 카메라는 CR2를 먼저 기록
+        extensions = []
+        if capture_format in ('raw', 'raw+jpeg'):
+            extensions.append(('.CR2', self.config['raw_size_kb']))
+        if capture_format in ('jpeg', 'raw+jpeg'):
+            extensions.append(('.JPG', self.config['file_size_kb']))
+
+        for extension, base_kb in extensions:
+            size_kb = base_kb * self.rng.uniform(0.8, 1.2)
+            file_info = {
+                'path': path,
+                'name': stem + extension,
+                'size': size_kb / 1024,
+                'full_path': f"{path}/{stem}{extension}"
+            }
+            self.files.append(file_info)
+            self.shot_times[file_info['full_path']] = shot_time
+        return file_info
+
+    def _interval(self) -> float:
+        interval = self.config['shot_interval_seconds']
+        if self.config['arrival'] == 'poisson':
+            return self.rng.expovariate(1.0 / interval)
+        return interval
+
+    def advance(self):
+        """경과 시간만큼 새 촬영 추가"""
+        if self.config['shot_interval_seconds'] <= 0:
+            return
+
+        now = time.time()
+        with self.lock:
+            if self._next_shot_at is None:
+                self._next_shot_at = now + self._interval()
+            while self._next_shot_at <= now:
+                self._add_file(shot_time=self._next_shot_at)
+                self._next_shot_at += self._interval()
+
+    def add_shot(self) -> Dict[str, any]:
+        """즉시 촬영 1장 추가 (외부에서 도착 과정을 제어할 때)"""
+        with self.lock:
+            return self._add_file(shot_time=time.time())
+
+    def snapshot(self) -> List[Dict[str, any]]:
+        with self.lock:
+            return list(self.files)
+
+    def image_data(self) -> bytes:
+        """다운로드 시 저장할 JPEG 바이트 (source_image 또는 합성 이미지)"""
+        if self._image_bytes is None:
+            source = self.config['source_image']
+            if source and os.path.exists(source):
+                with open(source, 'rb') as f:
+                    self._image_bytes = f.read()
+            else:
+                try:
+                    from PIL import Image
+                    buffer = io.BytesIO()
+                    Image.new('RGB', tuple(self.config['image_size']), (90, 90, 110)).save(
+                        buffer, 'JPEG', quality=90)
+                    self._image_bytes = buffer.getvalue()
+                except ImportError:
+                    # Pillow 없으면 JPEG 마커만 있는 더미 (다운로드 벤치마크 전용)
+                    size = int(self.config['file_size_kb'] * 1024)
+                    self._image_bytes = b'\xff\xd8' + b'\x00' * max(0, size - 4) + b'\xff\xd9'
+        return self._image_bytes
+
+    def raw_data(self) -> bytes:
+        """CR2 바이트 (IFD0 StripOffsets/StripByteCounts → 내장 JPEG, 나머지는 센서 데이터 자리)"""
+        if self._raw_bytes is None:
+            preview = self.image_data()
+            width, height = self.config['image_size']
+            entries = [
+                (0x0100, 4, 1, width),               # ImageWidth
+                (0x0101, 4, 1, height),              # ImageLength
+                (0x0111, 4, 1, 0),                   # StripOffsets (아래에서 채움)
+                (0x0117, 4, 1, len(preview)),        # StripByteCounts
+            ]
+            ifd_size = 2 + len(entries) * 12 + 4
+            preview_offset = 16 + ifd_size
+            entries[2] = (0x0111, 4, 1, preview_offset)
+
+            header = b'II*\x00' + struct.pack('<I', 16) + b'CR\x02\x00' + struct.pack('<I', 0)
+            ifd = struct.pack('<H', len(entries))
+            for tag, field_type, count, value in entries:
+                ifd += struct.pack('<HHII', tag, field_type, count, value)
+            ifd += struct.pack('<I', 0)
+
+            data = header + ifd + preview
+            sensor_size = max(0, int(self.config['raw_size_kb'] * 1024) - len(data))
+            self._raw_bytes = data + b'\x00' * sensor_size
+        return self._raw_bytes
+
+
+FAKE_PORT = 'fake:usb'
+
+
+def fake_ports(fake_config: dict) -> List[str]:
+    """가상 바디 포트 목록 (첫 바디는 fake:usb, 이후 fake:usb:2, fake:usb:3 ...)"""
+    bodies = max(1, fake_config.get('bodies', 1))
+    return [FAKE_PORT] + [f"{FAKE_PORT}:{index}" for index in range(2, bodies + 1)]
+
+
+def fake_body_index(port: str) -> int:
+    """가상 포트 → 바디 번호 (1부터)"""
+    suffix = port[len(FAKE_PORT) + 1:]
+    return int(suffix) if suffix.isdigit() else 1
+
+
+def merge_fake_config(fake_config: Optional[dict]) -> dict:
+    """camera.fake 설정에 기본값 채우기"""
+    fake_config = fake_config or {}
+    config = dict(DEFAULT_FAKE_CONFIG)
+    config.update(fake_config)
+    config['latency_ms'] = dict(DEFAULT_FAKE_CONFIG['latency_ms'], **fake_config.get('latency_ms', {}))
+    return config
+
+
+class FakeCameraConnection:
+    """가상 Canon 카메라 (CameraConnection 대체)"""
+
+    TARGET_CAMERA = "Canon EOS 100D"
+
+    def __init__(self, fake_config: Optional[dict] = None, card: Optional[FakeCard] = None,
+                 port: str = FAKE_PORT):
+        """
+        Args:
+            fake_config: camera.fake 설정 딕셔너리 (누락 항목은 DEFAULT_FAKE_CONFIG)
+            card: 공유할 가상 카드 (None이면 새로 생성)
+            port: 가상 포트 (fake_ports() 중 하나 - 바디 시리얼 번호가 포트별로 다름)
+        """
+        self.config = merge_fake_config(fake_config)
+        self.port = port
+        self.card = card or FakeCard(self.config)
+        self.rng = random.Random(None if self.config['seed'] is None else self.config['seed'] + 1)
+
+        self.camera = None
+        self.is_connected = False
+        self.camera_name = "Unknown"
+        self.body_id = None
+
+    # ------------------------------------------------------------------
+    # 지연 / 장애 주입
+
+    def _sleep(self, key: str, factor: float = 1.0):
+        delay = self.config['latency_ms'].get(key, 0) * factor / 1000
+        if delay > 0:
+            time.sleep(delay)
+
+    def _maybe_disconnect(self, operation: str) -> bool:
+        """설정된 확률로 연결 끊김 발생"""
+        rate = self.config['disconnect_rate']
+        if rate > 0 and self.rng.random() < rate:
+            self.is_connected = False
+            print(f"⚠️ [가상] 카메라 연결 끊김 ({operation})")
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # CameraConnection 인터페이스
+
+    def _find_canon_camera(self):
+        return self.config['model'], self.port
+
+    def connect(self) -> bool:
+        """카메라 연결"""
+        self._sleep('connect')
+        rate = self.config['connect_failure_rate']
+        if rate > 0 and self.rng.random() < rate:
+            print("❌ 카메라 연결 실패: [가상] Could not claim the USB device")
+            return False
+
+        self.is_connected = True
+        self.camera_name = self.config['model']
+        self.body_id = f"FAKE{fake_body_index(self.port):04d}"
+        print(f"✅ 카메라 연결됨: {self.camera_name}")
+        return True
+
+    def disconnect(self):
+        """카메라 연결 해제"""
+        if self.is_connected:
+            self.is_connected = False
+            print("📴 카메라 연결 해제됨")
+
+    def refresh_connection(self) -> bool:
+        """캐시 무효화를 위한 빠른 재연결"""
+        self._sleep('refresh')
+        if self._maybe_disconnect('refresh'):
+            return False
+        self.is_connected = True
+        return True
+
+    def get_all_files(self) -> List[Dict[str, any]]:
+        """카메라 내 모든 JPG/CR2 파일 목록 조회 (폴더/파일 수에 비례한 지연)"""
+        if not self.is_connected:
+            print("⚠️ 카메라가 연결되지 않았습니다.")
+            return []
+
+        if not self.refresh_connection():
+            print("⚠️ 연결 새로고침 실패, 재연결 시도...")
+            if not self.connect():
+                print("❌ 재연결 실패")
+                return []
+
+        self.card.advance()
+
+        with STAGE_SECONDS.time(stage='scan'):
+            files = self.card.snapshot()
+            folders = {f['path'] for f in files}
+            self._sleep('list_folder', len(folders) + 2)
+            self._sleep('file_info', len(files))
+
+        return files
+
+    def read_file_range(self, path: str, name: str, offset: int, size: int) -> bytes:
+        """파일 일부만 읽기 (호출당 지연 + 크기에 비례한 지연)"""
+        if not self.config['partial_read']:
+            raise OSError("[가상] 부분 읽기 미지원")
+        data = (self.card.raw_data() if is_raw(name) else self.card.image_data())[offset:offset + size]
+        self._sleep('partial_read')
+        self._sleep('download_per_mb', len(data) / (1024 * 1024))
+        return data
+
+    def _download_raw_preview(self, file_info: Dict[str, any], output_folder: str) -> bool:
+        """CR2 내장 JPEG만 부분 읽기로 가져오기 (실패 시 전체 다운로드 후 추출)"""
+        start = time.monotonic()
+        os.makedirs(output_folder, exist_ok=True)
+        path, name = file_info['path'], file_info['name']
+
+        def download_full(raw_path: str):
+            self._sleep('download_per_mb', file_info['size'])
+            with open(raw_path, 'wb') as f:
+                f.write(self.card.raw_data())
+
+        try:
+            transferred = save_camera_preview(
+                lambda offset, size: self.read_file_range(path, name, offset, size),
+                download_full,
+                os.path.join(output_folder, output_name(name))
+            )
+        except (ValueError, OSError) as e:
+            DOWNLOADS.inc(result='failure')
+            print(f"❌ 다운로드 실패 ({name}): {e}")
+            return False
+
+        STAGE_SECONDS.observe(time.monotonic() - start, stage='download')
+        DOWNLOADS.inc(result='success')
+        DOWNLOAD_BYTES.inc(transferred)
+        return True
+
+    def download_file(self, file_info: Dict[str, any], output_folder: str) -> bool:
+        """특정 파일 다운로드 (크기에 비례한 지연, CR2는 내장 JPEG만)"""
+        if not self.is_connected:
+            print("⚠️ 카메라가 연결되지 않았습니다.")
+            return False
+
+        if is_raw(file_info['name']):
+            return self._download_raw_preview(file_info, output_folder)
+
+        start = time.monotonic()
+        self._sleep('download_per_mb', file_info['size'])
+        if self._maybe_disconnect('download'):
+            DOWNLOADS.inc(result='failure')
+            print(f"❌ 다운로드 실패 ({file_info['name']}): [가상] I/O error")
+            return False
+
+        os.makedirs(output_folder, exist_ok=True)
+        target_path = os.path.join(output_folder, file_info['name'])
+        with open(target_path, 'wb') as f:
+            f.write(self.card.image_data())
+
+        STAGE_SECONDS.observe(time.monotonic() - start, stage='download')
+        DOWNLOADS.inc(result='success')
+        DOWNLOAD_BYTES.inc(os.path.getsize(target_path))
+        return True
+
+    def download_new_files(self, output_folder: str, processed_files: set) -> List[str]:
+        """새로운 파일만 다운로드"""
+        new_files = []
+        for file_info in self.get_all_files():
+            if file_info['full_path'] in processed_files:
+                continue
+            if self.download_file(file_info, output_folder):
+                new_files.append(output_name(file_info['name']))
+                print(f"  ✅ {file_info['name']} 다운로드 완료")
+        return new_files
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
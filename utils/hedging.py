@@ -0,0 +1,277 @@
+"""
+AI 요청 헤징 (꼬리 지연 단축)
+
+첫 요청이 관측된 지연 분포의 상위 백분위수(기본 p90)를 넘기면
+같은 요청을 한 번 더 보내고 먼저 끝난 결과를 사용 (나머지는 취소)
+
+- 시간당 헤지 수 예산으로 비용 상한 유지
+- 헤지 요청은 전용 풀에서만 (동시 max_in_flight개, 모자라면 헤지 생략)
+- 요청마다 별도 임시 파일에 쓰고 이긴 쪽만 output_path로 rename, 진 쪽은 연결을 끊어서 중단
+
+config.json:
+    "ai": {
+        "hedge": { "enabled": true, "percentile": 90, "min_samples": 20, "budget_per_hour": 20,
+                   "max_in_flight": 2 }
+    }
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from utils.metrics import AI_HEDGES
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+class CancelEvent(threading.Event):
+    """
+    취소 이벤트 + 중단 함수 (set() 시 백엔드가 등록한 함수로 진행 중인 연결을 끊음)
+
+    청크 사이에서만 확인하면 응답 헤더를 기다리는 동안은 취소가 안 되므로
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._aborts = []
+        self._abort_lock = threading.Lock()
+
+    def on_cancel(self, abort: Callable[[], None]):
+        """중단 함수 등록 (이미 취소됐으면 바로 호출)"""
+        with self._abort_lock:
+            if not self.is_set():
+                self._aborts.append(abort)
+                return
+        abort()
+
+    def clear_aborts(self):
+        """요청이 끝나면 등록 해제 (연결이 풀로 돌아간 뒤 다른 요청을 끊지 않도록)"""
+        with self._abort_lock:
+            self._aborts = []
+
+    def set(self):
+        with self._abort_lock:
+            super().set()
+            aborts, self._aborts = self._aborts, []
+        for abort in aborts:
+            try:
+                abort()
+            except OSError:
+                pass
+
+
+class HedgePolicy:
+    """헤지 시점 / 예산 관리 (AITransformer 사본끼리 공유)"""
+
+    def __init__(self, hedge_config: dict = None):
+        """
+        Args:
+            hedge_config: ai.hedge 설정
+                - enabled: 사용 여부 (기본: False)
+                - percentile: 헤지 시점 백분위수 (기본: 90)
+                - min_samples: 헤지를 시작하기 전 필요한 성공 표본 수 (기본: 20)
+                - budget_per_hour: 시간당 최대 헤지 수 (기본: 20)
+                - window: 지연 분포 추정에 쓰는 최근 표본 수 (기본: 100)
+                - max_in_flight: 동시에 진행할 수 있는 헤지 요청 수 (기본: 2)
+        """
+        self._lock = threading.Lock()
+        self._samples = deque()
+        self._hedges = deque()
+        self._executor = None
+        self._executor_size = 0
+        self._in_flight = 0
+        self.stats = {'launched': 0, 'hedge_won': 0, 'primary_won': 0, 'budget_exhausted': 0,
+                      'pool_busy': 0}
+        self.configure(hedge_config or {})
+
+    def configure(self, hedge_config: dict):
+        """설정 변경 (기존 표본/예산 사용량은 유지)"""
+        with self._lock:
+            self.config = dict(hedge_config)
+            self.enabled = hedge_config.get('enabled', False)
+            self.percentile = hedge_config.get('percentile', 90)
+            self.min_samples = hedge_config.get('min_samples', 20)
+            self.budget_per_hour = hedge_config.get('budget_per_hour', 20)
+            self.max_in_flight = max(1, hedge_config.get('max_in_flight', 2))
+            self._samples = deque(self._samples, maxlen=max(1, hedge_config.get('window', 100)))
+
+    def observe(self, seconds: float):
+        """첫 요청의 지연 시간 기록 (헤지가 이긴 경우는 그 시점까지의 시간)"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """헤지 요청을 보낼 시점 (초), 헤지하지 않으면 None"""
+        with self._lock:
+            if not self.enabled or len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = math.ceil(self.percentile / 100 * len(ordered))
+        return ordered[max(0, min(len(ordered), rank) - 1)]
+
+    def try_acquire(self) -> bool:
+        """시간당 예산 안에서 헤지 1회 사용"""
+        now = time.monotonic()
+        with self._lock:
+            while self._hedges and now - self._hedges[0] > 3600:
+                self._hedges.popleft()
+            if len(self._hedges) >= self.budget_per_hour:
+                return False
+            self._hedges.append(now)
+            return True
+
+    def record(self, result: str):
+        with self._lock:
+            self.stats[result] += 1
+        AI_HEDGES.inc(result=result)
+
+    def acquire_slot(self) -> bool:
+        """헤지 풀 자리 확보 (자리가 없으면 False - 대기열에 쌓지 않음)"""
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release_slot(self):
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    @property
+    def executor(self) -> 'ThreadPoolExecutor':
+        """헤지 요청 전용 풀 (첫 요청은 호출한 스레드에서 실행)"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with self._lock:
+            if self._executor is None or self._executor_size != self.max_in_flight:
+                if self._executor is not None:
+                    # 진행 중인 헤지는 그대로 마치고 종료
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight,
+                                                    thread_name_prefix='ai-hedge')
+                self._executor_size = self.max_in_flight
+            return self._executor
+
+    def get_status(self) -> dict:
+        hedge_delay = self.delay()
+        with self._lock:
+            now = time.monotonic()
+            used = sum(1 for t in self._hedges if now - t <= 3600)
+            return {
+                'enabled': self.enabled,
+                'delay_seconds': hedge_delay,
+                'samples': len(self._samples),
+                'budget_used': used,
+                'budget_per_hour': self.budget_per_hour,
+                'in_flight': self._in_flight,
+                'stats': dict(self.stats),
+            }
+
+
+def run_hedged(policy: HedgePolicy, attempt: Callable[[str, 'CancelEvent'], Tuple[bool, str]],
+               output_path: str, hedge_delay: float) -> Tuple[bool, str]:
+    """
+    헤지 요청 실행
+
+    첫 요청은 호출한 스레드에서 바로 실행 (풀 대기 시간이 hedge_delay에 섞이지 않도록)
+    hedge_delay가 지나도 안 끝나면 헤지 전용 풀에서 같은 요청을 보내고, 먼저 성공한 쪽을 사용
+    진 쪽은 CancelEvent로 HTTP 연결까지 끊어서 바로 반환
+
+    Args:
+        policy: 헤지 정책
+        attempt: (임시 출력 경로, 취소 이벤트) → (성공 여부, 메시지)
+        output_path: 최종 출력 경로
+        hedge_delay: 두 번째 요청을 보낼 시점 (초)
+
+    Returns:
+        (성공 여부, 결과 메시지)
+    """
+    lock = threading.Lock()
+    started = time.monotonic()
+    primary_path, primary_cancel = f"{output_path}.hedge0.part", CancelEvent()
+    hedge_path, hedge_cancel = f"{output_path}.hedge1.part", CancelEvent()
+    state = {'winner': None, 'primary_done': False, 'hedge': None, 'hedge_won_at': None}
+
+    def run_hedge() -> Tuple[bool, str]:
+        try:
+            result = attempt(hedge_path, hedge_cancel)
+        except Exception as e:
+            result = False, f"AI 변환 실패: {e}"
+        finally:
+            policy.release_slot()
+        if result[0]:
+            with lock:
+                won = state['winner'] is None
+                if won:
+                    state['winner'], state['hedge_won_at'] = 'hedge', time.monotonic()
+            if won:
+                # 첫 요청은 연결을 끊어서 호출한 스레드를 바로 돌려보냄
+                primary_cancel.set()
+        return result
+
+    def launch_hedge():
+        with lock:
+            if state['primary_done']:
+                return
+            if not policy.acquire_slot():
+                policy.record('pool_busy')
+                return
+            if not policy.try_acquire():
+                policy.release_slot()
+                policy.record('budget_exhausted')
+                return
+            policy.record('launched')
+            print(f"🔀 AI 응답 지연 ({hedge_delay:.1f}초 초과) - 헤지 요청 전송")
+            state['hedge'] = policy.executor.submit(run_hedge)
+
+    timer = threading.Timer(hedge_delay, launch_hedge)
+    timer.daemon = True
+    timer.start()
+    try:
+        primary_result = attempt(primary_path, primary_cancel)
+    except Exception as e:
+        primary_result = False, f"AI 변환 실패: {e}"
+    timer.cancel()
+    with lock:
+        state['primary_done'] = True
+        if primary_result[0] and state['winner'] is None:
+            state['winner'] = 'primary'
+        hedge = state['hedge']
+    primary_elapsed = time.monotonic() - started
+
+    if hedge is not None and state['winner'] is None:
+        # 첫 요청 실패 - 헤지 결과 대기
+        hedge.result()
+
+    if state['winner'] == 'primary':
+        os.replace(primary_path, output_path)
+        policy.observe(primary_elapsed)
+        if hedge is not None:
+            policy.record('primary_won')
+            hedge_cancel.set()
+            hedge.add_done_callback(lambda _future: _remove(hedge_path))
+        return primary_result
+
+    _remove(primary_path)
+    if state['winner'] == 'hedge':
+        os.replace(hedge_path, output_path)
+        # 표본은 첫 요청 기준 - 적어도 헤지가 이긴 시점까지 걸렸음 (중도 절단값)
+        policy.observe(state['hedge_won_at'] - started)
+        policy.record('hedge_won')
+        return hedge.result()
+
+    # 둘 다 실패 - 첫 요청의 실패 사유 반환
+    if hedge is not None:
+        _remove(hedge_path)
+    return primary_result
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,35 +1,85 @@
 """
 이미지 처리 및 PNG 레이어 합성 모듈
+
+processing.compositor.processes > 0이면 합성을 별도 프로세스에서 실행 (ProcessCompositor)
+- 입력 사진은 공유 메모리 슬롯(utils.shm_pool)에 읽어 넣고 프로세스에는 핸들만 전달
+- 결과는 합성 프로세스가 직접 임시 파일 → rename으로 저장
+
+fullscreen 오버레이는 출력 크기별로 컴파일된 파일을 mmap해서 사용 (utils.overlay_cache)
+- 사진마다 오버레이 리사이즈 없음, 합성 프로세스끼리 오버레이 메모리 공유
+
+config.json:
+    "processing": {
+        "compositor": { "processes": 0, "slot_mb": 32, "slots": 0 },
+        "overlay_cache": { "enabled": true, "sizes": [], "max_mb": 1024 }
+    }
 """
 
+import json
 import os
+import threading
+import time
 from PIL import Image
-from typing import Optional
+from typing import Optional, Sequence
+
+from utils.metrics import OUTPUT_BYTES, STAGE_SECONDS
+from utils.encoder import OutputEncoder
 
 
 class ImageProcessor:
     """이미지 처리 및 합성 클래스"""
 
-    def __init__(self, overlay_path: str):
+    def __init__(self, overlay_path: str, cache_config: Optional[dict] = None):
         """
         Args:
             overlay_path: PNG 오버레이 이미지 경로
+            cache_config: processing.overlay_cache 설정 (None이면 기본값 - 사용)
         """
         self.overlay_path = overlay_path
         self.overlay_image = None
+        self.cache_config = cache_config or {}
+        self.overlay_cache = None
+        self._load_lock = threading.Lock()
 
-        # 오버레이 이미지 로드
+        # 오버레이 이미지 로드 (디코딩은 캐시를 쓸 수 없을 때만)
         if os.path.exists(overlay_path):
             self.overlay_image = Image.open(overlay_path)
             print(f"✅ 오버레이 이미지 로드: {overlay_path}")
+            if self.cache_config.get('enabled', True):
+                from utils.overlay_cache import OverlayCache
+                try:
+                    self.overlay_cache = OverlayCache(overlay_path, self.cache_config)
+                except OSError as e:
+                    print(f"⚠️ 오버레이 캐시 사용 불가: {e}")
         else:
             print(f"⚠️ 오버레이 이미지를 찾을 수 없습니다: {overlay_path}")
 
+    def load_overlay(self):
+        """원본 오버레이 디코딩 (여러 스레드가 동시에 지연 디코딩하지 않도록 락 안에서)"""
+        with self._load_lock:
+            self.overlay_image.load()
+            if self.overlay_cache is not None:
+                self.overlay_cache.source = self.overlay_image
+        return self.overlay_image
+
+    def _overlay_for(self, size, overlay_mode: str):
+        """합성에 쓸 오버레이 (fullscreen은 컴파일 캐시 → 없으면 직접 리사이즈)"""
+        if overlay_mode != "fullscreen":
+            return self.load_overlay()
+        if self.overlay_cache is not None:
+            overlay = self.overlay_cache.get(size)
+            if overlay is not None:
+                return overlay
+        # 베이스 이미지와 같은 크기로 조정
+        return self.load_overlay().resize(size, Image.Resampling.LANCZOS)
+
     def composite_image(
         self,
         base_image_path: str,
         output_path: str,
-        overlay_mode: str = "fullscreen"
+        overlay_mode: str = "fullscreen",
+        writer=None,
+        encoder: Optional[OutputEncoder] = None
     ) -> bool:
         """
         베이스 이미지에 PNG 오버레이를 합성
@@ -38,6 +88,8 @@ class ImageProcessor:
             base_image_path: 원본 이미지 경로
             output_path: 합성된 이미지 저장 경로
             overlay_mode: 합성 모드 ('fullscreen', 'fit', 'stretch')
+            writer: OutputWriter (지정 시 저장은 저장 스레드에서 비동기로)
+            encoder: 출력 인코더 (None이면 기본 프로파일)
 
         Returns:
             성공 여부
@@ -46,6 +98,7 @@ class ImageProcessor:
             print("❌ 오버레이 이미지가 로드되지 않았습니다.")
             return False
 
+        start = time.monotonic()
         try:
             # 베이스 이미지 열기
             base_image = Image.open(base_image_path)
@@ -54,35 +107,27 @@ class ImageProcessor:
             if base_image.mode != 'RGB':
                 base_image = base_image.convert('RGB')
 
-            # 오버레이 이미지 크기 조정
-            overlay = self.overlay_image.copy()
-
-            if overlay_mode == "fullscreen":
-                # 베이스 이미지와 같은 크기로 조정
-                overlay = overlay.resize(base_image.size, Image.Resampling.LANCZOS)
+            # 오버레이 이미지 크기 조정 (캐시 사용 시 읽기 전용 - 수정하지 않음)
+            overlay = self._overlay_for(base_image.size, overlay_mode)
 
             # 오버레이가 RGBA 모드인지 확인
+            result = base_image
             if overlay.mode == 'RGBA':
-                # 알파 채널을 사용해서 합성
-                # 베이스 이미지를 RGBA로 변환
-                base_rgba = base_image.convert('RGBA')
-
-                # 알파 합성
-                composited = Image.alpha_composite(base_rgba, overlay)
-
-                # RGB로 다시 변환 (JPEG 저장을 위해)
-                result = composited.convert('RGB')
+                # 알파 채널을 마스크로 베이스 위에 바로 합성 (RGBA 변환/복사 없음)
+                # 베이스는 위에서 RGB(불투명)로 변환했으므로 alpha_composite와 결과가 같음
+                # (반투명 베이스에서는 다름 - RGBA 베이스를 그대로 쓰게 바꾸면 alpha_composite로)
+                result.paste(overlay, (0, 0), overlay)
             else:
                 # 알파 채널이 없으면 단순 붙여넣기
-                result = base_image.copy()
                 result.paste(overlay, (0, 0))
 
             # 출력 폴더 생성
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-            # 결과 저장
-            result.save(output_path, 'JPEG', quality=95)
+            # 인코딩은 여기서, 저장은 임시 파일 → rename (writer가 있으면 저장 스레드로)
+            (encoder or OutputEncoder()).save(result, output_path, writer)
 
+            STAGE_SECONDS.observe(time.monotonic() - start, stage='overlay')
             return True
 
         except Exception as e:
@@ -124,3 +169,163 @@ class ImageProcessor:
                 print(f"  ❌ {filename} 처리 실패")
 
         return processed_count
+
+
+# ----------------------------------------------------------------------
+# 합성 프로세스
+
+DEFAULT_COMPOSITOR_CONFIG = {
+    'processes': 0,
+    'slot_mb': 32,
+    # 0: 프로세스 수 × 2
+    'slots': 0,
+}
+
+# 빈 슬롯을 기다리는 최대 시간 (넘으면 이 스레드에서 직접 합성)
+SLOT_WAIT_SECONDS = 5.0
+
+# 합성 프로세스 전역 상태 (프로세스마다 오버레이 한 번만 준비)
+_worker_processors = {}
+_worker_cache_config = {}
+_worker_encoders = {}
+
+
+def _worker_processor(overlay_path: str) -> ImageProcessor:
+    processor = _worker_processors.get(overlay_path)
+    if processor is None:
+        processor = _worker_processors[overlay_path] = ImageProcessor(overlay_path, _worker_cache_config)
+        if processor.overlay_image is not None and processor.overlay_cache is None:
+            processor.load_overlay()
+    return processor
+
+
+def _init_compositor_worker(overlay_paths: list, cache_config: dict):
+    global _worker_cache_config
+    _worker_cache_config = cache_config
+    for overlay_path in overlay_paths:
+        _worker_processor(overlay_path)
+
+
+def _warm_up_worker() -> int:
+    # 컴파일된 오버레이 mmap (메인 프로세스가 먼저 컴파일 - 여기서는 매핑만)
+    for processor in _worker_processors.values():
+        if processor.overlay_cache is not None:
+            processor.overlay_cache.precompile()
+    return os.getpid()
+
+
+def _composite_handle(handle, overlay_path: str, output_path: str, overlay_mode: str,
+                      encoder_config: dict) -> bool:
+    """합성 프로세스: 핸들의 사진에 오버레이 합성 후 저장"""
+    from utils.shm_pool import open_handle
+
+    key = json.dumps(encoder_config, sort_keys=True)
+    encoder = _worker_encoders.get(key)
+    if encoder is None:
+        encoder = _worker_encoders[key] = OutputEncoder(encoder_config)
+
+    with open_handle(handle) as source:
+        return _worker_processor(overlay_path).composite_image(source, output_path, overlay_mode, encoder=encoder)
+
+
+class ProcessCompositor:
+    """
+    합성 프로세스 풀 (ImageProcessor와 같은 composite_image 인터페이스)
+
+    여러 장을 GIL 없이 동시에 합성 - 프로세스 간에는 공유 메모리 핸들만 오가므로 사진 크기와 무관
+    빈 슬롯이 없거나 슬롯보다 큰 사진, 프로세스 오류 시 fallback(같은 오버레이의 ImageProcessor)으로 처리
+    """
+
+    def __init__(self, overlay_path: str, fallback: ImageProcessor, compositor_config: Optional[dict] = None,
+                 template_paths: Sequence[str] = ()):
+        """
+        Args:
+            overlay_path: 오버레이 PNG 경로 (프로세스마다 로드)
+            fallback: 현재 프로세스에서 합성할 때 쓸 ImageProcessor
+            compositor_config: processing.compositor 설정
+            template_paths: 프로세스마다 미리 준비할 템플릿 오버레이 경로 (utils.overlay_templates)
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from utils.shm_pool import SharedMemoryPool
+
+        compositor_config = {**DEFAULT_COMPOSITOR_CONFIG, **(compositor_config or {})}
+        self.processes = max(1, compositor_config['processes'])
+        self.fallback = fallback
+        self.overlay_path = overlay_path
+        self.overlay_image = fallback.overlay_image
+
+        slots = compositor_config['slots'] or self.processes * 2
+        self.pool = SharedMemoryPool(int(compositor_config['slot_mb'] * 1024 * 1024), slots)
+        # fork는 스레드(저장/수집)가 도는 프로세스에서 안전하지 않음 - macOS 기본과 같은 spawn 사용
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_compositor_worker,
+            initargs=([overlay_path, *template_paths], fallback.cache_config)
+        )
+
+    def warm_up(self):
+        """합성 프로세스 미리 시작 (첫 사진에서 프로세스 시작 + 오버레이 준비 대기 방지)"""
+        futures = [self.executor.submit(_warm_up_worker) for _ in range(self.processes)]
+        for future in futures:
+            future.result()
+
+    def composite_image(
+        self,
+        base_image_path: str,
+        output_path: str,
+        overlay_mode: str = "fullscreen",
+        writer=None,
+        encoder: Optional[OutputEncoder] = None,
+        processor: Optional[ImageProcessor] = None
+    ) -> bool:
+        """
+        합성 프로세스에서 오버레이 합성 (ImageProcessor.composite_image와 같은 인자)
+
+        writer는 사용하지 않음 - 합성 프로세스가 직접 원자적으로 저장하므로 반환 시점에 저장 완료
+        processor: 사용할 오버레이 (템플릿 선택 결과, None이면 fallback의 오버레이)
+        """
+        from concurrent.futures.process import BrokenProcessPool
+
+        fallback = processor or self.fallback
+        slot = self.pool.acquire(timeout=SLOT_WAIT_SECONDS)
+        if slot is None:
+            return fallback.composite_image(base_image_path, output_path, overlay_mode, writer, encoder)
+
+        encoder = encoder or OutputEncoder()
+        start = time.monotonic()
+        try:
+            try:
+                handle = self.pool.fill_from_file(slot, base_image_path)
+            except ValueError:
+                return fallback.composite_image(base_image_path, output_path, overlay_mode, writer, encoder)
+            except OSError as e:
+                print(f"❌ 이미지 합성 실패 ({base_image_path}): {e}")
+                return False
+
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            future = self.executor.submit(_composite_handle, handle, fallback.overlay_path, output_path,
+                                          overlay_mode, encoder.to_config())
+            success = future.result()
+        except (BrokenProcessPool, RuntimeError) as e:
+            # 프로세스 종료/풀 종료(설정 교체 중) - 이 사진은 현재 프로세스에서
+            print(f"⚠️ 합성 프로세스 사용 불가 ({e}) - 현재 프로세스에서 합성")
+            return fallback.composite_image(base_image_path, output_path, overlay_mode, writer, encoder)
+        finally:
+            self.pool.release(slot)
+
+        if success:
+            # 합성 프로세스의 메트릭은 이 프로세스에서 기록
+            STAGE_SECONDS.observe(time.monotonic() - start, stage='overlay')
+            OUTPUT_BYTES.inc(os.path.getsize(output_path), rendition='main')
+            if encoder.share['enabled']:
+                share_path = encoder.share_path(output_path)
+                if os.path.exists(share_path):
+                    OUTPUT_BYTES.inc(os.path.getsize(share_path), rendition='share')
+        return success
+
+    def close(self):
+        """진행 중인 합성을 마치고 프로세스/공유 메모리 정리"""
+        self.executor.shutdown(wait=True)
+        self.pool.close()
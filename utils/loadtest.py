@@ -0,0 +1,385 @@
+"""
+촬영~출력 지연 부하 테스트
+
+실제 모니터 루프(cli.monitor_camera / cli.monitor_folder)를 그대로 실행하고,
+카메라는 가상 카메라(utils.fake_camera), AI는 로컬 mock 서버(utils.mock_gemini)로 대체
+
+측정 항목:
+- 처리량 (장/분), 대기열 증가율 (장/분)
+- 촬영~출력 지연 p50 / p99
+- AI 사용률, 오버레이 폴백 비율 → AI 경로 포화 지점
+
+time_scale로 모든 지연(AI, 카메라, 촬영 간격, 확인 간격)을 줄여 빠르게 실행하고,
+결과는 실제 시간 단위로 환산해서 저장 (합성/디스크 시간은 축소되지 않으므로 근사치)
+
+사용법:
+    python3 cli.py loadtest --rates 4,6,10 --ai-latency fixed:40 --duration 10 --time-scale 0.05
+"""
+
+import copy
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from utils.camera_backend import get_fake_card, reset_fake_cards
+from utils.mock_gemini import MockGeminiState, start_mock_server
+
+
+# 포화 판단 기준
+SATURATION_BACKLOG_GROWTH = 0.5   # 대기열 증가율 (장/분)
+SATURATION_FALLBACK_SHARE = 0.05  # 오버레이 폴백 비율
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """백분위수 (nearest-rank)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def _slope_per_minute(samples: List[tuple]) -> float:
+    """(분, 대기열) 샘플의 최소제곱 기울기 - 후반 절반만 사용 (초기 과도 구간 제외)"""
+    tail = samples[len(samples) // 2:]
+    if len(tail) < 2:
+        return 0.0
+    n = len(tail)
+    mean_x = sum(x for x, _ in tail) / n
+    mean_y = sum(y for _, y in tail) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in tail)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in tail) / var_x
+
+
+class LoadTestRun:
+    """단일 도착률에 대한 부하 테스트 1회"""
+
+    def __init__(self, base_config: dict, monitor: Callable, source: str, rate_per_minute: float,
+                 duration_minutes: float, ai_latency: str, ai_error_rate: float = 0.0,
+                 rate_429: float = 0.0, time_scale: float = 0.1, interval: float = 5.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            base_config: 기준 설정 (config.json)
+            monitor: cli.monitor_camera 또는 cli.monitor_folder
+            source: 'camera' 또는 'folder'
+            rate_per_minute: 촬영 도착률 (장/분, 포아송 도착)
+            duration_minutes: 실행 시간 (실제 시간 기준, 분)
+            ai_latency: mock AI 지연 분포 (utils.mock_gemini.parse_latency 형식, 초)
+            time_scale: 지연 배율 (0.1이면 10배 빠르게 실행)
+            interval: 모니터 확인 간격 (실제 시간 기준, 초)
+        """
+        self.base_config = base_config
+        self.monitor = monitor
+        self.source = source
+        self.rate = rate_per_minute
+        self.duration = duration_minutes * 60
+        self.ai_latency = ai_latency
+        self.ai_error_rate = ai_error_rate
+        self.rate_429 = rate_429
+        self.time_scale = time_scale
+        self.interval = interval
+        self.seed = seed
+
+        self.lock = threading.Lock()
+        self.shot_times: Dict[str, float] = {}
+        self.results: List[dict] = []
+        self.backlog_samples: List[tuple] = []
+
+    # ------------------------------------------------------------------
+    # 환경 구성
+
+    def _build_config(self, workdir: str, base_url: str) -> dict:
+        """테스트용 설정 (작업 폴더, mock AI, 가상 카메라, 축소된 지연)"""
+        config = copy.deepcopy(self.base_config)
+        scale = self.time_scale
+
+        ai = config.setdefault('ai', {})
+        ai['base_url'] = base_url
+        ai['backend'] = 'rest'
+        ai['api_key'] = ai.get('api_key') or 'loadtest'
+        ai['prompt'] = ai.get('prompt') or 'loadtest'
+        ai['timeout_seconds'] = ai.get('timeout_seconds', 120) * scale
+
+        # 모드는 설정(또는 cli.py --mode)을 따름 - hybrid / adaptive 비교용
+        processing = config.setdefault('processing', {})
+        processing.setdefault('mode', 'hybrid')
+        adaptive = dict(processing.get('adaptive', {}))
+        for key, default in (('slo_seconds', 90), ('initial_ai_seconds', 20), ('initial_overlay_seconds', 1)):
+            adaptive[key] = adaptive.get(key, default) * scale
+        processing['adaptive'] = adaptive
+
+        paths = config.setdefault('paths', {})
+        paths['original_folder'] = os.path.join(workdir, 'downloaded')
+        paths['output_folder'] = os.path.join(workdir, 'processed')
+        if not paths.get('overlay_image') or not os.path.exists(paths['overlay_image']):
+            paths['overlay_image'] = self._make_overlay(workdir)
+        config.setdefault('monitoring', {})['processed_files_db'] = os.path.join(workdir, 'processed.json')
+
+        camera = config.setdefault('camera', {})
+        camera['backend'] = 'fake'
+        fake = dict(camera.get('fake', {}))
+        fake['initial_files'] = 0
+        fake['shot_interval_seconds'] = 60.0 / self.rate * scale
+        fake['arrival'] = 'poisson'
+        fake['seed'] = self.seed
+        fake['latency_ms'] = {k: v * scale for k, v in fake.get('latency_ms', {}).items()}
+        camera['fake'] = fake
+        return config
+
+    @staticmethod
+    def _make_overlay(workdir: str) -> str:
+        """폴백용 투명 오버레이 (config의 오버레이가 없을 때)"""
+        from PIL import Image
+
+        path = os.path.join(workdir, 'overlay.png')
+        Image.new('RGBA', (1920, 1080), (0, 0, 0, 0)).save(path)
+        return path
+
+    # ------------------------------------------------------------------
+    # 도착 / 결과 기록
+
+    def _on_result(self, source_path: str, success: bool, method: str, message: str):
+        now = time.time()
+        with self.lock:
+            shot_time = self.shot_times.get(source_path)
+            self.results.append({
+                'latency': None if shot_time is None else (now - shot_time) / self.time_scale,
+                'completed': now,
+                'success': success,
+                'method': method,
+            })
+
+    def _feed_folder(self, input_dir: str, stop_event: threading.Event, image_data: bytes, rng):
+        """폴더 모드: 포아송 도착으로 입력 폴더에 사진 추가 (임시 이름으로 쓰고 rename)"""
+        index = 0
+        while not stop_event.wait(rng.expovariate(self.rate / 60.0) * self.time_scale):
+            index += 1
+            name = f"IMG_{index:04d}.JPG"
+            temp_path = os.path.join(input_dir, name + '.part')
+            with open(temp_path, 'wb') as f:
+                f.write(image_data)
+            path = os.path.join(input_dir, name)
+            with self.lock:
+                self.shot_times[path] = time.time()
+            os.replace(temp_path, path)
+
+    def _sample_backlog(self, start: float, arrived: Callable[[], int]):
+        with self.lock:
+            completed = len(self.results)
+        elapsed = (time.time() - start) / self.time_scale / 60
+        self.backlog_samples.append((elapsed, arrived() - completed))
+
+    # ------------------------------------------------------------------
+    # 실행
+
+    def run(self, processor_factory: Callable[[dict], object], log_path: str) -> dict:
+        """
+        부하 테스트 실행
+
+        Args:
+            processor_factory: 설정 → HybridProcessor
+            log_path: 모니터 출력 저장 경로 (콘솔에는 진행 상황만 출력)
+
+        Returns:
+            결과 딕셔너리
+        """
+        import random
+
+        workdir = tempfile.mkdtemp(prefix='photo_loadtest_')
+        state = MockGeminiState(self.ai_latency, self.ai_error_rate, self.rate_429,
+                                self.time_scale, self.seed)
+        server = start_mock_server('127.0.0.1', 0, state)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1beta"
+        config = self._build_config(workdir, base_url)
+
+        reset_fake_cards()
+        stop_event = threading.Event()
+        console = sys.stdout
+        feeder = None
+
+        try:
+            with open(log_path, 'a', encoding='utf-8') as log_file:
+                sys.stdout = log_file
+                processor = processor_factory(config)
+                interval = self.interval * self.time_scale
+
+                if self.source == 'camera':
+                    card = get_fake_card(config)
+                    self.shot_times = card.shot_times
+
+                    def arrived():
+                        card.advance()
+                        with card.lock:
+                            return len(card.files)
+
+                    target = lambda: self.monitor(processor, config, interval=interval,
+                                                  stop_event=stop_event, on_result=self._on_result)
+                else:
+                    input_dir = config['paths']['original_folder']
+                    os.makedirs(input_dir, exist_ok=True)
+                    image_data = get_fake_card(config).image_data()
+                    feeder = threading.Thread(
+                        target=self._feed_folder, name='loadtest-feeder', daemon=True,
+                        args=(input_dir, stop_event, image_data, random.Random(self.seed)))
+
+                    def arrived():
+                        with self.lock:
+                            return len(self.shot_times)
+
+                    target = lambda: self.monitor(
+                        processor, input_dir, config['paths']['output_folder'],
+                        config['monitoring']['processed_files_db'], interval=interval,
+                        stop_event=stop_event, on_result=self._on_result)
+
+                monitor_thread = threading.Thread(target=target, name='loadtest-monitor', daemon=True)
+                start = time.time()
+                monitor_thread.start()
+                if feeder:
+                    feeder.start()
+
+                sample_every = max(0.05, 5.0 * self.time_scale)
+                end = start + self.duration * self.time_scale
+                next_report = start
+                while time.time() < end:
+                    time.sleep(sample_every)
+                    self._sample_backlog(start, arrived)
+                    if time.time() >= next_report:
+                        minute, backlog = self.backlog_samples[-1]
+                        print(f"   ⏱️  {minute:5.1f}분 | 완료 {len(self.results):4d} | 대기 {backlog:3d}",
+                              file=console)
+                        next_report += 60 * self.time_scale
+
+                shots = arrived()
+                measured_until = time.time()
+                stop_event.set()
+                monitor_thread.join(timeout=max(5.0, 300 * self.time_scale))
+        finally:
+            sys.stdout = console
+            stop_event.set()
+            server.shutdown()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        with state.lock:
+            ai_stats = dict(state.stats)
+        # 측정 구간 안의 AI 사용 시간만 (종료 후 남은 요청을 마무리하는 시간 제외)
+        ai_busy, ai_concurrency = state.busy_between(start, measured_until)
+        ai_stats['busy_seconds_in_window'] = ai_busy
+        ai_stats['max_concurrency'] = ai_concurrency
+        return self._summarize(shots, ai_stats, measured_until - start)
+
+    def _summarize(self, shots: int, ai_stats: dict, window_seconds: float) -> dict:
+        duration_minutes = self.duration / 60
+        with self.lock:
+            results = list(self.results)
+
+        latencies = [r['latency'] for r in results if r['latency'] is not None]
+        succeeded = [r for r in results if r['success']]
+        by_method = {}
+        for r in succeeded:
+            by_method[r['method']] = by_method.get(r['method'], 0) + 1
+
+        fallback_share = by_method.get('overlay', 0) / len(succeeded) if succeeded else 0.0
+        backlog_growth = _slope_per_minute(self.backlog_samples)
+        # 측정 구간 × 최대 동시 요청 수 대비 (동시에 여러 장을 처리해도 100% 이하)
+        capacity = window_seconds * ai_stats['max_concurrency']
+        ai_utilization = ai_stats['busy_seconds_in_window'] / capacity if capacity > 0 else 0.0
+
+        return {
+            'source': self.source,
+            'offered_rate_per_min': self.rate,
+            'duration_minutes': duration_minutes,
+            'shots': shots,
+            'completed': len(results),
+            'succeeded': len(succeeded),
+            'throughput_per_min': len(succeeded) / duration_minutes,
+            'backlog_final': self.backlog_samples[-1][1] if self.backlog_samples else 0,
+            'backlog_max': max((b for _, b in self.backlog_samples), default=0),
+            'backlog_growth_per_min': backlog_growth,
+            'latency_p50_seconds': percentile(latencies, 50),
+            'latency_p99_seconds': percentile(latencies, 99),
+            'latency_max_seconds': max(latencies) if latencies else None,
+            'methods': by_method,
+            'fallback_share': fallback_share,
+            'ai_utilization': ai_utilization,
+            'ai_concurrency': ai_stats['max_concurrency'],
+            'ai_requests': ai_stats,
+            'saturated': backlog_growth > SATURATION_BACKLOG_GROWTH or fallback_share > SATURATION_FALLBACK_SHARE,
+            'backlog_samples': [(round(m, 2), b) for m, b in self.backlog_samples],
+        }
+
+
+def run_loadtest(base_config: dict, monitor: Callable, processor_factory: Callable[[dict], object],
+                 source: str = 'camera', rates: List[float] = (10.0,), duration_minutes: float = 10.0,
+                 ai_latency: str = 'fixed:40', ai_error_rate: float = 0.0, rate_429: float = 0.0,
+                 time_scale: float = 0.1, interval: float = 5.0, seed: Optional[int] = None,
+                 output_dir: str = 'loadtest_results') -> dict:
+    """
+    도착률별 부하 테스트 후 결과 저장
+
+    Returns:
+        {'settings': ..., 'runs': [...], 'saturation_rate_per_min': ...}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_path = os.path.join(output_dir, f"loadtest_{stamp}.log")
+
+    settings = {
+        'mode': base_config.get('processing', {}).get('mode', 'hybrid'),
+        'source': source, 'rates_per_min': list(rates), 'duration_minutes': duration_minutes,
+        'ai_latency': ai_latency, 'ai_error_rate': ai_error_rate, 'rate_429': rate_429,
+        'ai_timeout_seconds': base_config.get('ai', {}).get('timeout_seconds', 120),
+        'time_scale': time_scale, 'interval_seconds': interval, 'seed': seed,
+    }
+
+    print("=" * 50)
+    print("🧪 촬영~출력 지연 부하 테스트")
+    print("=" * 50)
+    print(f"⚙️  모드: {settings['mode']} | 📷 입력: {source} | 🤖 AI 지연: {ai_latency} | ⏩ 배율: {time_scale}")
+
+    runs = []
+    for rate in rates:
+        print(f"\n▶ 도착률 {rate:g}장/분, {duration_minutes:g}분")
+        run = LoadTestRun(base_config, monitor, source, rate, duration_minutes, ai_latency,
+                          ai_error_rate, rate_429, time_scale, interval, seed)
+        result = run.run(processor_factory, log_path)
+        runs.append(result)
+        print(_format_result(result))
+
+    saturation = next((r['offered_rate_per_min'] for r in runs if r['saturated']), None)
+    report = {'settings': settings, 'runs': runs, 'saturation_rate_per_min': saturation}
+
+    result_path = os.path.join(output_dir, f"loadtest_{stamp}.json")
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print()
+    if saturation is None:
+        print("✅ 모든 도착률에서 AI 경로가 처리량을 유지")
+    else:
+        print(f"⚠️ AI 경로 포화 시작: {saturation:g}장/분 (대기열 증가 또는 폴백 증가)")
+    print(f"💾 결과 저장: {result_path}")
+    return report
+
+
+def _format_result(result: dict) -> str:
+    def seconds(value):
+        return '-' if value is None else f"{value:.1f}초"
+
+    return (f"   처리량 {result['throughput_per_min']:.2f}장/분 "
+            f"(촬영 {result['shots']}, 완료 {result['completed']})\n"
+            f"   지연 p50 {seconds(result['latency_p50_seconds'])}, "
+            f"p99 {seconds(result['latency_p99_seconds'])}\n"
+            f"   대기열 증가 {result['backlog_growth_per_min']:+.2f}장/분 "
+            f"(최대 {result['backlog_max']}, 종료 시 {result['backlog_final']})\n"
+            f"   AI 사용률 {result['ai_utilization']:.0%} (동시 최대 {result['ai_concurrency']}), 폴백 비율 {result['fallback_share']:.0%} "
+            f"{'⚠️ 포화' if result['saturated'] else '✅'}")
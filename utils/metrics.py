@@ -0,0 +1,306 @@
+"""
+Prometheus 형식 로컬 메트릭 모듈
+
+- 카운터 / 게이지 / 히스토그램 (표준 라이브러리만 사용)
+- 선택적 로컬 HTTP 엔드포인트 (/metrics)
+- CLI / GUI 모니터링 루프에서 공용 레지스트리(REGISTRY) 사용
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    # http.server는 엔드포인트를 켤 때만 import (시작 시간 단축)
+    from http.server import ThreadingHTTPServer
+
+
+# 스테이지 지연시간 기본 버킷 (초) - AI 호출은 수십 초까지 걸림
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0, 90.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    """라벨 값 이스케이프"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    """라벨 문자열 생성 ({a="1",b="2"})"""
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    """값 문자열 변환 (정수는 소수점 없이)"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """메트릭 공통 베이스"""
+
+    TYPE = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        """라벨 딕셔너리를 정렬된 키로 변환"""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 불일치 {sorted(labels)} != {list(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 출력"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+    def _samples(self):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    TYPE = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        """카운터 증가"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        """현재 값 조회"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """임의 값 게이지 (콜백 지원)"""
+
+    TYPE = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        """값 설정"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        """값 감소"""
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """렌더링 시점에 값을 계산할 콜백 등록 (큐 길이 등)"""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                values[key] = float(fn())
+            except Exception:
+                continue
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._counts: Dict[Tuple[str, ...], list] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels):
+        """관측값 기록"""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간 기록"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start, **labels)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, list(v), self._sums[k]) for k, v in self._counts.items())
+        for key, counts, total in items:
+            for bound, count in zip(self.buckets, counts):
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {counts[-1]}"
+
+
+class MetricsRegistry:
+    """메트릭 레지스트리"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """전체 메트릭 텍스트 출력"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+
+# 공용 레지스트리
+REGISTRY = MetricsRegistry()
+
+DOWNLOADS = REGISTRY.counter(
+    'photo_downloads_total', '카메라 다운로드 수', ('result',))
+DOWNLOAD_BYTES = REGISTRY.counter(
+    'photo_download_bytes_total', '카메라에서 다운로드한 바이트 수')
+PROCESSED = REGISTRY.counter(
+    'photo_processed_total', '처리 방식별 성공/실패 수', ('method', 'result'))
+STAGE_SECONDS = REGISTRY.histogram(
+    'photo_stage_seconds', '스테이지별 처리 시간 (초)', ('stage',))
+QUEUE_DEPTH = REGISTRY.gauge(
+    'photo_queue_depth', '처리 대기 중인 항목 수', ('queue',))
+AI_AVAILABLE = REGISTRY.gauge(
+    'photo_ai_available', 'AI 경로 상태 (1: 사용 가능, 0: 차단/폴백)')
+CACHE_REQUESTS = REGISTRY.counter(
+    'photo_cache_requests_total', '캐시 조회 수', ('cache', 'result'))
+AI_BYTES = REGISTRY.counter(
+    'photo_ai_bytes_total', 'AI API 송수신 바이트 수', ('direction',))
+AI_UPLOADS = REGISTRY.counter(
+    'photo_ai_uploads_total', 'AI 업로드 방식 (original: 원본 그대로, reencoded: 축소/재인코딩)', ('path',))
+AI_HEDGES = REGISTRY.counter(
+    'photo_ai_hedges_total', 'AI 헤지 요청 결과 수', ('result',))
+OUTPUT_BYTES = REGISTRY.counter(
+    'photo_output_bytes_total', '저장한 출력 바이트 수 (main: 결과, share: 공유 사본)', ('rendition',))
+DUPLICATES = REGISTRY.counter(
+    'photo_duplicates_total', '연속 촬영 중복으로 판단한 사진 수', ('action',))
+OVERLAY_TEMPLATES = REGISTRY.counter(
+    'photo_overlay_template_total', '오버레이 템플릿별 사용 수', ('template',))
+ADAPTIVE_DECISIONS = REGISTRY.counter(
+    'photo_adaptive_decisions_total', '적응형 모드 경로 선택 수', ('route', 'state'))
+ADAPTIVE_AI_SHARE = REGISTRY.gauge(
+    'photo_adaptive_ai_share', '적응형 모드 AI 배정 비율 (1: 전부 AI)')
+
+
+class _MetricsHandler:
+    """/metrics 요청 처리 (BaseHTTPRequestHandler와 함께 상속)"""
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """요청 로그 출력 안 함"""
+        pass
+
+
+def start_metrics_server(host: str = '127.0.0.1', port: int = 9108,
+                         registry: MetricsRegistry = REGISTRY) -> Optional['ThreadingHTTPServer']:
+    """
+    메트릭 HTTP 서버 시작 (데몬 스레드)
+
+    Returns:
+        서버 객체 (실패 시 None)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = type('MetricsHandler', (_MetricsHandler, BaseHTTPRequestHandler), {'registry': registry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        print(f"⚠️ 메트릭 서버 시작 실패 ({host}:{port}): {e}")
+        return None
+
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    print(f"📈 메트릭 엔드포인트: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def start_from_config(config: dict, port: Optional[int] = None) -> Optional['ThreadingHTTPServer']:
+    """
+    설정(metrics 섹션)에 따라 메트릭 서버 시작
+
+    Args:
+        config: 전체 설정 딕셔너리
+        port: 포트 오버라이드 (지정 시 enabled 여부와 무관하게 시작)
+    """
+    metrics_config = config.get('metrics', {})
+    if port is None and not metrics_config.get('enabled', False):
+        return None
+
+    host = metrics_config.get('host', '127.0.0.1')
+    return start_metrics_server(host, port if port is not None else metrics_config.get('port', 9108))
@@ -0,0 +1,278 @@
+"""
+로컬 Gemini generateContent 대체 서버 (부하 테스트용)
+
+- POST /v1beta/models/{model}:generateContent
+- 지연 시간 분포, 오류율, 429 비율 설정 가능
+- 요청한 이미지를 그대로 inlineData로 돌려줌 (응답은 청크 단위 전송)
+
+사용법:
+    python -m utils.mock_gemini --port 8765 --latency lognormal:15,0.5 --error-rate 0.02 --rate-429 0.05
+
+config.json:
+    "ai": { "base_url": "http://127.0.0.1:8765/v1beta", ... }
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Tuple
+
+
+PATH_PATTERN = re.compile(r'^/v1beta/models/(?P<model>[^/:]+):generateContent$')
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    지연 시간 분포 파싱
+
+    Args:
+        spec: 'fixed:S', 'uniform:A,B', 'exp:MEAN', 'lognormal:MEDIAN,SIGMA'
+              (마지막 항목 뒤에 '@MAX'로 상한 지정 가능, 예: lognormal:15,0.6@120)
+
+    Returns:
+        난수 생성기를 받아 지연 시간(초)을 반환하는 함수
+    """
+    import math
+
+    cap = None
+    if '@' in spec:
+        spec, cap_text = spec.split('@', 1)
+        cap = float(cap_text)
+
+    kind, _, args_text = spec.partition(':')
+    args = [float(a) for a in args_text.split(',') if a]
+
+    if kind == 'fixed':
+        sampler = lambda rng: args[0]
+    elif kind == 'uniform':
+        sampler = lambda rng: rng.uniform(args[0], args[1])
+    elif kind == 'exp':
+        sampler = lambda rng: rng.expovariate(1.0 / args[0])
+    elif kind == 'lognormal':
+        sampler = lambda rng: rng.lognormvariate(math.log(args[0]), args[1])
+    else:
+        raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+    if cap is None:
+        return sampler
+    return lambda rng: min(sampler(rng), cap)
+
+
+class MockGeminiState:
+    """mock 서버 설정 및 통계"""
+
+    def __init__(self, latency: str = 'fixed:0', error_rate: float = 0.0,
+                 rate_429: float = 0.0, time_scale: float = 1.0, seed: Optional[int] = None):
+        """
+        Args:
+            latency: 지연 분포 문자열 (parse_latency 참조)
+            error_rate: 500 오류 비율 (0~1)
+            rate_429: 429 응답 비율 (0~1)
+            time_scale: 지연 배율 (0.1이면 10배 빠르게 - 빠른 부하 테스트용)
+            seed: 난수 시드 (재현용)
+        """
+        self.latency_spec = latency
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'rate_limited': 0, 'in_flight': 0,
+                      'busy_seconds': 0.0}
+        # 요청별 처리 구간 (시작, 끝 - time.time 기준) - 측정 구간 안의 사용 시간 계산용 (최근 것만)
+        self.busy_spans = deque(maxlen=100000)
+
+    def decide(self):
+        """이번 요청의 (지연 시간, 응답 코드) 결정"""
+        with self.lock:
+            delay = self.sample_latency(self.rng) * self.time_scale
+            roll = self.rng.random()
+        if roll < self.rate_429:
+            return delay * 0.05, 429
+        if roll < self.rate_429 + self.error_rate:
+            return delay, 500
+        return delay, 200
+
+    def count(self, key: str, delta: float = 1):
+        with self.lock:
+            self.stats[key] += delta
+
+    def record_span(self, begin: float, end: float):
+        with self.lock:
+            self.busy_spans.append((begin, end))
+
+    def busy_between(self, start: float, end: float) -> Tuple[float, int]:
+        """
+        start~end 안의 처리 시간 합과 최대 동시 요청 수 (구간 밖으로 나간 부분은 제외)
+
+        Returns:
+            (처리 시간 합, 최대 동시 요청 수)
+        """
+        with self.lock:
+            spans = [(max(begin, start), min(finish, end)) for begin, finish in self.busy_spans]
+        spans = [(begin, finish) for begin, finish in spans if finish > begin]
+
+        # 시작 +1 / 끝 -1 사건을 시간순으로 (같은 시각이면 끝을 먼저)
+        events = sorted([(begin, 1) for begin, _ in spans] + [(finish, -1) for _, finish in spans])
+        concurrent = peak = 0
+        for _, delta in events:
+            concurrent += delta
+            peak = max(peak, concurrent)
+        return sum(finish - begin for begin, finish in spans), peak
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """generateContent 요청 처리"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    state: MockGeminiState = None
+    chunk_size = 64 * 1024
+
+    def do_POST(self):
+        match = PATH_PATTERN.match(self.path.split('?')[0])
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+
+        if not match:
+            self._send_json(404, {'error': {'code': 404, 'message': 'not found'}})
+            return
+
+        state = self.state
+        state.count('requests')
+        state.count('in_flight')
+        try:
+            delay, status = state.decide()
+            begin = time.time()
+            state.record_span(begin, begin + delay)
+            time.sleep(delay)
+            state.count('busy_seconds', delay)
+
+            if status == 429:
+                state.count('rate_limited')
+                self._send_json(429, {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED',
+                                                'message': 'mock quota exceeded'}})
+                return
+            if status != 200:
+                state.count('errors')
+                self._send_json(status, {'error': {'code': status, 'message': 'mock internal error'}})
+                return
+
+            inline = self._find_inline_data(body)
+            if inline is None:
+                self._send_json(400, {'error': {'code': 400, 'message': 'no inline image'}})
+                return
+
+            self._send_image_response(match.group('model'), inline)
+            state.count('ok')
+        finally:
+            state.count('in_flight', -1)
+
+    def do_GET(self):
+        """/stats - 통계 조회"""
+        if self.path == '/stats':
+            with self.state.lock:
+                stats = dict(self.state.stats)
+            self._send_json(200, stats)
+        else:
+            self._send_json(404, {'error': {'code': 404, 'message': 'not found'}})
+
+    @staticmethod
+    def _find_inline_data(body: bytes) -> Optional[dict]:
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return None
+        for content in request.get('contents', []):
+            for part in content.get('parts', []):
+                inline = part.get('inline_data') or part.get('inlineData')
+                if inline and inline.get('data'):
+                    return {'mimeType': inline.get('mime_type') or inline.get('mimeType', 'image/jpeg'),
+                            'data': inline['data']}
+        return None
+
+    def _send_image_response(self, model: str, inline: dict):
+        """실제 API와 같은 구조로 응답 (청크 단위 전송)"""
+        payload = json.dumps({
+            'candidates': [{
+                'content': {
+                    'role': 'model',
+                    'parts': [
+                        {'text': 'mock transformed image'},
+                        {'inlineData': inline},
+                    ]
+                },
+                'finishReason': 'STOP',
+            }],
+            'modelVersion': model,
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        for offset in range(0, len(payload), self.chunk_size):
+            self.wfile.write(payload[offset:offset + self.chunk_size])
+
+    def _send_json(self, status: int, data: dict):
+        payload = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(host: str = '127.0.0.1', port: int = 8765,
+                      state: Optional[MockGeminiState] = None) -> ThreadingHTTPServer:
+    """
+    mock 서버 시작 (데몬 스레드)
+
+    Returns:
+        서버 객체 (server.state로 통계 조회, server.shutdown()으로 종료)
+    """
+    state = state or MockGeminiState()
+    handler = type('MockHandler', (_MockHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name='mock-gemini', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 Gemini generateContent mock 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='lognormal:15,0.5@120',
+                        help="지연 분포 (fixed:S | uniform:A,B | exp:MEAN | lognormal:MEDIAN,SIGMA, '@MAX' 상한)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 오류 비율 (0~1)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='429 응답 비율 (0~1)')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='지연 배율 (0.1 = 10배 빠르게)')
+    parser.add_argument('--seed', type=int, help='난수 시드')
+    args = parser.parse_args()
+
+    state = MockGeminiState(args.latency, args.error_rate, args.rate_429, args.time_scale, args.seed)
+    server = start_mock_server(args.host, args.port, state)
+    print(f"🧪 mock Gemini 서버: http://{args.host}:{server.server_address[1]}/v1beta "
+          f"(지연 {args.latency}, 오류 {args.error_rate:.0%}, 429 {args.rate_429:.0%})")
+
+    try:
+        while True:
+            time.sleep(10)
+            with state.lock:
+                print(f"   📊 {state.stats}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
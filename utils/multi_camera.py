@@ -0,0 +1,380 @@
+"""
+다중 카메라 수집 모듈
+
+부스에 연결된 카메라 바디마다 수집 스레드 하나 → 공유 처리 대기열 → 처리 스레드
+- 수집 스레드: 바디별 연결 / 스캔 / 다운로드 / 재연결(백오프) - 한 바디의 재연결이 다른 바디를 막지 않음
+- 처리 스레드: 연결된 바디 수만큼 (process_workers로 고정 가능)
+- 처리 완료 기록은 바디(시리얼 번호)별로 분리 - USB를 다시 꽂아 포트가 바뀌어도 같은 기록 사용
+- 주기적으로 카메라를 다시 찾아서 새로 연결된 바디는 수집 시작, 사라진 포트는 정리
+
+바디가 2대 이상이면 파일명이 겹치지 않도록(IMG_0001.JPG) 바디 태그를 붙임
+- 다운로드: 다운로드 폴더/<태그>/IMG_0001.JPG
+- 출력: <태그>_IMG_0001.JPG
+
+config.json:
+    "camera": {
+        "multi": { "enabled": true, "max_cameras": 3, "rescan_seconds": 10, "process_workers": 0 }
+    }
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils.camera_backend import create_camera, detect_cameras
+from utils.metrics import QUEUE_DEPTH
+from utils.output_writer import atomic_write_bytes
+from utils.raw import select_sources
+
+DEFAULT_MULTI_CONFIG = {
+    'enabled': True,
+    'max_cameras': 3,
+    'rescan_seconds': 10,
+    # 처리 스레드 수 (0: 연결된 바디 수만큼)
+    'process_workers': 0,
+}
+
+# 연결 실패 시 재시도 대기 상한 (초)
+MAX_BACKOFF_SECONDS = 60
+
+
+class ProcessedStore:
+    """
+    처리 완료 기록 (소스별: 카메라 바디 ID 또는 'folder')
+
+    파일 형식: {"sources": {"<바디 ID>": [...]}, "legacy": [...], "legacy_owner": "<바디 ID>"}
+    예전 형식(JSON 목록)은 legacy로 읽어서 처음 연결된 바디의 기록으로 사용
+    (업그레이드 전 처리분은 다시 처리하지 않고, 새로 추가된 바디의 같은 파일명은 막지 않음)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.legacy = set()
+        self.legacy_owner: Optional[str] = None
+        self.sources: Dict[str, set] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 처리 기록 로드 실패 ({path}): {e}")
+                data = []
+            if isinstance(data, list):
+                self.legacy = set(data)
+            else:
+                self.legacy = set(data.get('legacy', []))
+                self.legacy_owner = data.get('legacy_owner')
+                self.sources = {source: set(keys) for source, keys in data.get('sources', {}).items()}
+
+    def contains(self, source: str, keys: Iterable[str]) -> bool:
+        """keys 중 하나라도 처리 완료면 True"""
+        with self.lock:
+            done = self.sources.get(source, set())
+            legacy = self.legacy if self.legacy_owner in (None, source) else ()
+            return any(key in done or key in legacy for key in keys)
+
+    def claim_legacy(self, source: str):
+        """예전 형식 기록을 이 바디의 것으로 지정 (처음 연결된 바디만)"""
+        with self.lock:
+            if not self.legacy or self.legacy_owner is not None:
+                return
+            self.legacy_owner = source
+        self._save()
+
+    def mark(self, source: str, keys: Iterable[str]):
+        """처리 완료 기록 후 저장"""
+        with self.lock:
+            self.sources.setdefault(source, set()).update(keys)
+        self._save()
+
+    def _save(self):
+        with self.lock:
+            data = {'sources': {name: sorted(keys) for name, keys in self.sources.items()}}
+            if self.legacy:
+                data['legacy'] = sorted(self.legacy)
+                data['legacy_owner'] = self.legacy_owner
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            # 처리 스레드 여러 개가 동시에 저장해도 파일이 섞이지 않게 잠금 안에서 교체
+            atomic_write_bytes(self.path, payload)
+
+
+def body_tag(body_id: str) -> str:
+    """파일명에 붙일 바디 태그 (영숫자만, 시리얼 번호 끝 8자리)"""
+    return re.sub(r'[^A-Za-z0-9]', '', body_id)[-8:] or 'camera'
+
+
+class CameraIngest(threading.Thread):
+    """카메라 바디 하나의 수집 스레드 (포트 단위)"""
+
+    def __init__(self, pool: 'MultiCameraIngest', model: str, port: Optional[str]):
+        super().__init__(name=f"ingest-{port}", daemon=True)
+        self.pool = pool
+        self.model = model
+        self.port = port
+        self.body_id: Optional[str] = None
+        self.connected = False
+        self.retired = threading.Event()
+        self.files_seen = 0
+
+    def retire(self):
+        """포트가 사라짐 - 다음 확인 시점에 종료"""
+        self.retired.set()
+
+    def running(self) -> bool:
+        return not (self.pool.stop_event.is_set() or self.retired.is_set())
+
+    def _wait(self, seconds: float):
+        # 중지 요청에 바로 반응하도록 짧게 나눠서 대기
+        deadline = time.monotonic() + seconds
+        while self.running() and time.monotonic() < deadline:
+            self.pool.stop_event.wait(min(0.5, deadline - time.monotonic()))
+
+    def _label(self) -> str:
+        return f"[{body_tag(self.body_id)}]" if self.body_id else f"[{self.port}]"
+
+    def run(self):
+        pool = self.pool
+        camera = None
+        failures = 0
+
+        try:
+            while self.running():
+                if camera is None:
+                    camera = create_camera(pool.config, self.port)
+                    if not camera.connect():
+                        camera = None
+                        failures += 1
+                        delay = min(pool.interval * 2 ** min(failures - 1, 4), MAX_BACKOFF_SECONDS)
+                        pool.log(f"❌ {self._label()} 카메라 연결 실패 ({failures}회) - {delay:.0f}초 후 재시도")
+                        self._wait(delay)
+                        continue
+                    failures = 0
+                    self.body_id = camera.body_id or self.port or camera.camera_name
+                    self.connected = True
+                    pool.register_body(self)
+
+                try:
+                    files = camera.get_all_files()
+                    # 파일이 갑자기 0개면 연결 문제일 수 있음 - 한 번 재연결 후 재스캔
+                    if not files and self.files_seen and camera.is_connected:
+                        pool.log(f"⚠️ {self._label()} 파일 0개 - 연결 확인 중...")
+                        camera.is_connected = False
+                        if camera.connect():
+                            files = camera.get_all_files()
+                except Exception as e:
+                    pool.log(f"⚠️ {self._label()} 파일 목록 가져오기 실패: {e}")
+                    files = []
+                    camera.is_connected = False
+
+                if not camera.is_connected:
+                    pool.log(f"⚠️ {self._label()} 카메라 연결 끊김, 재연결 시도...")
+                    camera.disconnect()
+                    camera = None
+                    self.connected = False
+                    continue
+
+                self.files_seen = len(files)
+                pool.ingest(self, camera, files)
+                self._wait(pool.interval)
+        finally:
+            self.connected = False
+            if camera:
+                camera.disconnect()
+
+
+class MultiCameraIngest:
+    """연결된 모든 카메라에서 수집 → 공유 대기열 → 처리 스레드"""
+
+    def __init__(self, config: dict, store: ProcessedStore, download_dir: str,
+                 handler: Callable[[dict], bool], interval: float = 5.0,
+                 stop_event: Optional[threading.Event] = None, log: Callable[[str], None] = print,
+                 process_workers: Optional[int] = None):
+        """
+        Args:
+            config: 전체 설정 (camera.multi, processing.raw 사용)
+            store: 바디별 처리 완료 기록
+            download_dir: 다운로드 폴더
+            handler: 대기열 항목 처리 (처리 스레드에서 호출, True면 처리 완료 기록 - 출력 저장이 끝난 뒤에만 True)
+                항목: {'body_id', 'body_tag', 'file_info', 'local_path', 'output_name'}
+            interval: 바디별 스캔 간격 (초)
+            stop_event: 설정되면 수집/처리 종료
+            log: 로그 출력 함수
+            process_workers: 처리 스레드 수 (None이면 camera.multi.process_workers)
+        """
+        self.config = config
+        self.multi = {**DEFAULT_MULTI_CONFIG, **config.get('camera', {}).get('multi', {})}
+        if process_workers is not None:
+            self.multi['process_workers'] = process_workers
+        self.raw_config = config.get('processing', {}).get('raw', {})
+        self.store = store
+        self.download_dir = download_dir
+        self.handler = handler
+        self.interval = interval
+        self.stop_event = stop_event or threading.Event()
+        self.log = log
+
+        self.lock = threading.Lock()
+        self._queue: 'queue.Queue[dict]' = queue.Queue()
+        self._ingests: Dict[str, CameraIngest] = {}
+        self._bodies: Dict[str, CameraIngest] = {}
+        self._in_flight = set()
+        self._workers: List[threading.Thread] = []
+        # 한 번이라도 바디가 2대 이상이면 이후 파일명에 바디 태그 (세션 중 이름 규칙이 바뀌지 않게)
+        self._tagged = False
+
+    # ------------------------------------------------------------------
+    # 상태
+
+    def pending(self) -> int:
+        """처리 대기 중인 항목 수"""
+        return self._queue.qsize()
+
+    def connected_bodies(self) -> List[str]:
+        with self.lock:
+            return [body_id for body_id, ingest in self._bodies.items() if ingest.connected]
+
+    # ------------------------------------------------------------------
+    # 수집 (수집 스레드에서 호출)
+
+    def register_body(self, ingest: CameraIngest):
+        """바디 연결됨 - 처리 스레드 수 조정"""
+        self.store.claim_legacy(ingest.body_id)
+        with self.lock:
+            previous = self._bodies.get(ingest.body_id)
+            self._bodies[ingest.body_id] = ingest
+            if len(self._bodies) > 1:
+                self._tagged = True
+            count = len(self._bodies)
+
+        if previous is None or previous is not ingest:
+            self.log(f"✅ [{body_tag(ingest.body_id)}] 카메라 연결: {ingest.model} ({ingest.port}) - {count}대")
+        self._ensure_workers()
+
+    def ingest(self, ingest: CameraIngest, camera, files: List[Dict[str, any]]):
+        """새 파일 다운로드 후 대기열에 추가 (RAW+JPEG 쌍은 하나만)"""
+        body_id = ingest.body_id
+        tag = body_tag(body_id)
+        for file_info in select_sources(files, self.raw_config):
+            if not ingest.running():
+                break
+            key = (body_id, file_info['full_path'])
+            with self.lock:
+                if key in self._in_flight:
+                    continue
+                tagged = self._tagged
+            if self.store.contains(body_id, file_info['pair_paths'] + file_info['pair_names']):
+                continue
+
+            # CR2는 내장 JPEG만 받아서 .jpg로 저장
+            download_dir = os.path.join(self.download_dir, tag) if tagged else self.download_dir
+            try:
+                downloaded = camera.download_file(file_info, download_dir)
+            except Exception as e:
+                self.log(f"   ❌ [{tag}] 다운로드 오류 ({file_info['name']}): {e}")
+                downloaded = False
+            if not downloaded:
+                if not camera.is_connected:
+                    break
+                continue
+
+            with self.lock:
+                self._in_flight.add(key)
+            self.log(f"🆕 [{tag}] 새 파일: {file_info['name']}")
+            self._queue.put({
+                'body_id': body_id,
+                'body_tag': tag,
+                'file_info': file_info,
+                'local_path': os.path.join(download_dir, file_info['local_name']),
+                'output_name': f"{tag}_{file_info['local_name']}" if tagged else file_info['local_name'],
+            })
+
+    # ------------------------------------------------------------------
+    # 처리 (처리 스레드)
+
+    def _ensure_workers(self):
+        """처리 스레드를 연결된 바디 수(또는 process_workers)만큼 유지"""
+        with self.lock:
+            target = self.multi['process_workers'] or max(1, len(self._bodies))
+            while len(self._workers) < target:
+                worker = threading.Thread(target=self._process_loop, daemon=True,
+                                          name=f"camera-process-{len(self._workers) + 1}")
+                self._workers.append(worker)
+                worker.start()
+
+    def _process_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            processed = False
+            try:
+                processed = self.handler(item)
+            except Exception as e:
+                self.log(f"   ❌ [{item['body_tag']}] 처리 오류 ({item['file_info']['name']}): {e}")
+            finally:
+                if processed:
+                    self.store.mark(item['body_id'], item['file_info']['pair_paths'])
+                with self.lock:
+                    # 실패한 항목은 다음 스캔에서 다시 다운로드
+                    self._in_flight.discard((item['body_id'], item['file_info']['full_path']))
+
+    # ------------------------------------------------------------------
+    # 카메라 탐색 (run을 호출한 스레드)
+
+    def discover(self):
+        """카메라를 다시 찾아서 새 포트는 수집 시작, 사라진 포트는 정리"""
+        try:
+            detected = [(name, port) for name, port in detect_cameras(self.config) if 'Canon' in name]
+        except Exception as e:
+            self.log(f"⚠️ 카메라 탐색 실패: {e}")
+            return
+
+        if not self.multi['enabled']:
+            detected = detected[:1]
+        detected = detected[:max(1, self.multi['max_cameras'])]
+        ports = {port for _, port in detected}
+
+        with self.lock:
+            for port, ingest in list(self._ingests.items()):
+                if not ingest.is_alive():
+                    del self._ingests[port]
+                elif port not in ports and not ingest.connected:
+                    ingest.retire()
+                    del self._ingests[port]
+
+            for name, port in detected:
+                if port not in self._ingests:
+                    ingest = CameraIngest(self, name, port)
+                    self._ingests[port] = ingest
+                    ingest.start()
+
+    def run(self):
+        """stop_event가 설정될 때까지 수집/처리 (블로킹)"""
+        os.makedirs(self.download_dir, exist_ok=True)
+        QUEUE_DEPTH.set_function(self._queue.qsize, queue='camera')
+        self._ensure_workers()
+
+        announced = False
+        try:
+            while not self.stop_event.is_set():
+                self.discover()
+                with self.lock:
+                    found = bool(self._ingests)
+                if not found and not announced:
+                    self.log("📷 카메라를 찾는 중... (USB 연결 확인)")
+                announced = not found
+                self.stop_event.wait(self.multi['rescan_seconds'])
+        finally:
+            self.stop_event.set()
+            with self.lock:
+                threads = list(self._ingests.values()) + list(self._workers)
+            for thread in threads:
+                thread.join(timeout=10)
@@ -0,0 +1,299 @@
+"""
+비동기 출력 저장 모듈
+
+처리 스레드는 인코딩된 바이트(또는 다 쓴 임시 파일)만 넘기고 바로 다음 사진으로 진행
+저장 스레드가 임시 파일 → fsync(묶음 단위) → rename 순서로 원자적으로 저장
+(느린 USB/네트워크 드라이브에서도 처리가 멈추지 않고, 프린터가 반쪽 파일을 읽지 않음)
+
+config.json:
+    "processing": {
+        "async_writer": { "enabled": true, "max_queue": 8, "fsync": true, "fsync_batch": 8 }
+    }
+"""
+
+import atexit
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from utils.metrics import QUEUE_DEPTH, STAGE_SECONDS
+
+
+def temp_path_for(output_path: str) -> str:
+    """output_path와 같은 폴더의 임시 파일 경로 (rename이 원자적이도록)"""
+    directory = os.path.dirname(output_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(output_path) + '.',
+                                     suffix='.part', dir=directory)
+    os.close(fd)
+    return temp_path
+
+
+def _fsync_path(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory: str):
+    """rename 결과를 디스크에 반영 (지원하지 않는 OS/파일시스템은 무시)"""
+    try:
+        _fsync_path(directory or '.')
+    except OSError:
+        pass
+
+
+def atomic_write_bytes(output_path: str, data: bytes, fsync: bool = True):
+    """바이트를 임시 파일에 쓰고 rename (동기)"""
+    temp_path = temp_path_for(output_path)
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(os.path.dirname(output_path))
+
+
+class _Job:
+    __slots__ = ('output_path', 'data', 'temp_path', 'done', 'success', 'error', 'callbacks', 'queued_at')
+
+    def __init__(self, output_path: str, data: Optional[bytes], temp_path: Optional[str]):
+        self.output_path = output_path
+        self.data = data
+        self.temp_path = temp_path
+        self.done = threading.Event()
+        self.success = False
+        self.error = None
+        self.callbacks: List[Callable[[bool], None]] = []
+        self.queued_at = time.monotonic()
+
+
+class OutputWriter:
+    """저장 전용 스레드 (크기 제한 대기열)"""
+
+    # 결과 조회용으로 보관하는 완료 작업 수
+    HISTORY_SIZE = 1024
+
+    def __init__(self, max_queue: int = 8, fsync: bool = True, fsync_batch: int = 8):
+        """
+        Args:
+            max_queue: 대기열 최대 길이 (가득 차면 submit이 대기 - 메모리 상한)
+            fsync: 디스크 반영(fsync) 후 rename 여부
+            fsync_batch: 한 번에 fsync/rename할 최대 파일 수
+        """
+        self.fsync = fsync
+        self.fsync_batch = max(1, fsync_batch)
+        self._queue = queue.Queue(maxsize=max(1, max_queue))
+        # 경로별 최근 작업 (완료된 작업도 결과 조회용으로 일부 보관)
+        self._jobs: 'OrderedDict[str, _Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name='output-writer', daemon=True)
+        self._thread.start()
+        QUEUE_DEPTH.set_function(self._queue.qsize, queue='writer')
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, writer_config: dict) -> Optional['OutputWriter']:
+        """processing.async_writer 설정으로 생성 (비활성화면 None)"""
+        if not writer_config.get('enabled', True):
+            return None
+        return cls(
+            max_queue=writer_config.get('max_queue', 8),
+            fsync=writer_config.get('fsync', True),
+            fsync_batch=writer_config.get('fsync_batch', 8)
+        )
+
+    # ------------------------------------------------------------------
+    # 처리 스레드 쪽
+
+    def submit_bytes(self, output_path: str, data: bytes):
+        """인코딩된 이미지 저장 요청"""
+        self._submit(_Job(output_path, data, None))
+
+    def submit_file(self, temp_path: str, output_path: str):
+        """다 쓴 임시 파일(temp_path_for로 만든 경로)을 output_path로 확정 요청"""
+        self._submit(_Job(output_path, None, temp_path))
+
+    def _submit(self, job: _Job):
+        with self._lock:
+            self._jobs.pop(job.output_path, None)
+            self._jobs[job.output_path] = job
+            while len(self._jobs) > self.HISTORY_SIZE:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.done.is_set():
+                    break
+                self._jobs.popitem(last=False)
+            closed = self._closed
+        if closed:
+            # 종료된 뒤의 요청 - 저장 스레드 없이 이 스레드에서 바로 저장
+            self._write_batch([job])
+            return
+        self._queue.put(job)
+        if self._closed and not self._thread.is_alive():
+            # close와 겹쳐 종료 표시 뒤에 들어간 요청
+            self._drain()
+
+    def is_pending(self, output_path: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(output_path)
+        return job is not None and not job.done.is_set()
+
+    def wait(self, output_path: str, timeout: Optional[float] = None) -> bool:
+        """
+        저장 완료 대기
+
+        Returns:
+            저장 성공 여부 (대기열에 없던 경로는 파일 존재 여부)
+        """
+        with self._lock:
+            job = self._jobs.get(output_path)
+        if job is None:
+            return os.path.exists(output_path)
+        if not job.done.wait(timeout):
+            return False
+        return job.success
+
+    def when_written(self, output_path: str, callback: Callable[[bool], None]):
+        """저장 완료 시 callback(성공 여부) 호출 (이미 끝났으면 즉시, 저장 스레드에서 호출될 수 있음)"""
+        with self._lock:
+            job = self._jobs.get(output_path)
+            if job is not None and not job.done.is_set():
+                job.callbacks.append(callback)
+                return
+        callback(job.success if job is not None else os.path.exists(output_path))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """대기 중인 저장이 모두 끝날 때까지 대기"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if not job.done.is_set()]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in jobs:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not job.done.wait(remaining):
+                return False
+        return True
+
+    def close(self):
+        """남은 저장을 마치고 스레드 종료 (이후 요청은 호출한 스레드에서 바로 저장)"""
+        with self._lock:
+            self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._drain()
+
+    def _drain(self):
+        """저장 스레드가 끝난 뒤 대기열에 남은 요청 저장"""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None:
+                self._write_batch([job])
+
+    # ------------------------------------------------------------------
+    # 저장 스레드
+
+    def _loop(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            # 이미 쌓인 작업을 묶어서 처리 (대기 없이 - 한가할 때 지연 추가 없음)
+            batch = [job]
+            stop = False
+            while len(batch) < self.fsync_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+
+            self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[_Job]):
+        # 1. 임시 파일에 쓰기
+        written = []
+        for job in batch:
+            try:
+                if job.data is not None:
+                    job.temp_path = temp_path_for(job.output_path)
+                    with open(job.temp_path, 'wb') as f:
+                        f.write(job.data)
+                    job.data = None
+                written.append(job)
+            except OSError as e:
+                self._finish(job, e)
+
+        # 2. fsync (묶음)
+        if self.fsync:
+            synced = []
+            for job in written:
+                try:
+                    _fsync_path(job.temp_path)
+                    synced.append(job)
+                except OSError as e:
+                    self._finish(job, e)
+            written = synced
+
+        # 3. rename (여기서부터 최종 경로에 완전한 파일만 보임)
+        directories, renamed = set(), []
+        for job in written:
+            try:
+                os.replace(job.temp_path, job.output_path)
+                directories.add(os.path.dirname(job.output_path))
+                renamed.append(job)
+            except OSError as e:
+                self._finish(job, e)
+
+        # 4. 폴더 항목 반영 (폴더당 1회) 후 완료 처리
+        if self.fsync:
+            for directory in directories:
+                _fsync_directory(directory)
+        for job in renamed:
+            self._finish(job, None)
+
+    def _finish(self, job: _Job, error: Optional[Exception]):
+        if error is not None:
+            print(f"❌ 출력 저장 실패 ({job.output_path}): {error}")
+            if job.temp_path:
+                try:
+                    os.remove(job.temp_path)
+                except OSError:
+                    pass
+        else:
+            STAGE_SECONDS.observe(time.monotonic() - job.queued_at, stage='write')
+
+        job.success = error is None
+        job.error = error
+        with self._lock:
+            job.done.set()
+            callbacks, job.callbacks = job.callbacks, []
+        for callback in callbacks:
+            try:
+                callback(job.success)
+            except Exception as e:
+                print(f"⚠️ 저장 완료 콜백 오류: {e}")
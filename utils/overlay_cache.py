@@ -0,0 +1,217 @@
+"""
+컴파일된 오버레이 캐시 모듈
+
+오버레이 PNG를 출력 크기별로 미리 리사이즈한 RGBA 원시 배열(.rgba)로 저장해 두고,
+처리할 때는 읽기 전용 mmap + Image.frombuffer로 바로 사용
+- PNG 디코딩 / 사진마다의 LANCZOS 리사이즈 없음 (로드는 mmap 한 번)
+- 같은 파일을 mmap하므로 여러 합성 프로세스가 물리 메모리(페이지 캐시)를 공유
+- 파일명에 PNG 내용 해시 포함 - 오버레이가 바뀌면 자동으로 다시 컴파일
+
+파일 형식: 헤더 16바이트 (b'OVLRGBA1' + 너비/높이 uint32 LE) + 스트레이트(비곱셈) RGBA 픽셀
+저장 위치: PNG와 같은 폴더 (쓰기 불가하면 임시 폴더) - <이름>.<해시>.<너비>x<높이>.rgba
+
+디스크 사용량: 비압축이라 크기마다 너비 × 높이 × 4바이트 (18MP 약 72MB, 템플릿마다 따로)
+폴더별 합계가 max_mb를 넘으면 가장 오래 안 쓴 파일부터 삭제 (사용할 때마다 수정시각 갱신)
+
+config.json:
+    "processing": {
+        "overlay_cache": { "enabled": true, "sizes": [[5184, 3456]], "max_mb": 1024 }
+    }
+"""
+
+import glob
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils.metrics import CACHE_REQUESTS, STAGE_SECONDS
+from utils.output_writer import temp_path_for
+
+MAGIC = b'OVLRGBA1'
+HEADER_SIZE = 16
+
+DEFAULT_OVERLAY_CACHE_CONFIG = {
+    'enabled': True,
+    # 시작 시 미리 컴파일할 출력 크기 [[너비, 높이], ...] (나머지는 처음 쓸 때 컴파일)
+    'sizes': [],
+    # 폴더별 컴파일 파일 합계 상한 (MB, 넘으면 오래 안 쓴 크기부터 삭제)
+    'max_mb': 1024,
+}
+
+# <이름>.<해시 12자리>.<너비>x<높이>.rgba
+_COMPILED_PATTERN = re.compile(r'^(.+)\.([0-9a-f]{12})\.(\d+)x(\d+)\.rgba$')
+
+
+def content_hash(path: str) -> str:
+    """PNG 내용 해시 (앞 12자리)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class OverlayCache:
+    """오버레이 하나의 크기별 컴파일 캐시 (프로세스마다 하나, 스레드 안전)"""
+
+    def __init__(self, overlay_path: str, cache_config: Optional[dict] = None):
+        """
+        Args:
+            overlay_path: 오버레이 PNG 경로
+            cache_config: processing.overlay_cache 설정
+        """
+        cache_config = {**DEFAULT_OVERLAY_CACHE_CONFIG, **(cache_config or {})}
+        self.overlay_path = overlay_path
+        self.sizes = [tuple(size) for size in cache_config['sizes']]
+        self.max_bytes = int(cache_config['max_mb'] * 1024 * 1024)
+        self.digest = content_hash(overlay_path)
+        # 이미 디코딩된 원본 (있으면 컴파일할 때 PNG를 다시 읽지 않음)
+        self.source = None
+        self._lock = threading.Lock()
+        # 크기 → (mmap, 이미지) - 이미지가 mmap 버퍼를 참조하므로 함께 보관
+        self._mapped: Dict[Tuple[int, int], tuple] = {}
+
+    def _directories(self) -> list:
+        fallback = os.path.join(tempfile.gettempdir(), 'photo_overlay_cache')
+        return [os.path.dirname(os.path.abspath(self.overlay_path)), fallback]
+
+    def _file_name(self, size: Tuple[int, int]) -> str:
+        stem = os.path.splitext(os.path.basename(self.overlay_path))[0]
+        return f"{stem}.{self.digest}.{size[0]}x{size[1]}.rgba"
+
+    def compiled_path(self, size: Tuple[int, int]) -> Optional[str]:
+        """이미 컴파일된 파일 경로 (없으면 None)"""
+        for directory in self._directories():
+            path = os.path.join(directory, self._file_name(size))
+            if os.path.exists(path):
+                return path
+        return None
+
+    def compile(self, size: Tuple[int, int]) -> str:
+        """PNG → 크기별 RGBA 파일 (임시 파일 → rename, 같은 PNG의 이전 해시 파일은 삭제)"""
+        from PIL import Image
+
+        with STAGE_SECONDS.time(stage='overlay_compile'):
+            if self.source is not None:
+                overlay = self.source.convert('RGBA').resize(size, Image.Resampling.LANCZOS)
+            else:
+                with Image.open(self.overlay_path) as overlay:
+                    overlay = overlay.convert('RGBA').resize(size, Image.Resampling.LANCZOS)
+            header = MAGIC + struct.pack('<II', *size)
+
+            last_error = None
+            for directory in self._directories():
+                path = os.path.join(directory, self._file_name(size))
+                temp_path = None
+                try:
+                    temp_path = temp_path_for(path)
+                    with open(temp_path, 'wb') as f:
+                        f.write(header)
+                        f.write(overlay.tobytes())
+                    os.replace(temp_path, path)
+                except OSError as e:
+                    last_error = e
+                    if temp_path and os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    continue
+                self._remove_stale(directory)
+                self._enforce_limit(directory, keep=os.path.basename(path))
+                return path
+        raise last_error
+
+    def _remove_stale(self, directory: str):
+        """오버레이가 바뀌기 전(다른 해시)의 컴파일 파일 정리"""
+        stem = os.path.splitext(os.path.basename(self.overlay_path))[0]
+        for path in glob.glob(os.path.join(glob.escape(directory), glob.escape(stem) + '.*.rgba')):
+            # 같은 폴더의 다른 템플릿(a.png / a.b.png)과 섞이지 않도록 정확한 형식만
+            match = _COMPILED_PATTERN.match(os.path.basename(path))
+            if match and match.group(1) == stem and match.group(2) != self.digest:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _enforce_limit(self, directory: str, keep: str = ''):
+        """폴더의 컴파일 파일 합계가 max_bytes 이하가 되도록 오래 안 쓴 것부터 삭제 (지금 매핑 중인 것 / keep 제외)"""
+        in_use = {self._file_name(size) for size in self._mapped} | {keep}
+        files = []
+        for name in os.listdir(directory):
+            if not _COMPILED_PATTERN.match(name):
+                continue
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if name in in_use:
+                continue
+            try:
+                # 다른 프로세스가 매핑 중이어도 매핑은 유지됨 (다음에 쓸 때 다시 컴파일)
+                os.remove(os.path.join(directory, name))
+                total -= size
+                print(f"🧹 오버레이 캐시 정리: {name} ({size // (1024 * 1024)}MB)")
+            except OSError:
+                pass
+
+    def _map(self, path: str, size: Tuple[int, int]):
+        """읽기 전용 mmap → 버퍼를 공유하는 RGBA 이미지"""
+        from PIL import Image
+
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:8] != MAGIC or struct.unpack('<II', mapped[8:16]) != tuple(size) or \
+                len(mapped) != HEADER_SIZE + size[0] * size[1] * 4:
+            mapped.close()
+            raise ValueError(f"컴파일된 오버레이 손상: {path}")
+        image = Image.frombuffer('RGBA', size, memoryview(mapped)[HEADER_SIZE:], 'raw', 'RGBA', 0, 1)
+        return mapped, image
+
+    def get(self, size: Tuple[int, int]):
+        """
+        출력 크기에 맞춘 오버레이 (읽기 전용 RGBA 이미지, 없으면 컴파일)
+
+        Returns:
+            PIL 이미지 (실패 시 None - 호출한 쪽에서 PNG를 직접 리사이즈)
+        """
+        size = tuple(size)
+        entry = self._mapped.get(size)
+        if entry is not None:
+            CACHE_REQUESTS.inc(cache='overlay', result='hit')
+            return entry[1]
+
+        with self._lock:
+            entry = self._mapped.get(size)
+            if entry is None:
+                CACHE_REQUESTS.inc(cache='overlay', result='miss')
+                try:
+                    path = self.compiled_path(size)
+                    try:
+                        entry = self._map(path, size) if path else None
+                        if entry is not None:
+                            # 최근 사용 표시 (용량 정리 순서)
+                            os.utime(path)
+                    except ValueError as e:
+                        print(f"⚠️ {e} - 다시 컴파일")
+                        entry = None
+                    if entry is None:
+                        entry = self._map(self.compile(size), size)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ 오버레이 캐시 사용 불가 ({size[0]}x{size[1]}): {e}")
+                    return None
+                self._mapped[size] = entry
+        return entry[1]
+
+    def precompile(self, sizes: Optional[Iterable] = None):
+        """설정된 크기를 미리 컴파일 + mmap (시작 직후 백그라운드에서 호출)"""
+        for size in (sizes if sizes is not None else self.sizes):
+            self.get(tuple(size))
@@ -0,0 +1,209 @@
+"""
+오버레이 템플릿 풀 모듈
+
+템플릿 폴더의 PNG를 시작할 때 모두 디코딩 / 컴파일해 두고 사진마다 하나를 선택
+(스폰서 / 시간대별 프레임 교체 - 설정 변경만으로 재시작 없이)
+- round_robin: 이름 순서대로 번갈아
+- time: 시간대(windows)에 맞는 템플릿 (맞는 시간대가 없으면 default)
+- random: 무작위
+사진마다 디스크 읽기 / 디코딩 없음 (선택은 메모리의 ImageProcessor 중 하나)
+
+config.json:
+    "processing": {
+        "templates": {
+            "folder": "overlays",
+            "selection": "time",
+            "default": "base.png",
+            "windows": [
+                { "start": "10:00", "end": "14:00", "template": "sponsor_a.png" },
+                { "start": "22:00", "end": "02:00", "template": "night.png" }
+            ]
+        }
+    }
+"""
+
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.metrics import OVERLAY_TEMPLATES
+
+SELECTIONS = ('round_robin', 'time', 'random')
+
+DEFAULT_TEMPLATES_CONFIG = {
+    # 비어 있으면 템플릿 사용 안 함 (paths.overlay_image 하나만)
+    'folder': '',
+    'selection': 'round_robin',
+    # time 선택에서 맞는 시간대가 없을 때 (비어 있으면 이름순 첫 번째)
+    'default': '',
+    'windows': [],
+}
+
+
+def list_templates(folder: str) -> List[Tuple[str, float]]:
+    """템플릿 폴더의 PNG 목록 [(파일명, 수정시각), ...] (이름순)"""
+    if not folder or not os.path.isdir(folder):
+        return []
+    templates = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if name.lower().endswith('.png') and not name.startswith('.') and os.path.isfile(path):
+            templates.append((name, os.path.getmtime(path)))
+    return templates
+
+
+def _parse_minutes(value: str) -> int:
+    """'HH:MM' → 자정부터의 분"""
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+class TemplatePool:
+    """미리 준비된 오버레이 템플릿 모음 + 사진별 선택 규칙"""
+
+    def __init__(self, folder: str, templates_config: dict, cache_config: Optional[dict] = None,
+                 previous: Optional['TemplatePool'] = None):
+        """
+        Args:
+            folder: 템플릿 폴더
+            templates_config: processing.templates 설정
+            cache_config: processing.overlay_cache 설정
+            previous: 이전 풀 (파일/캐시 설정이 같은 템플릿은 디코딩 없이 재사용)
+        """
+        from utils.image_processor import ImageProcessor
+
+        self.folder = folder
+        self.cache_config = cache_config or {}
+        self.key = self.key_for(folder, self.cache_config)
+        self.processors: Dict[str, ImageProcessor] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next = 0
+
+        reusable = {}
+        if previous is not None and previous.cache_config == self.cache_config:
+            reusable = {(name, mtime): previous.processors[name]
+                        for name, mtime in previous.key[1] if name in previous.processors}
+
+        for name, mtime in self.key[1]:
+            processor = reusable.get((name, mtime))
+            if processor is None:
+                processor = ImageProcessor(os.path.join(folder, name), self.cache_config)
+                if processor.overlay_image is None:
+                    continue
+                try:
+                    # 첫 사진 전에 디코딩 (캐시 컴파일도 이 디코딩 결과를 사용)
+                    processor.load_overlay()
+                except OSError as e:
+                    print(f"⚠️ 템플릿 로드 실패 ({name}): {e}")
+                    continue
+            self.processors[name] = processor
+
+        print(f"✅ 오버레이 템플릿 {len(self.processors)}개 준비: {folder}")
+        self.configure(templates_config)
+
+    @staticmethod
+    def key_for(folder: str, cache_config: dict) -> tuple:
+        """풀을 다시 만들어야 하는지 비교할 키 (폴더 / 파일 목록 / 수정시각)"""
+        return os.path.abspath(folder), tuple(list_templates(folder)), json.dumps(cache_config, sort_keys=True)
+
+    def configure(self, templates_config: dict):
+        """선택 규칙 변경 (템플릿은 다시 읽지 않음)"""
+        selection = templates_config.get('selection', 'round_robin')
+        if selection not in SELECTIONS:
+            print(f"⚠️ 알 수 없는 템플릿 선택 방식: {selection} - round_robin 사용")
+            selection = 'round_robin'
+
+        windows = []
+        for window in templates_config.get('windows', []):
+            name = window.get('template', '')
+            if name not in self.processors:
+                print(f"⚠️ 시간대 템플릿 없음: {name}")
+                continue
+            try:
+                windows.append((_parse_minutes(window['start']), _parse_minutes(window['end']), name))
+            except (KeyError, ValueError) as e:
+                print(f"⚠️ 잘못된 시간대 설정 ({window}): {e}")
+
+        default = templates_config.get('default', '')
+        if default and default not in self.processors:
+            print(f"⚠️ 기본 템플릿 없음: {default}")
+            default = ''
+
+        with self._lock:
+            self.selection = selection
+            self.windows = windows
+            self.default = default or next(iter(self.processors), '')
+
+    def __len__(self) -> int:
+        return len(self.processors)
+
+    @property
+    def paths(self) -> List[str]:
+        return [processor.overlay_path for processor in self.processors.values()]
+
+    def choose(self, now: Optional[datetime] = None) -> str:
+        """이번 사진에 쓸 템플릿 이름"""
+        names = list(self.processors)
+        with self._lock:
+            if self.selection == 'random':
+                return random.choice(names)
+            if self.selection == 'time':
+                now = now or datetime.now()
+                minute = now.hour * 60 + now.minute
+                for start, end, name in self.windows:
+                    # 자정을 넘는 시간대 (22:00 ~ 02:00) 포함
+                    if start <= minute < end or (end < start and (minute >= start or minute < end)):
+                        return name
+                return self.default
+            name = names[self._next % len(names)]
+            self._next += 1
+            return name
+
+    def select(self, now: Optional[datetime] = None):
+        """이번 사진에 쓸 템플릿의 ImageProcessor"""
+        name = self.choose(now)
+        OVERLAY_TEMPLATES.inc(template=name)
+        return self.processors[name]
+
+    def route(self, compositor=None) -> '_TemplateRoute':
+        """composite_image를 호출할 때 템플릿을 선택하는 처리 객체 (오버레이를 쓰는 사진만 선택)"""
+        return _TemplateRoute(self, compositor)
+
+    def precompile(self):
+        """모든 템플릿의 설정된 크기를 미리 컴파일 (시작 직후 백그라운드에서 호출)"""
+        for processor in self.processors.values():
+            if processor.overlay_cache is not None:
+                processor.overlay_cache.precompile()
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                'folder': self.folder,
+                'templates': list(self.processors),
+                'selection': self.selection,
+                'default': self.default,
+            }
+
+
+class _TemplateRoute:
+    """ImageProcessor와 같은 composite_image 인터페이스 (호출마다 템플릿 선택)"""
+
+    def __init__(self, pool: TemplatePool, compositor=None):
+        self.pool = pool
+        self.compositor = compositor
+
+    @property
+    def overlay_image(self):
+        return self.pool.processors[self.pool.default].overlay_image
+
+    def composite_image(self, base_image_path: str, output_path: str, overlay_mode: str = "fullscreen",
+                        writer=None, encoder=None) -> bool:
+        processor = self.pool.select()
+        if self.compositor is not None:
+            return self.compositor.composite_image(base_image_path, output_path, overlay_mode, writer, encoder,
+                                                   processor=processor)
+        return processor.composite_image(base_image_path, output_path, overlay_mode, writer, encoder)
@@ -0,0 +1,171 @@
+"""
+연속 촬영 중복 감지 모듈 (지각 해시)
+
+연사 모드로 거의 같은 사진이 여러 장 들어오면 장마다 AI 호출 비용이 드는 문제
+- dHash: JPEG draft 디코딩(1/8 축소)으로 작게 읽어서 9x8 밝기 차이 → 64비트 해시 (사진당 수 ms)
+- 최근 사진 색인(메모리): 같은 카메라 + window_seconds 안 + 해밍 거리 max_distance 이하면 중복
+- 색인에는 처리에 성공한 사진만 추가 (실패한 사진을 다시 처리할 때 자기 자신과 비교하지 않음)
+- 촬영 시각은 EXIF DateTimeOriginal(+SubSec), 없으면 처리 시각
+
+config.json:
+    "processing": {
+        "dedup": { "enabled": false, "window_seconds": 2.0, "max_distance": 10, "action": "skip" }
+    }
+    action: skip (결과 없이 건너뜀) / overlay (AI 대신 오버레이로만 처리)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from utils.metrics import STAGE_SECONDS
+
+HASH_SIZE = 8
+DEDUP_ACTIONS = ('skip', 'overlay')
+
+DEFAULT_DEDUP_CONFIG = {
+    'enabled': False,
+    'window_seconds': 2.0,
+    'max_distance': 10,
+    'action': 'skip',
+    # 색인에 보관할 최근 사진 수
+    'max_entries': 64,
+}
+
+_EXIF_IFD = 0x8769
+_TAG_MODEL = 0x0110
+_TAG_DATETIME_ORIGINAL = 0x9003
+_TAG_SUBSEC_ORIGINAL = 0x9291
+_TAG_BODY_SERIAL = 0xA431
+
+
+def dhash(image) -> int:
+    """밝기 차이 해시 (가로로 이웃한 픽셀 비교, HASH_SIZE² 비트)"""
+    from PIL import Image
+
+    small = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _capture_time(exif) -> Optional[float]:
+    """EXIF 촬영 시각 (초, 소수점 이하는 SubSecTimeOriginal)"""
+    detail = exif.get_ifd(_EXIF_IFD)
+    value = detail.get(_TAG_DATETIME_ORIGINAL)
+    if not value:
+        return None
+    try:
+        seconds = datetime.strptime(str(value).strip('\x00 '), '%Y:%m:%d %H:%M:%S').timestamp()
+    except ValueError:
+        return None
+    subsec = str(detail.get(_TAG_SUBSEC_ORIGINAL, '')).strip('\x00 ')
+    if subsec.isdigit():
+        seconds += int(subsec) / (10 ** len(subsec))
+    return seconds
+
+
+def read_shot(path: str) -> Tuple[int, float, str]:
+    """
+    사진 해시 / 촬영 시각 / 카메라 식별자
+
+    Returns:
+        (해시, 촬영 시각, 카메라) - 카메라는 EXIF 모델 + 바디 시리얼 (없으면 빈 문자열)
+
+    Raises:
+        OSError: 읽기/디코딩 실패
+    """
+    from PIL import Image
+
+    with STAGE_SECONDS.time(stage='dedup_hash'):
+        with Image.open(path) as image:
+            exif = image.getexif()
+            # JPEG는 DCT 단계에서 축소 디코딩 (전체 해상도 디코딩 없음)
+            image.draft('L', (HASH_SIZE * 16, HASH_SIZE * 16))
+            value = dhash(image)
+            taken = _capture_time(exif)
+            detail = exif.get_ifd(_EXIF_IFD)
+            camera = f"{exif.get(_TAG_MODEL, '')}:{detail.get(_TAG_BODY_SERIAL, '')}".strip('\x00 ')
+
+    return value, taken if taken is not None else time.time(), camera
+
+
+class DuplicateIndex:
+    """최근 사진 해시 색인 (스레드 안전)"""
+
+    def __init__(self, dedup_config: Optional[dict] = None):
+        self._lock = threading.Lock()
+        self._entries = deque()
+        self.configure(dedup_config or {})
+
+    def configure(self, dedup_config: dict):
+        """설정 변경 (기존 색인은 유지)"""
+        dedup_config = {**DEFAULT_DEDUP_CONFIG, **dedup_config}
+        action = dedup_config['action']
+        if action not in DEDUP_ACTIONS:
+            print(f"⚠️ 알 수 없는 중복 처리 방식: {action} - skip 사용")
+            action = 'skip'
+        with self._lock:
+            self.enabled = dedup_config['enabled']
+            self.window_seconds = dedup_config['window_seconds']
+            self.max_distance = dedup_config['max_distance']
+            self.action = action
+            self._entries = deque(self._entries, maxlen=max(1, dedup_config['max_entries']))
+
+    def check(self, path: str, key: Optional[str] = None) -> Tuple[Optional[Dict[str, any]], Optional[tuple]]:
+        """
+        처리에 성공한 최근 사진과 비교 (색인에는 추가하지 않음 - 처리 성공 후 add)
+
+        Args:
+            path: 사진 경로
+            key: 사진 식별자 (기본: path) - 같은 식별자의 이전 항목과는 비교하지 않음
+
+        Returns:
+            (중복 정보, 사진 정보)
+            중복 정보: 중복이면 {'name', 'distance', 'seconds', 'action'} (가장 가까운 사진), 아니면 None
+            사진 정보: add에 넘길 값 (읽기 실패 시 None)
+        """
+        key = key or path
+        try:
+            value, taken, camera = read_shot(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 중복 검사 생략 ({os.path.basename(path)}): {e}")
+            return None, None
+
+        with self._lock:
+            match = None
+            for entry_value, entry_taken, entry_camera, entry_key, entry_name in self._entries:
+                seconds = abs(taken - entry_taken)
+                if entry_key == key or entry_camera != camera or seconds > self.window_seconds:
+                    continue
+                distance = hamming(value, entry_value)
+                if distance <= self.max_distance and (match is None or distance < match['distance']):
+                    match = {'name': entry_name, 'distance': distance, 'seconds': seconds,
+                             'action': self.action}
+        return match, (value, taken, camera, key, os.path.basename(path))
+
+    def add(self, shot: Optional[tuple]):
+        """
+        처리에 성공한 사진을 색인에 추가 (건너뛴 중복 포함 - 연사가 길어져도 직전 사진과 계속 이어서 비교)
+
+        Args:
+            shot: check가 반환한 사진 정보 (None이면 무시)
+        """
+        if shot is None:
+            return
+        with self._lock:
+            # 같은 사진을 다시 처리한 경우 이전 항목 교체
+            self._entries = deque((entry for entry in self._entries if entry[3] != shot[3]),
+                                  maxlen=self._entries.maxlen)
+            self._entries.append(shot)
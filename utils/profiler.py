@@ -0,0 +1,240 @@
+"""
+프로파일링 모듈 (cProfile + tracemalloc)
+
+장시간 운영 중 느려지는 원인 추적용:
+- 핫 패스(process_image, get_all_files, download_file) 호출 통계 및 cProfile 수집
+- tracemalloc 스냅샷 비교로 메모리 증가 위치 추적
+- 주기적 / 종료 시 리포트 저장
+"""
+
+import atexit
+import cProfile
+import functools
+import gc
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+
+class Profiler:
+    """핫 패스 프로파일러"""
+
+    def __init__(self, output_dir: str = "profile_reports", interval: float = 300.0,
+                 top: int = 25, traceback_depth: int = 10):
+        """
+        Args:
+            output_dir: 리포트 저장 폴더
+            interval: 주기적 리포트 간격 (초, 0이면 종료 시에만)
+            top: 리포트에 표시할 상위 항목 수
+            traceback_depth: tracemalloc 트레이스백 깊이
+        """
+        self.output_dir = output_dir
+        self.interval = interval
+        self.top = top
+        self.traceback_depth = traceback_depth
+
+        self._profile = cProfile.Profile()
+        self._profile_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._calls: Dict[str, dict] = {}
+        self._baseline = None
+        self._previous = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._started_at = None
+        self.running = False
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'Profiler':
+        """설정(profiling 섹션)으로 생성"""
+        profiling = config.get('profiling', {})
+        return cls(
+            output_dir=profiling.get('output_dir', 'profile_reports'),
+            interval=profiling.get('interval_seconds', 300),
+            top=profiling.get('top', 25)
+        )
+
+    def start(self):
+        """프로파일링 시작 (중복 호출 무시)"""
+        if self.running:
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_depth)
+        self._baseline = self._take_snapshot()
+        self._previous = self._baseline
+        self._started_at = time.time()
+        self.running = True
+
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._report_loop, name='profiler', daemon=True)
+            self._thread.start()
+
+        atexit.register(self.stop)
+        print(f"🔬 프로파일링 시작 (리포트: {self.output_dir}, 간격: {self.interval}초)")
+
+    def stop(self):
+        """프로파일링 종료 및 최종 리포트 저장"""
+        if not self.running:
+            return
+
+        self.running = False
+        self._stop_event.set()
+        path = self.dump('exit')
+        tracemalloc.stop()
+        print(f"🔬 프로파일링 종료 - 리포트: {path}")
+
+    def wrap(self, func, name: Optional[str] = None):
+        """함수를 호출 통계 + cProfile 수집으로 감싸기"""
+        label = name or getattr(func, '__qualname__', repr(func))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.running:
+                return func(*args, **kwargs)
+
+            # cProfile은 한 번에 한 스레드만 수집 (동시 호출은 시간만 기록)
+            profiled = self._profile_lock.acquire(blocking=False)
+            if profiled:
+                try:
+                    self._profile.enable()
+                except ValueError:
+                    # 다른 프로파일러가 이미 활성화된 경우
+                    self._profile_lock.release()
+                    profiled = False
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profiled:
+                    self._profile.disable()
+                    self._profile_lock.release()
+                self._record(label, time.perf_counter() - start)
+
+        wrapper.__profiled__ = True
+        return wrapper
+
+    def instrument(self, target, method_names: Iterable[str]):
+        """
+        클래스 또는 객체의 메서드를 프로파일링 래퍼로 교체
+
+        Args:
+            target: 클래스(모든 인스턴스에 적용) 또는 인스턴스
+            method_names: 감쌀 메서드 이름 목록
+        """
+        owner = target if isinstance(target, type) else type(target)
+        for method_name in method_names:
+            method = getattr(target, method_name, None)
+            if method is None or getattr(method, '__profiled__', False):
+                continue
+            setattr(target, method_name, self.wrap(method, f"{owner.__name__}.{method_name}"))
+
+    @staticmethod
+    def _take_snapshot():
+        """tracemalloc 스냅샷 (tracemalloc/임포트 자체 할당 제외)"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def _record(self, label: str, elapsed: float):
+        with self._stats_lock:
+            entry = self._calls.setdefault(label, {'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += elapsed
+            entry['max'] = max(entry['max'], elapsed)
+
+    def _report_loop(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.dump('interval')
+            except Exception as e:
+                print(f"⚠️ 프로파일 리포트 저장 실패: {e}")
+
+    def dump(self, reason: str = 'manual') -> str:
+        """
+        리포트 저장 (텍스트 요약 + pstats 바이너리)
+
+        Returns:
+            텍스트 리포트 경로
+        """
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = os.path.join(self.output_dir, f"profile_{stamp}_{reason}.txt")
+        prof_path = os.path.join(self.output_dir, f"profile_{stamp}_{reason}.prof")
+
+        out = io.StringIO()
+        uptime = time.time() - (self._started_at or time.time())
+        out.write(f"# 프로파일 리포트 ({reason}) - {datetime.now().isoformat(timespec='seconds')}\n")
+        out.write(f"# 가동 시간: {uptime / 3600:.2f}시간\n\n")
+
+        # 1. 핫 패스 호출 통계
+        out.write("## 핫 패스 호출 통계\n")
+        out.write(f"{'함수':<40} {'호출':>8} {'평균(s)':>10} {'최대(s)':>10} {'합계(s)':>10}\n")
+        with self._stats_lock:
+            calls = {k: dict(v) for k, v in self._calls.items()}
+        for label, entry in sorted(calls.items(), key=lambda kv: -kv[1]['total']):
+            avg = entry['total'] / entry['count'] if entry['count'] else 0.0
+            out.write(f"{label:<40} {entry['count']:>8} {avg:>10.3f} "
+                      f"{entry['max']:>10.3f} {entry['total']:>10.1f}\n")
+
+        # 2. cProfile 상위 함수 (누적 시간)
+        out.write("\n## cProfile 상위 함수 (cumulative)\n")
+        with self._profile_lock:
+            try:
+                self._profile.dump_stats(prof_path)
+                stats = pstats.Stats(self._profile, stream=out)
+                stats.sort_stats('cumulative').print_stats(self.top)
+            except (TypeError, ValueError):
+                out.write("(수집된 데이터 없음)\n")
+
+        # 3. tracemalloc 메모리 증가
+        if tracemalloc.is_tracing():
+            snapshot = self._take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            out.write(f"\n## 메모리 (현재 {current / 1e6:.1f}MB, 최대 {peak / 1e6:.1f}MB)\n")
+
+            out.write("\n### 시작 대비 증가 (상위)\n")
+            for stat in snapshot.compare_to(self._baseline, 'lineno')[:self.top]:
+                out.write(f"{stat}\n")
+
+            out.write("\n### 직전 리포트 대비 증가 (상위)\n")
+            for stat in snapshot.compare_to(self._previous, 'lineno')[:self.top]:
+                out.write(f"{stat}\n")
+            self._previous = snapshot
+
+        # 4. 살아있는 객체 타입 (PIL Image, 위젯 등 누수 확인용)
+        out.write("\n## 살아있는 객체 타입 (상위)\n")
+        type_counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+        for type_name, count in type_counts.most_common(self.top):
+            out.write(f"{type_name:<40} {count:>10}\n")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+
+        return report_path
+
+
+def instrument_hot_paths(profiler: Profiler):
+    """
+    공용 핫 패스 계측 (클래스 단위라 이후 생성되는 인스턴스에도 적용)
+
+    - HybridProcessor.process_image
+    - CameraConnection.get_all_files / download_file (gphoto2 설치 시)
+    """
+    from utils.ai_transformer import HybridProcessor
+    profiler.instrument(HybridProcessor, ['process_image'])
+
+    try:
+        from utils.camera import CameraConnection
+        profiler.instrument(CameraConnection, ['get_all_files', 'download_file'])
+    except ImportError:
+        pass
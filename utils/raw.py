@@ -0,0 +1,228 @@
+"""
+Canon CR2 RAW 처리 모듈
+
+CR2(TIFF 기반)의 IFD0에는 카메라가 만든 원본 해상도 JPEG 미리보기가 들어 있음
+(StripOffsets / StripByteCounts) - 해당 바이트 구간만 잘라내면 현상(디모자이크) 없이 바로 JPEG
+
+- 카메라: 헤더와 미리보기 구간만 부분 읽기 (RAW 전체 다운로드 생략)
+- 폴더/수동 처리: 로컬 CR2 파일에서 같은 방식으로 추출
+- RAW+JPEG 쌍은 한 장으로 묶어서 한 번만 처리
+
+config.json:
+    "processing": {
+        "raw": { "enabled": true, "prefer": "jpeg" }
+    }
+"""
+
+import os
+import struct
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+RAW_EXTENSIONS = ('.cr2',)
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+
+# 헤더 부분 읽기 크기 (IFD0와 태그 값은 보통 파일 앞쪽 1KB 안에 있음)
+HEADER_READ_SIZE = 64 * 1024
+
+_TAG_STRIP_OFFSETS = 0x0111
+_TAG_STRIP_BYTE_COUNTS = 0x0117
+_TYPE_SIZES = {3: 2, 4: 4}  # SHORT, LONG
+
+
+def is_raw(filename: str) -> bool:
+    return filename.lower().endswith(RAW_EXTENSIONS)
+
+
+def is_jpeg(filename: str) -> bool:
+    return filename.lower().endswith(JPEG_EXTENSIONS)
+
+
+def output_name(filename: str) -> str:
+    """처리 결과 파일명 (RAW는 확장자를 .jpg로)"""
+    if is_raw(filename):
+        return os.path.splitext(filename)[0] + '.jpg'
+    return filename
+
+
+class _PrefetchReader:
+    """앞부분을 한 번에 읽어 두고 그 범위 밖만 추가로 읽기 (카메라 왕복 횟수 최소화)"""
+
+    def __init__(self, read: Callable[[int, int], bytes], prefetch_size: int = HEADER_READ_SIZE):
+        self._read = read
+        self._head = read(0, prefetch_size)
+
+    def read(self, offset: int, size: int) -> bytes:
+        if offset + size <= len(self._head):
+            return self._head[offset:offset + size]
+        return self._read(offset, size)
+
+
+def find_cr2_preview(read: Callable[[int, int], bytes]) -> Tuple[int, int]:
+    """
+    CR2 내장 JPEG 위치 찾기
+
+    Args:
+        read: (오프셋, 크기) → 바이트 (파일 또는 카메라 부분 읽기)
+
+    Returns:
+        (오프셋, 길이)
+
+    Raises:
+        ValueError: CR2가 아니거나 미리보기 정보가 없는 경우
+    """
+    reader = _PrefetchReader(read)
+    header = reader.read(0, 16)
+    if header[:4] == b'II*\x00':
+        order = '<'
+    elif header[:4] == b'MM\x00*':
+        order = '>'
+    else:
+        raise ValueError("TIFF 헤더 아님")
+    if header[8:10] != b'CR':
+        raise ValueError("CR2 파일 아님")
+
+    ifd_offset = struct.unpack(order + 'I', header[4:8])[0]
+    entry_count = struct.unpack(order + 'H', reader.read(ifd_offset, 2))[0]
+    entries = reader.read(ifd_offset + 2, entry_count * 12)
+
+    values = {}
+    for i in range(entry_count):
+        tag, field_type, count = struct.unpack(order + 'HHI', entries[i * 12:i * 12 + 8])
+        if tag not in (_TAG_STRIP_OFFSETS, _TAG_STRIP_BYTE_COUNTS) or field_type not in _TYPE_SIZES:
+            continue
+        size = _TYPE_SIZES[field_type]
+        raw_value = entries[i * 12 + 8:i * 12 + 12]
+        if count * size > 4:
+            raw_value = reader.read(struct.unpack(order + 'I', raw_value)[0], count * size)
+        code = 'H' if field_type == 3 else 'I'
+        values[tag] = list(struct.unpack(order + code * count, raw_value[:count * size]))
+
+    offsets = values.get(_TAG_STRIP_OFFSETS)
+    counts = values.get(_TAG_STRIP_BYTE_COUNTS)
+    if not offsets or not counts or len(offsets) != len(counts):
+        raise ValueError("내장 JPEG 정보 없음")
+
+    # 여러 스트립이면 연속된 경우만 (Canon은 항상 1개)
+    for i in range(1, len(offsets)):
+        if offsets[i] != offsets[i - 1] + counts[i - 1]:
+            raise ValueError("내장 JPEG가 연속되어 있지 않음")
+    return offsets[0], sum(counts)
+
+
+def read_preview(read: Callable[[int, int], bytes]) -> bytes:
+    """CR2 내장 JPEG 바이트 (ValueError: 추출 불가)"""
+    try:
+        offset, length = find_cr2_preview(read)
+    except struct.error as e:
+        raise ValueError(f"CR2 헤더 손상: {e}")
+    data = read(offset, length)
+    if len(data) != length or not data.startswith(b'\xff\xd8'):
+        raise ValueError("내장 JPEG 손상")
+    return data
+
+
+def read_preview_from_file(raw_path: str) -> bytes:
+    """로컬 CR2 파일에서 내장 JPEG 바이트 읽기"""
+    with open(raw_path, 'rb') as f:
+        def read(offset: int, size: int) -> bytes:
+            f.seek(offset)
+            return f.read(size)
+        return read_preview(read)
+
+
+def save_camera_preview(read_range: Callable[[int, int], bytes], download_full: Callable[[str], None],
+                        target_path: str, errors: tuple = (OSError,)) -> int:
+    """
+    카메라의 CR2에서 내장 JPEG만 가져와 target_path에 저장
+
+    Args:
+        read_range: (오프셋, 크기) → 바이트 (카메라 부분 읽기)
+        download_full: 전체 파일을 주어진 경로에 저장 (부분 읽기 실패 시 사용)
+        target_path: JPEG 저장 경로
+        errors: 부분 읽기 실패로 볼 카메라 예외 타입
+
+    Returns:
+        카메라에서 전송한 바이트 수
+
+    Raises:
+        ValueError / errors: 전체 다운로드 후에도 추출 실패
+    """
+    try:
+        data = read_preview(read_range)
+        transferred = len(data)
+    except errors + (ValueError,) as e:
+        print(f"⚠️ 부분 읽기 실패 ({os.path.basename(target_path)}: {e}) - 전체 다운로드 후 추출")
+        raw_path = target_path + '.cr2.part'
+        try:
+            download_full(raw_path)
+            transferred = os.path.getsize(raw_path)
+            data = read_preview_from_file(raw_path)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+    with open(target_path, 'wb') as f:
+        f.write(data)
+    return transferred
+
+
+def extract_preview_to_temp(raw_path: str) -> str:
+    """로컬 CR2의 내장 JPEG를 임시 파일로 저장 (호출한 쪽에서 삭제)"""
+    data = read_preview_from_file(raw_path)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.splitext(os.path.basename(raw_path))[0] + '.',
+                                     suffix='.jpg')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    return temp_path
+
+
+def select_sources(files: List[Dict[str, any]], raw_config: Optional[dict] = None,
+                   image_extensions: tuple = JPEG_EXTENSIONS) -> List[Dict[str, any]]:
+    """
+    처리할 원본 선택 (RAW+JPEG 쌍은 하나만)
+
+    Args:
+        files: [{'path', 'name', 'full_path', ...}, ...] (카메라 또는 폴더 목록)
+        raw_config: processing.raw 설정
+            - enabled: RAW 처리 여부 (기본: True, False면 JPEG만)
+            - prefer: 쌍일 때 사용할 쪽 'jpeg' (기본) 또는 'raw'
+        image_extensions: RAW 외에 처리할 확장자 (폴더 모드는 PNG 포함)
+
+    Returns:
+        선택된 항목 사본 목록 (목록 순서 유지)
+            - local_name: 다운로드/결과 파일명 (RAW는 .jpg)
+            - pair_names / pair_paths: 같은 쌍의 파일명 / 전체 경로 (처리 완료 기록용)
+    """
+    raw_config = raw_config or {}
+    raw_enabled = raw_config.get('enabled', True)
+    prefer_raw = raw_config.get('prefer', 'jpeg') == 'raw'
+
+    groups: Dict[tuple, List[Dict[str, any]]] = {}
+    order = []
+    for file_info in files:
+        name = file_info['name']
+        if not name.lower().endswith(image_extensions) and not (raw_enabled and is_raw(name)):
+            continue
+        key = (file_info['path'], os.path.splitext(name)[0].lower())
+        if key not in groups:
+            groups[key] = []
+            order.append(key)
+        groups[key].append(file_info)
+
+    selected = []
+    for key in order:
+        members = groups[key]
+        raws = [f for f in members if is_raw(f['name'])]
+        images = [f for f in members if not is_raw(f['name'])]
+        if prefer_raw:
+            chosen = (raws or images)[0]
+        else:
+            chosen = (images or raws)[0]
+
+        source = dict(chosen)
+        source['local_name'] = output_name(chosen['name'])
+        source['pair_names'] = [f['name'] for f in members]
+        source['pair_paths'] = [f['full_path'] for f in members]
+        selected.append(source)
+    return selected
@@ -0,0 +1,152 @@
+"""
+공유 메모리 슬롯 풀 모듈
+
+수집 쪽(메인 프로세스)이 사진 바이트를 공유 메모리 슬롯에 바로 읽어 넣고,
+합성 프로세스에는 슬롯 이름과 길이(핸들)만 전달 - 프로세스 간 전송 시간이 사진 크기와 무관
+슬롯은 처음에 한 번만 만들고 계속 재사용 (사진마다 할당/해제 없음)
+"""
+
+import io
+import queue
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+# 핸들: (슬롯 이름, 데이터 길이) - 피클 크기가 사진 크기와 무관
+Handle = Tuple[str, int]
+
+
+class SharedMemoryPool:
+    """고정 크기 공유 메모리 슬롯 풀 (메인 프로세스가 소유, 종료 시 unlink)"""
+
+    def __init__(self, slot_size: int, slots: int):
+        """
+        Args:
+            slot_size: 슬롯 하나의 바이트 수 (이보다 큰 사진은 풀을 쓰지 않음)
+            slots: 슬롯 수 (보통 합성 프로세스 수 × 2 - 처리 중 1 + 채우는 중 1)
+        """
+        self.slot_size = slot_size
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+        self._free: 'queue.Queue[str]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(max(1, slots)):
+            segment = shared_memory.SharedMemory(create=True, size=slot_size)
+            self._segments[segment.name] = segment
+            self._free.put(segment.name)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._segments)
+
+    def free_count(self) -> int:
+        return self._free.qsize()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[str]:
+        """빈 슬롯 이름 (timeout 안에 없으면 None)"""
+        if self._closed:
+            return None
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def release(self, name: str):
+        """슬롯 반납 (재사용)"""
+        if name in self._segments:
+            self._free.put(name)
+
+    def fill_from_file(self, name: str, path: str) -> Handle:
+        """
+        파일을 슬롯에 바로 읽어 넣기 (중간 bytes 객체 없음)
+
+        Raises:
+            ValueError: 파일이 슬롯보다 큰 경우
+        """
+        segment = self._segments[name]
+        with open(path, 'rb') as f:
+            view = segment.buf[:self.slot_size]
+            length = 0
+            try:
+                while length < self.slot_size:
+                    read = f.readinto(view[length:])
+                    if not read:
+                        break
+                    length += read
+                if length == self.slot_size and f.read(1):
+                    raise ValueError(f"슬롯보다 큰 파일 ({path})")
+            finally:
+                view.release()
+        return name, length
+
+    def close(self):
+        """모든 슬롯 해제 (합성 프로세스가 끝난 뒤 호출)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for segment in self._segments.values():
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+            try:
+                segment.close()
+            except BufferError:
+                # 아직 뷰를 쥔 스레드가 있음 - 매핑은 프로세스 종료 시 해제
+                pass
+
+
+class SharedBufferReader(io.RawIOBase):
+    """공유 메모리 구간을 복사 없이 읽는 파일 객체 (Image.open에 그대로 전달)"""
+
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._view) + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        # 슬롯은 풀이 관리 - 뷰만 놓음
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        super().close()
+
+
+# 작업 프로세스 쪽: 슬롯 이름 → 연결된 공유 메모리 (프로세스가 살아 있는 동안 재사용)
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def open_handle(handle: Handle) -> SharedBufferReader:
+    """핸들이 가리키는 데이터를 읽는 파일 객체 (작업 프로세스에서 호출)"""
+    name, length = handle
+    segment = _attached.get(name)
+    if segment is None:
+        segment = shared_memory.SharedMemory(name=name)
+        _attached[name] = segment
+    return SharedBufferReader(segment.buf[:length])
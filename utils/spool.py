@@ -0,0 +1,475 @@
+"""
+공유 폴더 작업 대기열 (스풀) 모듈
+
+카메라 PC가 공유 폴더(LAN SMB/NFS)에 작업을 쓰고, 다른 PC의 `cli.py worker`가 가져가서 처리
+(브로커 서비스 없이 파일 생성/rename의 원자성만 사용)
+
+폴더 구조:
+    <spool>/
+      jobs/<id>.json        작업 (입력/출력 파일명, 시도 횟수)
+      inputs/<id>.jpg       입력 사진
+      leases/<id>.lease     처리 중 표시 (O_EXCL로 생성, 처리 중 주기적으로 수정 시각 갱신)
+      outputs/<id>/...      결과 파일 (출력 + 공유 사본)
+      results/<id>.json     결과 (마지막에 원자적으로 기록 - 있으면 완료)
+
+- 작업 ID는 (카메라 바디, 카메라 경로)로 정해짐 - 카메라 PC를 재시작해도 같은 작업에 다시 연결
+- 임대(lease)가 lease_seconds 동안 갱신되지 않으면(작업자 종료/네트워크 끊김) 다른 작업자가 회수
+  (회수는 임대 파일 rename - 한 작업자만 성공)
+- 임대를 잃은 작업자는 결과를 쓰지 않음
+- 모든 파일은 같은 폴더의 임시 파일 → rename으로 기록 (반쪽 파일을 읽지 않음)
+
+config.json:
+    "spool": {
+        "enabled": false, "path": "", "lease_seconds": 120, "poll_seconds": 1.0,
+        "max_attempts": 3, "local_worker": true, "max_in_flight": 8
+    }
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from utils.metrics import QUEUE_DEPTH, STAGE_SECONDS
+from utils.output_writer import atomic_write_bytes
+
+DEFAULT_SPOOL_CONFIG = {
+    'enabled': False,
+    'path': '',
+    'lease_seconds': 120,
+    'poll_seconds': 1.0,
+    # 작업자가 임대를 잃은 횟수가 이 값을 넘으면 실패 처리 (작업자를 계속 죽이는 사진)
+    'max_attempts': 3,
+    # 카메라 PC도 작업자로 처리 (false면 다른 PC의 worker만 처리)
+    'local_worker': True,
+    # 카메라 PC가 동시에 결과를 기다리는 작업 수 (작업자 전체 처리 능력보다 크게)
+    'max_in_flight': 8,
+}
+
+_FOLDERS = ('jobs', 'inputs', 'leases', 'outputs', 'results')
+
+
+def job_id_for(key: str) -> str:
+    """작업 ID (같은 키면 같은 ID)"""
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+class Spool:
+    """스풀 폴더 (카메라 PC와 작업자가 공유)"""
+
+    def __init__(self, path: str, spool_config: Optional[dict] = None):
+        """
+        Args:
+            path: 공유 폴더 경로
+            spool_config: spool 설정 (lease_seconds, poll_seconds, max_attempts)
+        """
+        spool_config = {**DEFAULT_SPOOL_CONFIG, **(spool_config or {})}
+        self.path = path
+        self.lease_seconds = spool_config['lease_seconds']
+        self.poll_seconds = spool_config['poll_seconds']
+        self.max_attempts = spool_config['max_attempts']
+        for folder in _FOLDERS:
+            os.makedirs(os.path.join(path, folder), exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # 경로
+
+    def job_path(self, job_id: str) -> str:
+        return os.path.join(self.path, 'jobs', job_id + '.json')
+
+    def input_path(self, job_id: str) -> str:
+        return os.path.join(self.path, 'inputs', job_id + '.jpg')
+
+    def lease_path(self, job_id: str) -> str:
+        return os.path.join(self.path, 'leases', job_id + '.lease')
+
+    def output_dir(self, job_id: str) -> str:
+        return os.path.join(self.path, 'outputs', job_id)
+
+    def result_path(self, job_id: str) -> str:
+        return os.path.join(self.path, 'results', job_id + '.json')
+
+    # ------------------------------------------------------------------
+    # 공통
+
+    @staticmethod
+    def read_json(path: str) -> Optional[dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def write_json(path: str, data: dict):
+        atomic_write_bytes(path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def pending_jobs(self) -> list:
+        """결과가 없는 작업 ID 목록 (오래된 순)"""
+        jobs_dir = os.path.join(self.path, 'jobs')
+        entries = []
+        try:
+            with os.scandir(jobs_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.json') or entry.name.startswith('.'):
+                        continue
+                    job_id = entry.name[:-5]
+                    if not os.path.exists(self.result_path(job_id)):
+                        entries.append((entry.stat().st_mtime, job_id))
+        except OSError:
+            return []
+        return [job_id for _, job_id in sorted(entries)]
+
+    def read_result(self, job_id: str) -> Optional[dict]:
+        return self.read_json(self.result_path(job_id))
+
+    def remove_job(self, job_id: str):
+        """작업 관련 파일 전부 삭제 (결과 수거 후 - 결과 파일은 마지막에)"""
+        for path in (self.job_path(job_id), self.input_path(job_id), self.lease_path(job_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(self.output_dir(job_id), ignore_errors=True)
+        try:
+            os.remove(self.result_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    # 임대
+
+    def try_claim(self, job_id: str, worker_id: str) -> bool:
+        """
+        작업 임대 시도 (만료된 임대는 회수 후 재시도)
+
+        Returns:
+            임대 성공 여부
+        """
+        lease_path = self.lease_path(job_id)
+        for _ in range(2):
+            try:
+                fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not self._reclaim_expired(job_id, worker_id):
+                    return False
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'worker': worker_id, 'claimed_at': time.time()}, f)
+            return True
+        return False
+
+    def _reclaim_expired(self, job_id: str, worker_id: str) -> bool:
+        """만료된 임대 회수 (rename이 성공하고 옮긴 임대가 방금 본 만료 임대일 때만 True)"""
+        lease_path = self.lease_path(job_id)
+        lease = self.read_json(lease_path)
+        try:
+            age = time.time() - os.stat(lease_path).st_mtime
+        except FileNotFoundError:
+            return True
+        if age < self.lease_seconds:
+            return False
+
+        stale_path = f"{lease_path}.{worker_id}.stale"
+        try:
+            os.rename(lease_path, stale_path)
+        except FileNotFoundError:
+            return False
+
+        # 확인과 rename 사이에 다른 작업자가 먼저 회수하고 새로 임대했을 수 있음
+        # - 옮긴 임대가 새 것이면 되돌려 놓고 포기
+        try:
+            moved_age = time.time() - os.stat(stale_path).st_mtime
+        except FileNotFoundError:
+            return False
+        if moved_age < self.lease_seconds or self.read_json(stale_path) != lease:
+            try:
+                # link: 그 사이 또 다른 임대가 생겼으면 덮어쓰지 않음
+                os.link(stale_path, lease_path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+
+        os.remove(stale_path)
+        print(f"♻️ 만료된 임대 회수: {job_id} ({age:.0f}초 갱신 없음)")
+        return True
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """임대 갱신 (False: 임대를 잃음 - 다른 작업자가 회수)"""
+        lease = self.read_json(self.lease_path(job_id))
+        if lease is None:
+            # 다른 작업자가 만료 여부를 확인하느라 잠시 옮겼다가 되돌리는 중일 수 있음
+            time.sleep(0.05)
+            lease = self.read_json(self.lease_path(job_id))
+        if not lease or lease.get('worker') != worker_id:
+            return False
+        try:
+            os.utime(self.lease_path(job_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def release(self, job_id: str):
+        try:
+            os.remove(self.lease_path(job_id))
+        except FileNotFoundError:
+            pass
+
+
+class SpoolDispatcher:
+    """
+    카메라 PC 쪽: 사진을 스풀에 작업으로 넣고 결과를 기다려 출력 폴더로 가져오기
+
+    process_image()는 HybridProcessor.process_image와 같은 형태라 모니터 처리 함수에서 그대로 대체 가능
+    """
+
+    def __init__(self, spool: Spool, stop_event: Optional[threading.Event] = None):
+        self.spool = spool
+        self.stop_event = stop_event or threading.Event()
+        QUEUE_DEPTH.set_function(lambda: len(self.spool.pending_jobs()), queue='spool')
+
+    def submit(self, input_path: str, output_name: str, key: str) -> str:
+        """작업 등록 (이미 있으면 기존 작업 사용) - 입력을 먼저 쓰고 작업 파일은 마지막에"""
+        job_id = job_id_for(key)
+        if os.path.exists(self.spool.job_path(job_id)):
+            return job_id
+
+        with open(input_path, 'rb') as f:
+            atomic_write_bytes(self.spool.input_path(job_id), f.read())
+        self.spool.write_json(self.spool.job_path(job_id), {
+            'id': job_id,
+            'key': key,
+            'output_name': output_name,
+            'submitted_by': socket.gethostname(),
+            'submitted_at': time.time(),
+            'attempts': 0,
+        })
+        return job_id
+
+    def wait(self, job_id: str) -> Optional[dict]:
+        """결과 대기 (중지되면 None - 작업은 스풀에 남아 재시작 후 다시 연결)"""
+        while not self.stop_event.is_set():
+            result = self.spool.read_result(job_id)
+            if result is not None:
+                return result
+            self.stop_event.wait(self.spool.poll_seconds)
+        return None
+
+    def collect(self, job_id: str, result: dict, output_path: str):
+        """결과 파일을 출력 폴더로 가져오고 작업 정리 (출력 파일명은 로컬 이름으로)"""
+        output_dir = os.path.dirname(output_path)
+        main_stem = os.path.splitext(os.path.basename(output_path))[0]
+        result_stem = os.path.splitext(result.get('output_name', ''))[0]
+        for relative in result.get('files', []):
+            source = os.path.join(self.spool.output_dir(job_id), relative)
+            folder, name = os.path.split(relative)
+            if name.startswith(result_stem):
+                name = main_stem + name[len(result_stem):]
+            target = os.path.join(output_dir, folder, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(source, 'rb') as f:
+                atomic_write_bytes(target, f.read(), fsync=False)
+        self.spool.remove_job(job_id)
+
+    def process_image(self, input_path: str, output_path: str, key: Optional[str] = None) -> Tuple[bool, str, str]:
+        """
+        스풀로 처리 (결과가 올 때까지 블로킹)
+
+        Args:
+            key: 작업 키 (같은 사진이면 같은 키 - 기본: 입력 경로)
+
+        Returns:
+            (성공 여부, 사용된 방식, 결과 메시지)
+        """
+        start = time.monotonic()
+        job_id = self.submit(input_path, os.path.basename(output_path), key or os.path.abspath(input_path))
+        result = self.wait(job_id)
+        if result is None:
+            return False, 'spool', "중지됨 (작업은 스풀에 남음)"
+
+        if result.get('success'):
+            try:
+                self.collect(job_id, result, output_path)
+            except OSError as e:
+                return False, 'spool', f"결과 가져오기 실패: {e}"
+        else:
+            self.spool.remove_job(job_id)
+
+        STAGE_SECONDS.observe(time.monotonic() - start, stage='spool')
+        message = f"{result.get('message', '')} (작업자: {result.get('worker', '?')})"
+        return bool(result.get('success')), result.get('method', 'spool'), message
+
+
+class SpoolWorker:
+    """작업자 쪽: 스풀에서 작업을 임대해서 HybridProcessor로 처리"""
+
+    def __init__(self, spool: Spool, processor, worker_id: Optional[str] = None,
+                 stop_event: Optional[threading.Event] = None):
+        """
+        Args:
+            spool: 공유 스풀
+            processor: HybridProcessor
+            worker_id: 작업자 이름 (기본: 호스트명-PID)
+        """
+        self.spool = spool
+        self.processor = processor
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.stop_event = stop_event or threading.Event()
+        self.processed = 0
+
+    def run_once(self) -> bool:
+        """대기 중인 작업 하나 처리 (처리한 작업이 없으면 False)"""
+        for job_id in self.spool.pending_jobs():
+            if self.stop_event.is_set():
+                return False
+            if self.spool.try_claim(job_id, self.worker_id):
+                self._run_job(job_id)
+                return True
+        return False
+
+    def run(self, threads: int = 1):
+        """stop_event가 설정될 때까지 처리 (threads개 스레드)"""
+        def loop():
+            while not self.stop_event.is_set():
+                try:
+                    if self.run_once():
+                        continue
+                except Exception as e:
+                    # 스풀 목록/임대 오류로 스레드가 끝나지 않게
+                    print(f"❌ [{self.worker_id}] 작업자 오류: {type(e).__name__}: {e}")
+                self.stop_event.wait(self.spool.poll_seconds)
+
+        workers = [threading.Thread(target=loop, name=f"spool-worker-{i + 1}", daemon=True)
+                   for i in range(max(1, threads))]
+        for worker in workers:
+            worker.start()
+        try:
+            while any(worker.is_alive() for worker in workers):
+                for worker in workers:
+                    worker.join(timeout=0.5)
+        finally:
+            self.stop_event.set()
+
+    def _run_job(self, job_id: str):
+        spool = self.spool
+        job = spool.read_json(spool.job_path(job_id))
+        if job is None or spool.read_result(job_id) is not None:
+            # 그 사이 완료/수거됨
+            spool.release(job_id)
+            return
+
+        job['attempts'] = job.get('attempts', 0) + 1
+        if job['attempts'] > spool.max_attempts:
+            print(f"❌ 작업 실패 처리: {job_id} ({spool.max_attempts}회 시도 모두 중단됨)")
+            self._finish(job_id, job, {'success': False, 'method': 'none',
+                                       'message': f"최대 시도 횟수 초과 ({spool.max_attempts}회)"})
+            return
+        spool.write_json(spool.job_path(job_id), job)
+
+        # 처리 중 임대 갱신 (lease_seconds의 1/3 간격)
+        lost = threading.Event()
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(spool.lease_seconds / 3):
+                if not spool.renew(job_id, self.worker_id):
+                    lost.set()
+                    return
+
+        renewer = threading.Thread(target=heartbeat, name=f"lease-{job_id[:8]}", daemon=True)
+        renewer.start()
+
+        work_dir = tempfile.mkdtemp(prefix='photo_spool_')
+        try:
+            output_path = os.path.join(work_dir, job['output_name'])
+            print(f"🔄 [{self.worker_id}] 작업 처리: {job['output_name']} ({job_id[:8]}, {job['attempts']}회차)")
+            success, method, message = self.processor.process_image(spool.input_path(job_id), output_path)
+            if success and not self._wait_outputs(output_path):
+                success, message = False, "출력 저장 실패"
+
+            done.set()
+            renewer.join()
+            if lost.is_set() or not spool.renew(job_id, self.worker_id):
+                print(f"⚠️ [{self.worker_id}] 임대를 잃어 결과 폐기: {job_id[:8]}")
+                return
+
+            files = []
+            if success:
+                for root, _, names in os.walk(work_dir):
+                    for name in names:
+                        relative = os.path.relpath(os.path.join(root, name), work_dir)
+                        target = os.path.join(spool.output_dir(job_id), relative)
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        with open(os.path.join(root, name), 'rb') as f:
+                            atomic_write_bytes(target, f.read())
+                        files.append(relative)
+
+            self._finish(job_id, job, {'success': success, 'method': method, 'message': message,
+                                       'files': files})
+            self.processed += 1
+            print(f"{'✅' if success else '❌'} [{self.worker_id}] [{method}] {message}")
+        except OSError as e:
+            # 스풀 폴더 접근 실패 - 임대를 풀어 다른 작업자가 가져가게
+            print(f"❌ [{self.worker_id}] 스풀 오류 ({job_id[:8]}): {e}")
+            spool.release(job_id)
+        except Exception as e:
+            # 처리 중 예기치 않은 오류 - 실패 결과를 기록해 수거하는 쪽이 기다리지 않게 (작업자 루프는 계속)
+            print(f"❌ [{self.worker_id}] 처리 오류 ({job_id[:8]}): {type(e).__name__}: {e}")
+            done.set()
+            try:
+                if spool.renew(job_id, self.worker_id):
+                    self._finish(job_id, job, {'success': False, 'method': 'none',
+                                               'message': f"처리 오류: {e}", 'files': []})
+            except OSError:
+                spool.release(job_id)
+        finally:
+            done.set()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _wait_outputs(self, output_path: str) -> bool:
+        """비동기 저장(본 출력 + 공유 사본) 완료 대기"""
+        paths = [output_path]
+        encoder = getattr(self.processor, 'encoder', None)
+        if encoder is not None and encoder.share['enabled']:
+            paths.append(encoder.share_path(output_path))
+        return all(self.processor.wait_output(path) for path in paths)
+
+    def _finish(self, job_id: str, job: dict, result: Dict[str, any]):
+        """결과 기록 (원자적) 후 임대 해제"""
+        result.update(id=job_id, output_name=job['output_name'], worker=self.worker_id,
+                      finished_at=time.time())
+        self.spool.write_json(self.spool.result_path(job_id), result)
+        self.spool.release(job_id)
+
+
+def spool_from_config(config: dict, path: Optional[str] = None) -> Optional[Spool]:
+    """설정의 spool (path 지정 시 enabled와 관계없이 사용, 비활성화면 None)"""
+    spool_config = {**DEFAULT_SPOOL_CONFIG, **config.get('spool', {})}
+    path = path or (spool_config['path'] if spool_config['enabled'] else '')
+    if not path:
+        return None
+    return Spool(path, spool_config)
+
+
+def dispatcher_from_config(config: dict, processor, stop_event: threading.Event,
+                           path: Optional[str] = None) -> Optional[SpoolDispatcher]:
+    """
+    카메라 PC용 스풀 준비 (비활성화면 None)
+
+    local_worker면 이 PC도 작업자 스레드로 처리에 참여 (stop_event로 함께 종료)
+    """
+    spool = spool_from_config(config, path)
+    if spool is None:
+        return None
+
+    print(f"📮 스풀 모드: {spool.path}")
+    if config.get('spool', {}).get('local_worker', DEFAULT_SPOOL_CONFIG['local_worker']):
+        worker = SpoolWorker(spool, processor, stop_event=stop_event)
+        threading.Thread(target=worker.run, name='spool-local-worker', daemon=True).start()
+    return SpoolDispatcher(spool, stop_event)
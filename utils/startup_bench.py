@@ -0,0 +1,109 @@
+"""
+시작 시간 벤치마크 모듈
+
+명령마다 새 프로세스로 실행해서 '실행 → 준비 완료'까지의 시간을 측정
+(준비 완료 = 설정/프로세서 초기화가 끝나고 실제 작업(카메라 연결, 처리, 창 대기)을 시작하기 직전)
+
+측정용 프로세스에는 STARTUP_BENCH_ENV가 설정되고, cli.py / gui.py는 준비 완료 지점에서
+startup_checkpoint()가 True면 작업을 시작하지 않고 종료함
+"""
+
+import os
+import sys
+import time
+from typing import List, Optional
+
+STARTUP_BENCH_ENV = 'PHOTO_STARTUP_BENCH'
+
+
+def startup_checkpoint(name: str) -> bool:
+    """준비 완료 지점 (벤치마크 실행 중이면 True - 호출한 쪽에서 바로 종료)"""
+    if not os.environ.get(STARTUP_BENCH_ENV):
+        return False
+    print(f"⏱️ 시작 완료: {name}")
+    return True
+
+
+def default_commands(base_dir: str, config_path: str, sample_image: Optional[str] = None) -> List[tuple]:
+    """측정할 명령 목록 [(이름, 인자 목록), ...]"""
+    cli = os.path.join(base_dir, 'cli.py')
+    sample = sample_image or os.path.join(base_dir, 'overlay.png')
+    commands = [
+        ('cli (사용법)', [cli, '-c', config_path]),
+        ('cli --status', [cli, '-c', config_path, '--status']),
+        ('cli process', [cli, '-c', config_path, 'process', sample]),
+        ('cli monitor', [cli, '-c', config_path, 'monitor']),
+        ('cli monitor-folder', [cli, '-c', config_path, 'monitor-folder']),
+        ('cli bench-encoder', [cli, '-c', config_path, 'bench-encoder', sample]),
+        ('cli loadtest', [cli, '-c', config_path, 'loadtest']),
+    ]
+    # GUI는 디스플레이가 있을 때만 (macOS는 항상)
+    if sys.platform == 'darwin' or os.environ.get('DISPLAY'):
+        commands.append(('gui', [os.path.join(base_dir, 'gui.py')]))
+    return commands
+
+
+def _run_once(args: List[str], cwd: str, python: str, extra_flags: List[str] = None):
+    """한 번 실행 (경과 초, 종료 코드, 표준 에러)"""
+    import subprocess
+
+    env = dict(os.environ)
+    env[STARTUP_BENCH_ENV] = '1'
+    start = time.perf_counter()
+    completed = subprocess.run([python] + (extra_flags or []) + args, cwd=cwd, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120)
+    return time.perf_counter() - start, completed.returncode, completed.stderr.decode('utf-8', 'replace')
+
+
+def measure_commands(commands: List[tuple], cwd: str, repeat: int = 5,
+                     python: str = sys.executable) -> List[dict]:
+    """
+    명령별 시작 시간 측정
+
+    Returns:
+        [{'command', 'first_ms', 'median_ms', 'min_ms', 'error'}, ...]
+        (first_ms: 첫 실행 - 디스크 캐시가 비어 있을수록 재부팅 직후에 가까움)
+    """
+    import statistics
+
+    results = []
+    for name, args in commands:
+        timings, error = [], None
+        for _ in range(max(1, repeat)):
+            try:
+                elapsed, returncode, stderr = _run_once(args, cwd, python)
+            except Exception as e:
+                error = str(e)
+                break
+            if returncode != 0:
+                error = (stderr.strip().splitlines() or [f"종료 코드 {returncode}"])[-1]
+                break
+            timings.append(elapsed * 1000)
+
+        result = {'command': name, 'error': error}
+        if timings:
+            result.update(first_ms=round(timings[0], 1),
+                          median_ms=round(statistics.median(timings), 1),
+                          min_ms=round(min(timings), 1))
+        results.append(result)
+    return results
+
+
+def import_profile(args: List[str], cwd: str, top: int = 15, python: str = sys.executable) -> List[tuple]:
+    """
+    -X importtime으로 import 시간 상위 모듈 조회
+
+    Returns:
+        [(모듈명, 누적 ms), ...] (누적 시간 내림차순, 최상위 import만)
+    """
+    _, _, stderr = _run_once(args, cwd, python, ['-X', 'importtime'])
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, raw_name = line[len('import time:'):].split('|')
+        # 들여쓰기가 없는(최상위) import만 - 하위 모듈 시간은 누적에 포함됨
+        if not raw_name.startswith('  '):
+            modules.append((raw_name.strip(), int(cumulative_us) / 1000))
+    modules.sort(key=lambda item: item[1], reverse=True)
+    return modules[:top]
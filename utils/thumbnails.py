@@ -0,0 +1,264 @@
+"""
+썸네일 생성 및 캐시 모듈
+
+- JPEG draft 모드로 축소 디코딩 (20MB 원본도 빠르게)
+- 백그라운드 스레드에서 디코딩, 결과는 PPM 바이트로 반환
+  (Tk PhotoImage(data=...)가 직접 읽을 수 있어 GUI에서 PIL/ImageTk 불필요)
+- 메모리 LRU 캐시 + 선택적 디스크 캐시 (경로/mtime 키)
+- 디스크 캐시는 합계 max_mb / 마지막 사용 후 max_days로 제한 (오래 안 쓴 것부터 삭제)
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from utils.metrics import CACHE_REQUESTS
+
+
+def render_thumbnail(image_path: str, max_size: Tuple[int, int]) -> bytes:
+    """
+    썸네일 PPM 바이트 생성
+
+    Args:
+        image_path: 원본 이미지 경로
+        max_size: 최대 (너비, 높이)
+
+    Returns:
+        PPM(P6) 바이트
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        # JPEG은 DCT 단계에서 1/2~1/8로 축소 디코딩
+        image.draft('RGB', max_size)
+        thumb = image.convert('RGB')
+
+    thumb.thumbnail(max_size)
+    buffer = io.BytesIO()
+    thumb.save(buffer, 'PPM')
+    return buffer.getvalue()
+
+
+class ThumbnailCache:
+    """스레드 안전 LRU 캐시"""
+
+    def __init__(self, capacity: int = 32, name: str = 'thumbnail'):
+        self.capacity = capacity
+        self.name = name
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """조회 (적중 시 최근 사용으로 이동)"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                CACHE_REQUESTS.inc(cache=self.name, result='hit')
+                return self._items[key]
+        CACHE_REQUESTS.inc(cache=self.name, result='miss')
+        return None
+
+    def put(self, key, value):
+        """저장 (용량 초과 시 가장 오래된 항목 제거)"""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class DiskThumbnailCache:
+    """디스크 썸네일 캐시 (원본 경로 + mtime + 크기 해시를 파일명으로 사용, 크기/기간 제한)"""
+
+    # 정리 중에 지우는 쓰다 남은 임시 파일의 최소 나이 (초)
+    TEMP_MAX_AGE = 3600
+
+    def __init__(self, cache_dir: str, name: str = 'thumbnail_disk', max_mb: float = 64, max_days: float = 30):
+        """
+        Args:
+            cache_dir: 캐시 폴더
+            max_mb: 합계 상한 (MB, 0이면 제한 없음) - 넘으면 오래 안 쓴 것부터 삭제
+            max_days: 마지막 사용 후 보관 기간 (일, 0이면 제한 없음)
+        """
+        self.cache_dir = cache_dir
+        self.name = name
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_days * 86400
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        # 마지막 정리 후 새로 쓴 바이트 (상한의 1/10마다 정리)
+        self._written = 0
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + '.ppm')
+
+    def get(self, key) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            CACHE_REQUESTS.inc(cache=self.name, result='miss')
+            return None
+        CACHE_REQUESTS.inc(cache=self.name, result='hit')
+        try:
+            # 최근 사용 표시 (정리 순서)
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return data
+
+    def put(self, key, data: bytes):
+        """임시 파일에 쓴 뒤 원자적으로 교체 (동시 접근 시 반쪽 파일 방지)"""
+        path = self._path(key)
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ 썸네일 캐시 저장 실패: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            self._written += len(data)
+            due = self.max_bytes and self._written > self.max_bytes // 10
+            if due:
+                self._written = 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """기간이 지난 항목 삭제 후 합계가 상한 이하가 되도록 오래 안 쓴 것부터 삭제"""
+        if not self._prune_lock.acquire(blocking=False):
+            # 다른 스레드가 정리 중
+            return
+        try:
+            now = time.time()
+            entries = []
+            for root, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    age = now - stat.st_mtime
+                    if name.endswith('.tmp'):
+                        if age > self.TEMP_MAX_AGE:
+                            self._remove(path)
+                    elif name.endswith('.ppm'):
+                        if self.max_age and age > self.max_age:
+                            self._remove(path)
+                        else:
+                            entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            if self.max_bytes and total > self.max_bytes:
+                for _, size, path in sorted(entries):
+                    if total <= self.max_bytes:
+                        break
+                    if self._remove(path):
+                        total -= size
+        finally:
+            self._prune_lock.release()
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+class ThumbnailLoader:
+    """백그라운드 썸네일 로더"""
+
+    def __init__(self, max_size: Tuple[int, int] = (320, 240), cache_size: int = 32, workers: int = 1,
+                 disk_cache_dir: Optional[str] = None, disk_cache_max_mb: float = 64,
+                 disk_cache_max_days: float = 30):
+        """
+        Args:
+            max_size: 썸네일 최대 크기
+            cache_size: 메모리 캐시 항목 수
+            workers: 디코딩 스레드 수
+            disk_cache_dir: 디스크 캐시 폴더 (None이면 메모리 캐시만)
+            disk_cache_max_mb: 디스크 캐시 합계 상한 (MB)
+            disk_cache_max_days: 디스크 캐시 항목 보관 기간 (마지막 사용 후 일)
+        """
+        self.max_size = tuple(max_size)
+        self.cache = ThumbnailCache(cache_size)
+        self.disk_cache = DiskThumbnailCache(disk_cache_dir, max_mb=disk_cache_max_mb,
+                                             max_days=disk_cache_max_days) if disk_cache_dir else None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnail')
+        if self.disk_cache:
+            # 이전 실행에서 쌓인 항목 정리 (백그라운드)
+            self._executor.submit(self.disk_cache.prune)
+
+    def _key(self, image_path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size, self.max_size)
+
+    def request(self, image_path: str, callback: Callable[[str, Optional[bytes], str], None]) -> Future:
+        """
+        썸네일 요청 (즉시 반환)
+
+        Args:
+            image_path: 이미지 경로
+            callback: callback(경로, PPM 바이트 또는 None, 오류 메시지)
+                      - 워커 스레드에서 호출되므로 GUI는 root.after로 넘길 것
+
+        Returns:
+            Future (시작 전이면 cancel()로 취소 가능)
+        """
+        return self._executor.submit(self._load, image_path, callback)
+
+    def _load(self, image_path: str, callback):
+        key = self._key(image_path)
+        if key is None:
+            callback(image_path, None, "파일 없음")
+            return
+
+        data = self.cache.get(key)
+        if data is None and self.disk_cache:
+            data = self.disk_cache.get(key)
+            if data is not None:
+                self.cache.put(key, data)
+
+        if data is None:
+            try:
+                data = render_thumbnail(image_path, self.max_size)
+            except ImportError:
+                callback(image_path, None, "Pillow 미설치")
+                return
+            except Exception as e:
+                callback(image_path, None, str(e))
+                return
+            self.cache.put(key, data)
+            if self.disk_cache:
+                self.disk_cache.put(key, data)
+
+        callback(image_path, data, "")
+
+    def shutdown(self):
+        """워커 종료 (대기 중인 요청은 취소)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
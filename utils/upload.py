@@ -0,0 +1,129 @@
+"""
+AI 업로드 준비 모듈
+
+원본 파일(JPEG/PNG/WebP)을 디코딩/재인코딩 없이 그대로 inline data로 전송
+업로드 정책(최대 해상도/크기)을 넘는 경우에만 Pillow로 줄여서 JPEG로 인코딩
+
+config.json:
+    "ai": {
+        "upload": { "max_dimension": 0, "max_bytes": 14000000, "quality": 90 }
+    }
+"""
+
+import io
+import struct
+from typing import Optional, Tuple
+
+from utils.metrics import AI_UPLOADS
+
+
+# 파일 시그니처 → MIME 타입
+_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+)
+
+# SOF 마커 (DHT/JPG/DAC 제외) - 이미지 크기 정보 포함
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def detect_mime_type(data: bytes) -> Optional[str]:
+    """파일 시그니처로 MIME 타입 판별 (지원하지 않으면 None)"""
+    for signature, mime_type in _SIGNATURES:
+        if data.startswith(signature):
+            return mime_type
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """JPEG 헤더(SOF)에서 (가로, 세로) 읽기 - 디코딩 없음"""
+    offset = 2
+    length = len(data)
+    while offset + 4 <= length:
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # 채움 바이트
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # 길이 없는 마커
+            offset += 2
+            continue
+        segment_length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        if marker in _SOF_MARKERS:
+            if offset + 9 > length:
+                return None
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + segment_length
+    return None
+
+
+def png_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """PNG IHDR에서 (가로, 세로) 읽기"""
+    if len(data) < 24 or data[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', data[16:24])
+
+
+def image_dimensions(data: bytes, mime_type: str) -> Optional[Tuple[int, int]]:
+    if mime_type == 'image/jpeg':
+        return jpeg_dimensions(data)
+    if mime_type == 'image/png':
+        return png_dimensions(data)
+    return None
+
+
+def prepare_upload(input_path: str, upload_config: dict = None) -> Tuple[bytes, str, str]:
+    """
+    업로드할 바이트 준비
+
+    Args:
+        input_path: 입력 이미지 경로
+        upload_config: ai.upload 설정
+            - max_dimension: 긴 변 최대 픽셀 (0이면 제한 없음, 기본: 0)
+            - max_bytes: 원본 전송 최대 크기 (기본: 14MB - base64 후 요청 한도 20MB 이내)
+            - quality: 줄일 때 JPEG 품질 (기본: 90)
+
+    Returns:
+        (이미지 바이트, MIME 타입, 'original' 또는 'reencoded')
+    """
+    upload_config = upload_config or {}
+    max_dimension = upload_config.get('max_dimension', 0)
+    max_bytes = upload_config.get('max_bytes', 14_000_000)
+
+    with open(input_path, 'rb') as f:
+        data = f.read()
+
+    mime_type = detect_mime_type(data)
+    if mime_type is not None:
+        needs_resize = False
+        if max_dimension:
+            dimensions = image_dimensions(data, mime_type)
+            # 헤더로 크기를 알 수 없으면 디코딩해서 확인
+            needs_resize = dimensions is None or max(dimensions) > max_dimension
+        if not needs_resize and (not max_bytes or len(data) <= max_bytes):
+            AI_UPLOADS.inc(path='original')
+            return data, mime_type, 'original'
+
+    data = _reencode(data, max_dimension, upload_config.get('quality', 90))
+    AI_UPLOADS.inc(path='reencoded')
+    return data, 'image/jpeg', 'reencoded'
+
+
+def _reencode(data: bytes, max_dimension: int, quality: int) -> bytes:
+    """업로드 정책에 맞게 축소 후 JPEG 인코딩"""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    if max_dimension:
+        if image.format == 'JPEG':
+            # DCT 단계에서 미리 축소 (전체 해상도 디코딩 생략)
+            image.draft('RGB', (max_dimension, max_dimension))
+        image.thumbnail((max_dimension, max_dimension))
+
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, 'JPEG', quality=quality)
+    return buffer.getvalue()